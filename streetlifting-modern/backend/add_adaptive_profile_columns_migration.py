@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the adaptive experience columns to user_profiles.
+Databases created with create_user_profiles_table.py only have the setup
+columns; the adaptation service and the interaction ingestion queue also
+need the level scores and behaviour counters.
+Alembic deployments get the same columns from
+migrations/add_adaptive_profile_columns.py.
+"""
+
+import sqlite3
+import os
+from datetime import datetime
+
+ADAPTIVE_COLUMNS = {
+    'manual_override_level': 'VARCHAR(50)',
+    'technical_experience_score': 'FLOAT DEFAULT 0.0',
+    'training_commitment_score': 'FLOAT DEFAULT 0.0',
+    'needs_sophistication_score': 'FLOAT DEFAULT 0.0',
+    'navigation_patterns': "JSON DEFAULT '{}'",
+    'feature_usage_frequency': "JSON DEFAULT '{}'",
+    'session_duration_avg': 'FLOAT DEFAULT 0.0',
+    'terminology_usage': "JSON DEFAULT '{}'",
+    'manual_adjustments_count': 'INTEGER DEFAULT 0',
+    'help_requests': "JSON DEFAULT '{}'",
+    'workout_frequency_7d': 'FLOAT DEFAULT 0.0',
+    'workout_frequency_30d': 'FLOAT DEFAULT 0.0',
+    'data_quality_score': 'FLOAT DEFAULT 0.0',
+    'preferred_dashboard_layout': "VARCHAR(50) DEFAULT 'auto'",
+    'feature_discovery_enabled': 'BOOLEAN DEFAULT 1',
+    'auto_adaptation_enabled': 'BOOLEAN DEFAULT 1',
+    'last_level_calculation': 'DATETIME'
+}
+
+
+def add_adaptive_profile_columns():
+    """Add the adaptive experience columns missing from user_profiles"""
+
+    # Database path
+    db_path = os.path.join(os.path.dirname(__file__), 'streetlifting.db')
+
+    if not os.path.exists(db_path):
+        print(f"❌ Database file not found at: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(user_profiles)")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        for column, column_type in ADAPTIVE_COLUMNS.items():
+            if column in columns:
+                print(f"✅ Column '{column}' already exists in user_profiles table")
+                continue
+            print(f"🔄 Adding '{column}' column to user_profiles table...")
+            cursor.execute(f"ALTER TABLE user_profiles ADD COLUMN {column} {column_type}")
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+        if 'conn' in locals():
+            conn.close()
+        return False
+
+
+def main():
+    """Main migration function"""
+    print("🚀 Starting migration to add adaptive profile columns...")
+    print(f"📅 Migration timestamp: {datetime.now().isoformat()}")
+
+    success = add_adaptive_profile_columns()
+
+    if success:
+        print("\n✅ Migration completed successfully!")
+        print("🔄 You can now restart your backend server.")
+    else:
+        print("\n❌ Migration failed. Please check the errors above.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
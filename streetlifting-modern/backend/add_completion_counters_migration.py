@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Migration script to add planned workout completion counters to training_blocks
+and the index used to find the next pending workout of a block.
+Counters are left NULL and backfilled by the API the first time a workout of
+the block is completed.
+"""
+
+import sqlite3
+import os
+from datetime import datetime
+
+COUNTER_COLUMNS = {
+    'total_workouts_count': 'INTEGER',
+    'completed_workouts_count': 'INTEGER',
+    'weekly_completion': 'JSON'
+}
+
+
+def add_completion_counters():
+    """Add the completion counter columns and the pending workout index"""
+
+    # Database path
+    db_path = os.path.join(os.path.dirname(__file__), 'streetlifting.db')
+
+    if not os.path.exists(db_path):
+        print(f"❌ Database file not found at: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(training_blocks)")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        for column, column_type in COUNTER_COLUMNS.items():
+            if column in columns:
+                print(f"✅ Column '{column}' already exists in training_blocks table")
+                continue
+            print(f"🔄 Adding '{column}' column to training_blocks table...")
+            cursor.execute(f"ALTER TABLE training_blocks ADD COLUMN {column} {column_type}")
+
+        print("🔄 Creating index ix_planned_workouts_block_pending...")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS ix_planned_workouts_block_pending
+            ON planned_workouts (block_id, is_completed, week_number, day_number)
+        """)
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+        if 'conn' in locals():
+            conn.close()
+        return False
+
+
+def main():
+    """Main migration function"""
+    print("🚀 Starting migration to add completion counters...")
+    print(f"📅 Migration timestamp: {datetime.now().isoformat()}")
+
+    success = add_completion_counters()
+
+    if success:
+        print("\n✅ Migration completed successfully!")
+        print("🔄 You can now restart your backend server.")
+    else:
+        print("\n❌ Migration failed. Please check the errors above.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Migration script to create the composite indexes declared on the models
+(per-user lookups on workouts, exercises, one rep maxes, planned workouts,
+user interactions, training blocks and user profiles) on an existing database.
+Works with the configured database URL (SQLite or PostgreSQL).
+"""
+
+from datetime import datetime
+
+from app.core.database import engine
+from app.core.base import Base
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+INDEX_NAMES = [
+    'ix_one_rep_maxes_user_exercise_date',
+    'ix_workouts_user_date',
+    'ix_workouts_user_in_progress',
+    'ix_exercises_workout_id',
+    'ix_planned_workouts_block_pending',
+    'ix_user_interactions_user_type_created',
+    'ix_training_blocks_user_active',
+    'ix_user_profiles_level_due',
+]
+
+
+def add_composite_indexes():
+    """Create every missing index (existing ones are skipped)"""
+    indexes = {
+        index.name: index
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    }
+
+    try:
+        for name in INDEX_NAMES:
+            print(f"🔄 Creating index {name}...")
+            indexes[name].create(bind=engine, checkfirst=True)
+        return True
+    except Exception as e:
+        print(f"❌ Database error: {e}")
+        return False
+
+
+def main():
+    """Main migration function"""
+    print("🚀 Starting migration to add composite indexes...")
+    print(f"📅 Migration timestamp: {datetime.now().isoformat()}")
+
+    success = add_composite_indexes()
+
+    if success:
+        print("\n✅ Migration completed successfully!")
+    else:
+        print("\n❌ Migration failed. Please check the errors above.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Migration script to create the estimated 1RM index tables (estimated_maxes
+and estimated_max_daily) and backfill them from the completed workouts
+already stored. Safe to re-run: the backfill rebuilds the index.
+Works with the configured database URL (SQLite or PostgreSQL).
+"""
+
+from datetime import datetime
+
+from app.core.database import engine, SessionLocal
+from app.models.training import EstimatedMax, EstimatedMaxDaily
+from app.services.e1rm_index import backfill_e1rm_index
+
+
+def add_estimated_max_index():
+    """Create the index tables if missing and rebuild their rows"""
+    try:
+        print("🔄 Creating tables estimated_maxes and estimated_max_daily...")
+        EstimatedMax.__table__.create(bind=engine, checkfirst=True)
+        EstimatedMaxDaily.__table__.create(bind=engine, checkfirst=True)
+
+        print("🔄 Backfilling estimated 1RMs from completed workouts...")
+        db = SessionLocal()
+        try:
+            read = backfill_e1rm_index(db)
+        finally:
+            db.close()
+        print(f"✅ Indexed {read} sets")
+        return True
+    except Exception as e:
+        print(f"❌ Database error: {e}")
+        return False
+
+
+def main():
+    """Main migration function"""
+    print("🚀 Starting migration to add the estimated 1RM index...")
+    print(f"📅 Migration timestamp: {datetime.now().isoformat()}")
+
+    success = add_estimated_max_index()
+
+    if success:
+        print("\n✅ Migration completed successfully!")
+        print("🔄 You can now restart your backend server.")
+    else:
+        print("\n❌ Migration failed. Please check the errors above.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
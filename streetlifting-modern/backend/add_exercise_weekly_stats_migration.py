@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Migration script to create the exercise_weekly_stats table and backfill it
+from the completed workouts already stored. Safe to re-run: the backfill
+rebuilds every bucket.
+Works with the configured database URL (SQLite or PostgreSQL).
+"""
+
+from datetime import datetime
+
+from app.core.database import engine, SessionLocal
+from app.models.workout import ExerciseWeeklyStats
+from app.services.workout_stats import backfill_exercise_stats
+
+
+def add_exercise_weekly_stats():
+    """Create the stats table if missing and rebuild its rows"""
+    try:
+        print("🔄 Creating table exercise_weekly_stats...")
+        ExerciseWeeklyStats.__table__.create(bind=engine, checkfirst=True)
+
+        print("🔄 Aggregating completed sets into weekly buckets...")
+        db = SessionLocal()
+        try:
+            read = backfill_exercise_stats(db)
+        finally:
+            db.close()
+        print(f"✅ Aggregated {read} sets")
+        return True
+    except Exception as e:
+        print(f"❌ Database error: {e}")
+        return False
+
+
+def main():
+    """Main migration function"""
+    print("🚀 Starting migration to add the weekly exercise statistics...")
+    print(f"📅 Migration timestamp: {datetime.now().isoformat()}")
+
+    success = add_exercise_weekly_stats()
+
+    if success:
+        print("\n✅ Migration completed successfully!")
+        print("🔄 You can now restart your backend server.")
+    else:
+        print("\n❌ Migration failed. Please check the errors above.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
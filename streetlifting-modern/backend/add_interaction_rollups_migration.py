@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Migration script to create the user_interaction_rollups table and backfill
+it from the user_interactions rows already stored. Run it before the first
+retention pass compacts old interactions away.
+Works with the configured database URL (SQLite or PostgreSQL).
+"""
+
+from datetime import datetime
+
+from app.core.database import engine, SessionLocal
+from app.models.user_profile import UserInteractionRollup
+from app.services.interaction_rollups import backfill_rollups
+
+
+def add_interaction_rollups():
+    """Create the rollup table if missing and rebuild its rows"""
+    try:
+        print("🔄 Creating table user_interaction_rollups...")
+        UserInteractionRollup.__table__.create(bind=engine, checkfirst=True)
+
+        print("🔄 Backfilling rollups from user_interactions...")
+        db = SessionLocal()
+        try:
+            read = backfill_rollups(db)
+        finally:
+            db.close()
+        print(f"✅ Rolled up {read} interactions")
+        return True
+    except Exception as e:
+        print(f"❌ Database error: {e}")
+        return False
+
+
+def main():
+    """Main migration function"""
+    print("🚀 Starting migration to add interaction rollups...")
+    print(f"📅 Migration timestamp: {datetime.now().isoformat()}")
+
+    success = add_interaction_rollups()
+
+    if success:
+        print("\n✅ Migration completed successfully!")
+        print("🔄 You can now restart your backend server.")
+    else:
+        print("\n❌ Migration failed. Please check the errors above.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the scheduler_leases table. Every uvicorn worker
+starts the level recalculation scheduler; the lease row makes sure only
+one of them runs each pass.
+Works with the configured database URL (SQLite or PostgreSQL).
+"""
+
+from datetime import datetime
+
+from app.core.database import engine
+from app.models.scheduler_lease import SchedulerLease
+
+
+def add_scheduler_leases():
+    """Create the scheduler lease table"""
+    try:
+        print("🔄 Creating table scheduler_leases...")
+        SchedulerLease.__table__.create(bind=engine, checkfirst=True)
+        return True
+    except Exception as e:
+        print(f"❌ Database error: {e}")
+        return False
+
+
+def main():
+    """Main migration function"""
+    print("🚀 Starting migration to add scheduler leases...")
+    print(f"📅 Migration timestamp: {datetime.now().isoformat()}")
+
+    success = add_scheduler_leases()
+
+    if success:
+        print("\n✅ Migration completed successfully!")
+        print("🔄 You can now restart your backend server.")
+    else:
+        print("\n❌ Migration failed. Please check the errors above.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
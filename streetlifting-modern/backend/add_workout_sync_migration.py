@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Migration script to add workouts.client_id (ids assigned by the PWA when a
+workout is created offline, unique per user) and the workout_sync_mutations
+table holding the idempotency keys of applied sync operations.
+Works with the configured database URL (SQLite or PostgreSQL).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from app.core.database import engine
+from app.models.workout import WorkoutSyncMutation
+
+
+def add_workout_sync():
+    """Add the client id column and index, and create the idempotency key table"""
+    try:
+        columns = [column["name"] for column in inspect(engine).get_columns("workouts")]
+        with engine.begin() as conn:
+            if "client_id" in columns:
+                print("✅ Column 'client_id' already exists in workouts table")
+            else:
+                print("🔄 Adding 'client_id' column to workouts table...")
+                conn.execute(text("ALTER TABLE workouts ADD COLUMN client_id VARCHAR(64)"))
+
+            print("🔄 Creating index ix_workouts_user_client_id...")
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_workouts_user_client_id ON workouts (user_id, client_id)"
+            ))
+
+        print("🔄 Creating table workout_sync_mutations...")
+        WorkoutSyncMutation.__table__.create(bind=engine, checkfirst=True)
+        return True
+    except Exception as e:
+        print(f"❌ Database error: {e}")
+        return False
+
+
+def main():
+    """Main migration function"""
+    print("🚀 Starting migration to add offline workout sync...")
+    print(f"📅 Migration timestamp: {datetime.now().isoformat()}")
+
+    success = add_workout_sync()
+
+    if success:
+        print("\n✅ Migration completed successfully!")
+        print("🔄 You can now restart your backend server.")
+    else:
+        print("\n❌ Migration failed. Please check the errors above.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
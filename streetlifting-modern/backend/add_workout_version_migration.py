@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the workouts.version column (optimistic concurrency
+for progress saves) and exercises.client_set_id (set ids assigned by the
+client). Existing workouts start at version 1.
+"""
+
+import sqlite3
+import os
+from datetime import datetime
+
+NEW_COLUMNS = {
+    'workouts': ('version', 'INTEGER NOT NULL DEFAULT 1'),
+    'exercises': ('client_set_id', 'VARCHAR(64)')
+}
+
+
+def add_workout_version():
+    """Add the version and client set id columns"""
+
+    # Database path
+    db_path = os.path.join(os.path.dirname(__file__), 'streetlifting.db')
+
+    if not os.path.exists(db_path):
+        print(f"❌ Database file not found at: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        for table, (column, column_type) in NEW_COLUMNS.items():
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = [row[1] for row in cursor.fetchall()]
+            if column in columns:
+                print(f"✅ Column '{column}' already exists in {table} table")
+                continue
+            print(f"🔄 Adding '{column}' column to {table} table...")
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+        if 'conn' in locals():
+            conn.close()
+        return False
+
+
+def main():
+    """Main migration function"""
+    print("🚀 Starting migration to add workout versions...")
+    print(f"📅 Migration timestamp: {datetime.now().isoformat()}")
+
+    success = add_workout_version()
+
+    if success:
+        print("\n✅ Migration completed successfully!")
+        print("🔄 You can now restart your backend server.")
+    else:
+        print("\n❌ Migration failed. Please check the errors above.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
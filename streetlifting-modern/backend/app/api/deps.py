@@ -3,8 +3,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.models.user import User
-from app.services.auth import verify_token, get_user_by_username
+from app.core.config import settings
+from app.schemas.user import AuthenticatedUser
+from app.services.auth import resolve_principal
 
 security = HTTPBearer()
 
@@ -12,30 +13,41 @@ security = HTTPBearer()
 def get_current_user(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
-    """Get current authenticated user"""
-    token = credentials.credentials
-    token_data = verify_token(token)
+) -> AuthenticatedUser:
+    """
+    Get current authenticated user.
     
-    if token_data is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    Returns an immutable principal (id, username, email, ...) from the auth
+    cache; load the User row explicitly when an ORM object is needed.
+    """
+    principal, error = resolve_principal(db, credentials.credentials)
     
-    user = get_user_by_username(db, username=token_data.username)
-    if user is None:
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+            detail=error,
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return user
+    return principal
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_user(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
     """Get current active user"""
-    # Add any additional checks for active users here
-    return current_user 
\ No newline at end of file
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return current_user 
+
+
+
+def get_current_admin_user(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
+    """Get current user, requiring the admin account"""
+    if current_user.username != settings.admin_username:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
@@ -7,6 +7,7 @@ from app.core.auth import get_current_user
 from app.models.user import User
 from app.services.training_block import TrainingBlockService
 from app.services.training_calculator import TrainingCalculatorService
+from app.services.projection_engine import ProjectionEngine
 from app.schemas.training_block import (
     TrainingBlock, TrainingBlockCreate, TrainingBlockUpdate, 
     BlockProgress, BlockStage
@@ -103,64 +104,16 @@ def get_training_projections(
     if not block:
         raise HTTPException(status_code=404, detail="Training block not found")
     
-    # Get strategy parameters
-    strategy_params = {
-        'duration': block.duration,
-        'weekly_increment': block.weekly_increment,
-        'increment_type': block.increment_type,
-        'deload_week': block.deload_week,
-        'volume_multiplier': block.volume_multiplier,
-        'intensity_focus': block.intensity_focus,
-        'daily_variation': block.daily_variation,
-        'intensity_range': block.intensity_range,
-        'volume_cycles': block.volume_cycles,
-        'max_effort_days': block.max_effort_days,
-        'dynamic_effort_days': block.dynamic_effort_days,
-        'repetition_effort_days': block.repetition_effort_days,
-        'wave_pattern': block.wave_pattern,
-        'wave_amplitude': block.wave_amplitude,
-        'wave_frequency': block.wave_frequency
-    }
-    
-    exercises = {
-        'pullups': block.rm_pullups,
-        'dips': block.rm_dips,
-        'muscleups': block.rm_muscleups,
-        'squats': block.rm_squats
-    }
-    
-    projections = {}
+    strategy_params = ProjectionEngine.strategy_params(block)
+    exercises = ProjectionEngine.block_one_rms(block)
     
-    for week in range(1, block.total_weeks + 1):
-        week_key = f"week_{week}"
-        projections[week_key] = {}
-        
-        for exercise, one_rm in exercises.items():
-            if one_rm > 0:
-                # Calculate detailed progression
-                progression = TrainingCalculatorService.calculate_weekly_progression(
-                    one_rm, block.strategy, week, strategy_params
-                )
-                
-                projections[week_key][exercise] = {
-                    'one_rm': one_rm,
-                    'load_percentage': progression['load_percentage'],
-                    'working_weight': progression['working_weight'],
-                    'reps_range': progression['reps_range'],
-                    'sets': progression['sets'],
-                    'rpe': progression['rpe'],
-                    'notes': progression['notes']
-                }
-            else:
-                projections[week_key][exercise] = {
-                    'one_rm': 0,
-                    'load_percentage': 0,
-                    'working_weight': 0,
-                    'reps_range': [0, 0],
-                    'sets': 0,
-                    'rpe': 0,
-                    'notes': 'No 1RM establecido'
-                }
+    # Calculate detailed progression for every week x exercise in one pass
+    projection = ProjectionEngine.project(
+        list(exercises.values()), block.strategy, block.total_weeks, strategy_params
+    )
+    projections = ProjectionEngine.to_detailed_projections(
+        exercises, block.strategy, strategy_params, projection
+    )
     
     return {
         'block_id': block.id,
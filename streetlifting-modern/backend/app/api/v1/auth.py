@@ -1,37 +1,59 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.config import settings
-from app.services.auth import authenticate_user, create_access_token, create_user
-from app.schemas.user import UserCreate, User, Token
-from app.api.deps import get_current_active_user
+from app.services.auth import (
+    authenticate_user_async, create_access_token, create_user, get_password_hash_async,
+    get_user_by_username, principal_cache
+)
+from app.services.password_hashing import PasswordHashingBusy, password_pool
+from app.schemas.user import UserCreate, User, Token, AuthenticatedUser
+from app.api.deps import get_current_active_user, get_current_admin_user
 
 router = APIRouter()
 
 
+def _hashing_unavailable() -> HTTPException:
+    """503 returned while the password hashing pool is saturated"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=User)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     # Check if user already exists
-    from app.services.auth import get_user_by_username
-    existing_user = get_user_by_username(db, username=user.username)
+    existing_user = await run_in_threadpool(get_user_by_username, db, user.username)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
+    try:
+        hashed_password = await get_password_hash_async(user.password)
+    except PasswordHashingBusy:
+        raise _hashing_unavailable()
+    
     # Create new user
-    db_user = create_user(db, user)
+    db_user = await run_in_threadpool(create_user, db, user, hashed_password)
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login user and return access token"""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    try:
+        user = await authenticate_user_async(db, form_data.username, form_data.password)
+    except PasswordHashingBusy:
+        raise _hashing_unavailable()
+    
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,6 +70,18 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
 
 @router.get("/me", response_model=User)
-def read_users_me(current_user: User = Depends(get_current_active_user)):
+def read_users_me(current_user: AuthenticatedUser = Depends(get_current_active_user)):
     """Get current user information"""
-    return current_user 
\ No newline at end of file
+    return current_user
+
+
+@router.get("/cache/stats")
+def get_auth_cache_stats(current_user: AuthenticatedUser = Depends(get_current_admin_user)):
+    """Get hit/miss/eviction counters of the authenticated user cache"""
+    return principal_cache.stats()
+
+
+@router.get("/hashing/stats")
+def get_password_hashing_stats(current_user: AuthenticatedUser = Depends(get_current_admin_user)):
+    """Get queue depth and load shedding counters of the password hashing pool"""
+    return password_pool.stats()
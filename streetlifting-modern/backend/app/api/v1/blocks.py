@@ -1,35 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_current_admin_user
+from app.core.database import get_async_db
 from app.models.user import User
 from app.schemas.training_block import (
     TrainingBlock, TrainingBlockCreate, TrainingBlockUpdate, 
     BlockProgress, WeeklyProjection, RpeTable
 )
-from app.services.training_block import TrainingBlockService
+from app.services.training_block import TrainingBlockService, AsyncTrainingBlockService, projection_cache
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[TrainingBlock])
-def get_training_blocks(
-    db: Session = Depends(get_db),
+async def get_training_blocks(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all training blocks for the current user"""
-    blocks = TrainingBlockService.get_training_blocks(db, current_user.id)
+    blocks = await AsyncTrainingBlockService.get_training_blocks(db, current_user.id)
     return blocks
 
 
 @router.get("/current/", response_model=TrainingBlock)
-def get_current_active_block(
-    db: Session = Depends(get_db),
+async def get_current_active_block(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get the currently active training block"""
-    block = TrainingBlockService.get_current_active_block(db, current_user.id)
+    block = await AsyncTrainingBlockService.get_current_active_block(db, current_user.id)
     if not block:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,6 +40,24 @@ def get_current_active_block(
     return block
 
 
+@router.get("/cache/stats")
+def get_projection_cache_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Get hit/miss/eviction counters of the projection cache (admin only)"""
+    return projection_cache.stats()
+
+
+@router.get("/rpe-tables")
+def get_rpe_tables_batch(
+    block_ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get RPE tables for several training blocks (all of the user's by default)"""
+    return TrainingBlockService.get_rpe_tables_for_blocks(db, current_user.id, block_ids)
+
+
 @router.post("/", response_model=TrainingBlock)
 def create_training_block(
     block_data: TrainingBlockCreate,
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.deps import get_current_active_user, get_current_admin_user
+from app.models.user import User
+from app.schemas.user_profile import InteractionType
+from app.services.data_export import EXPORT_DATASETS, EXPORT_FORMATS, export_filename, export_stream
+from app.services.user_adaptation import UserAdaptationService
+
+router = APIRouter()
+
+FORMAT_PATTERN = "^(ndjson|csv|parquet)$"
+
+
+def _export_response(datasets: list, export_format: str, user_id, gzip: bool, filename: str) -> StreamingResponse:
+    """Chunked download of the datasets (rows are read and encoded as the client consumes them)"""
+    try:
+        stream = export_stream(datasets, export_format, user_id=user_id, compress=gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+    return StreamingResponse(
+        stream,
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[export_format][0],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def _check_dataset(dataset: str) -> None:
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown dataset (available: {', '.join(EXPORT_DATASETS)})"
+        )
+
+
+@router.get("/")
+def export_history(
+    gzip: bool = False,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Stream every dataset of the current user as one NDJSON file (rows tagged with their dataset)"""
+    response = _export_response(
+        list(EXPORT_DATASETS), "ndjson", current_user.id, gzip, export_filename("training_history", "ndjson", gzip)
+    )
+    UserAdaptationService(db).enqueue_user_interaction(
+        user_id=current_user.id,
+        interaction_type=InteractionType.FEATURE_USE,
+        interaction_data={"feature": "data_export", "dataset": "all", "format": "ndjson"}
+    )
+    return response
+
+
+@router.get("/roster/{dataset}")
+def export_roster_dataset(
+    dataset: str,
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    gzip: bool = False,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Stream one dataset of every user (admin only; rows carry their user_id)"""
+    _check_dataset(dataset)
+    return _export_response([dataset], format, None, gzip, export_filename(f"roster_{dataset}", format, gzip))
+
+
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: str,
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    gzip: bool = False,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Stream one dataset of the current user as NDJSON, CSV or Parquet"""
+    _check_dataset(dataset)
+    response = _export_response([dataset], format, current_user.id, gzip, export_filename(dataset, format, gzip))
+    UserAdaptationService(db).enqueue_user_interaction(
+        user_id=current_user.id,
+        interaction_type=InteractionType.FEATURE_USE,
+        interaction_data={"feature": "data_export", "dataset": dataset, "format": format}
+    )
+    return response
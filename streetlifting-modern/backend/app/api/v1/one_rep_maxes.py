@@ -1,22 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
 from app.api.deps import get_db, get_current_user
+from app.core.database import get_async_db
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.models.user import User
 from app.schemas.training import OneRepMax, OneRepMaxCreate, OneRepMaxUpdate
-from app.services.training import TrainingService
+from app.services.training import TrainingService, AsyncTrainingService
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[OneRepMax])
-def get_one_rep_maxes(
-    db: Session = Depends(get_db),
+async def get_one_rep_maxes(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque token from X-Next-Cursor"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all OneRepMax records for the current user"""
-    one_rep_maxes = TrainingService.get_one_rep_maxes(db, current_user.id)
+    """Get OneRepMax records for the current user (all of them unless limit/cursor are given)"""
+    try:
+        one_rep_maxes = await AsyncTrainingService.get_one_rep_maxes(db, current_user.id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    next_page = next_cursor(one_rep_maxes, limit, "date_achieved")
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     return one_rep_maxes
 
 
@@ -2,29 +2,46 @@
 API endpoints for training program templates and automatic program generation
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_current_admin_user
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.models.user import User
 from app.schemas.program_templates import (
     TrainingProgramTemplate, ProgramGenerationRequest, ProgramGenerationResponse,
     ProgramOverview, WeeklyPlanView, TemplateRecommendation, OneRepMaxSchema,
     OneRepMaxCreate, OneRepMaxUpdate, WorkoutCompletionRequest, WorkoutCompletionResponse,
-    PlannedWorkoutSchema, UserRMData
+    PlannedWorkoutSchema, UserRMData, ProgramBatchRequest, ProgramBatchResponse,
+    ProgramRegenerationRequest, ProgramRegenerationResponse
 )
 from app.services.auto_program_generator import AutoProgramGeneratorService
+from app.services.training import TrainingService
 from app.core.program_templates import (
     STREETLIFTING_PROGRAM_TEMPLATES, get_templates_by_level, 
     get_all_templates, DifficultyLevel
 )
 from app.models.training import OneRepMax, PlannedWorkout, TrainingBlock
 from datetime import date, datetime, timedelta
+import time
 
 router = APIRouter()
 
 
+def _user_rms_to_dict(user_rms: UserRMData) -> Dict[str, float]:
+    """Convert UserRMData to the dict the generator service expects"""
+    return {
+        "pullups": user_rms.pullups,
+        "dips": user_rms.dips,
+        "muscle_ups": user_rms.muscle_ups,
+        "squats": user_rms.squats,
+        "deadlift": user_rms.deadlift,
+        "bench_press": user_rms.bench_press,
+        "overhead_press": user_rms.overhead_press
+    }
+
+
 @router.get("/templates", response_model=List[TrainingProgramTemplate])
 def get_program_templates(
     level: DifficultyLevel = None,
@@ -107,24 +124,19 @@ def generate_program_from_template(
     
     try:
         # Convert UserRMData to dict for the service
-        user_rms = {
-            "pullups": request.user_rms.pullups,
-            "dips": request.user_rms.dips,
-            "muscle_ups": request.user_rms.muscle_ups,
-            "squats": request.user_rms.squats,
-            "deadlift": request.user_rms.deadlift,
-            "bench_press": request.user_rms.bench_press,
-            "overhead_press": request.user_rms.overhead_press
-        }
+        user_rms = _user_rms_to_dict(request.user_rms)
         
         # Generate the complete program
+        timings = {}
         block = AutoProgramGeneratorService.create_program_from_template(
             db=db,
             user_id=current_user.id,
             template_key=request.template_key,
             start_date=request.start_date,
             user_rms=user_rms,
-            customizations=request.customizations
+            customizations=request.customizations,
+            bulk=request.bulk,
+            timings=timings
         )
         
         # Count total workouts
@@ -140,7 +152,8 @@ def generate_program_from_template(
             total_weeks=block.total_weeks,
             total_workouts=total_workouts,
             start_date=block.start_date,
-            end_date=block.end_date
+            end_date=block.end_date,
+            timings=timings
         )
         
     except Exception as e:
@@ -150,6 +163,40 @@ def generate_program_from_template(
         )
 
 
+@router.post("/generate/batch", response_model=ProgramBatchResponse)
+def generate_programs_batch(
+    request: ProgramBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Generate programs for many users at once (e.g. onboarding a whole cohort)"""
+    
+    started = time.perf_counter()
+    specs = [
+        {
+            "user_id": item.user_id,
+            "template_key": item.template_key,
+            "start_date": item.start_date,
+            "user_rms": _user_rms_to_dict(item.user_rms),
+            "customizations": item.customizations
+        }
+        for item in request.items
+    ]
+    
+    results = AutoProgramGeneratorService.create_programs_batch(
+        db, specs, chunk_size=request.chunk_size
+    )
+    succeeded = sum(1 for result in results if result["success"])
+    
+    return ProgramBatchResponse(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+        duration_ms=round((time.perf_counter() - started) * 1000, 3)
+    )
+
+
 @router.get("/programs/{block_id}/overview", response_model=ProgramOverview)
 def get_program_overview(
     block_id: int,
@@ -222,6 +269,41 @@ def get_program_overview(
     )
 
 
+@router.post("/programs/{block_id}/regenerate", response_model=ProgramRegenerationResponse)
+def regenerate_program(
+    block_id: int,
+    request: ProgramRegenerationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply retested 1RMs/customizations to the remaining workouts of a program"""
+    
+    block = db.query(TrainingBlock).filter(
+        TrainingBlock.id == block_id,
+        TrainingBlock.user_id == current_user.id
+    ).first()
+    
+    if not block:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Training block not found"
+        )
+    
+    try:
+        return AutoProgramGeneratorService.regenerate_remaining_workouts(
+            db,
+            block_id,
+            from_week=request.from_week,
+            user_rms=request.user_rms,
+            customizations=request.customizations
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.get("/programs/{block_id}/week/{week_number}")
 def get_week_plan(
     block_id: int,
@@ -276,12 +358,20 @@ def complete_workout(
             detail="Planned workout not found"
         )
     
+    # Lock the block row: its counters are updated in this transaction
+    block = db.query(TrainingBlock).filter(
+        TrainingBlock.id == workout.block_id
+    ).with_for_update().first()
+    db.refresh(workout, ["is_completed"])
+    
     if workout.is_completed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Workout already completed"
         )
     
+    AutoProgramGeneratorService.ensure_completion_counters(db, block)
+    
     # Update workout completion
     workout.is_completed = True
     workout.completed_at = datetime.utcnow()
@@ -296,33 +386,21 @@ def complete_workout(
     }
     workout.notes = str(completion_notes)  # Store as JSON string
     
-    # Find next workout
-    next_workout = db.query(PlannedWorkout).filter(
-        PlannedWorkout.block_id == workout.block_id,
-        PlannedWorkout.is_completed == False
-    ).order_by(PlannedWorkout.week_number, PlannedWorkout.day_number).first()
-    
-    # Check if week is completed
-    week_workouts = db.query(PlannedWorkout).filter(
-        PlannedWorkout.block_id == workout.block_id,
-        PlannedWorkout.week_number == workout.week_number
-    ).all()
-    
-    week_completed = all(w.is_completed for w in week_workouts)
-    
-    # Check if entire block is completed
-    all_workouts = db.query(PlannedWorkout).filter(
-        PlannedWorkout.block_id == workout.block_id
-    ).all()
+    # Week/block completion come from the block counters
+    week_completed, block_completed = AutoProgramGeneratorService.record_workout_completion(
+        block, workout.week_number
+    )
     
-    block_completed = all(w.is_completed for w in all_workouts)
+    # Find next workout (flush first: the session does not autoflush)
+    db.flush()
+    next_workout = AutoProgramGeneratorService.get_next_workout(db, block.id)
     
     # Update block progress if week completed
-    if week_completed and workout.block.current_week == workout.week_number:
-        workout.block.current_week = min(workout.week_number + 1, workout.block.total_weeks)
+    if week_completed and block.current_week == workout.week_number:
+        block.current_week = min(workout.week_number + 1, block.total_weeks)
     
     if block_completed:
-        workout.block.status = 'completed'
+        block.status = 'completed'
     
     db.commit()
     
@@ -345,15 +423,31 @@ def complete_workout(
 
 @router.get("/one-rep-maxes", response_model=List[OneRepMaxSchema])
 def get_user_one_rep_maxes(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque token from X-Next-Cursor"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all one rep maxes for the current user"""
     
-    one_rep_maxes = db.query(OneRepMax).filter(
-        OneRepMax.user_id == current_user.id
-    ).order_by(OneRepMax.exercise, OneRepMax.date_achieved.desc()).all()
+    if limit is None and cursor is None:
+        return db.query(OneRepMax).filter(
+            OneRepMax.user_id == current_user.id
+        ).order_by(OneRepMax.exercise, OneRepMax.date_achieved.desc()).all()
+    
+    # Paged history is ordered by (date_achieved, id) newest first
+    try:
+        one_rep_maxes = TrainingService.get_one_rep_maxes(db, current_user.id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
+    next_page = next_cursor(one_rep_maxes, limit, "date_achieved")
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     return one_rep_maxes
 
 
@@ -14,7 +14,7 @@ router = APIRouter()
 
 
 @router.post("/initial")
-async def initial_setup(
+def initial_setup(
     setup_data: Dict[str, Any],
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -128,7 +128,7 @@ async def initial_setup(
 
 
 @router.get("/status")
-async def get_setup_status(
+def get_setup_status(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -161,7 +161,7 @@ async def get_setup_status(
 
 
 @router.get("/recommendations")
-async def get_setup_recommendations(
+def get_setup_recommendations(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1,22 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 
-from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.core.database import get_db, get_async_db
+from app.api.deps import get_current_user, get_current_admin_user
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.models.user import User
 from app.schemas.user_profile import (
     UserProfile, UserProfileUpdate, UserInteraction, UserInteractionCreate,
     AdaptiveDashboardResponse, UserAnalytics, UserExperienceLevel,
     InteractionType
 )
-from app.services.user_adaptation import UserAdaptationService
+from app.services.user_adaptation import UserAdaptationService, AsyncUserAdaptationService
+from app.services.interaction_ingestion import interaction_queue
+from app.services.interaction_rollups import compact_interactions
+from app.services.dashboard_config import dashboard_configurations
+from app.services.level_recalculation import level_scheduler
 
 router = APIRouter()
 
 
 @router.get("/profile", response_model=UserProfile)
-async def get_user_profile(
+def get_user_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -28,7 +34,7 @@ async def get_user_profile(
 
 
 @router.put("/profile", response_model=UserProfile)
-async def update_user_profile(
+def update_user_profile(
     profile_update: UserProfileUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -50,7 +56,7 @@ async def update_user_profile(
 @router.get("/dashboard", response_model=AdaptiveDashboardResponse)
 async def get_adaptive_dashboard(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get personalized dashboard configuration.
@@ -59,20 +65,21 @@ async def get_adaptive_dashboard(
     with built-in safeguards against user encasement.
     """
     
-    service = UserAdaptationService(db)
+    service = AsyncUserAdaptationService(db)
+    dashboard = await service.get_adaptive_dashboard(current_user.id)
     
-    # Track this interaction
-    service.track_user_interaction(
+    # Track this interaction (buffered, written off the request path)
+    await service.enqueue_user_interaction(
         user_id=current_user.id,
         interaction_type=InteractionType.PAGE_VISIT,
         interaction_data={"page": "dashboard"}
     )
     
-    return service.get_adaptive_dashboard(current_user.id)
+    return dashboard
 
 
 @router.post("/interactions", response_model=UserInteraction)
-async def track_interaction(
+def track_interaction(
     interaction: UserInteractionCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -93,8 +100,80 @@ async def track_interaction(
     )
 
 
+@router.get("/interactions", response_model=List[UserInteraction])
+def get_interactions(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque token from X-Next-Cursor"),
+    interaction_type: Optional[InteractionType] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the current user's interaction history, newest first"""
+    
+    service = UserAdaptationService(db)
+    try:
+        interactions = service.get_user_interactions(
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            interaction_type=interaction_type
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    next_page = next_cursor(interactions, limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return interactions
+
+
+@router.get("/interactions/ingestion/stats")
+async def get_interaction_ingestion_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Get depth, throughput and backpressure counters of the interaction queue"""
+    return interaction_queue.stats()
+
+
+@router.post("/interactions/compact")
+def compact_user_interactions(
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Apply the interaction retention policy now instead of waiting for the scheduler"""
+    return compact_interactions(db)
+
+
+@router.post("/dashboard-configurations/refresh")
+def refresh_dashboard_configurations(
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Reload the shared dashboard configuration snapshot after editing the table"""
+    dashboard_configurations.invalidate()
+    dashboard_configurations.load(db)
+    return dashboard_configurations.stats()
+
+
+@router.get("/level/recalculation/stats")
+async def get_level_recalculation_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Get the state of the background level recalculation scheduler"""
+    return level_scheduler.stats()
+
+
+@router.post("/level/recalculation/run")
+def run_level_recalculation(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Re-score every profile that is due now instead of waiting for the scheduler"""
+    return level_scheduler.run_once()
+
+
 @router.post("/level/manual-override")
-async def manually_set_experience_level(
+def manually_set_experience_level(
     level: UserExperienceLevel,
     reason: Optional[str] = "user_preference",
     current_user: User = Depends(get_current_user),
@@ -122,7 +201,7 @@ async def manually_set_experience_level(
 
 
 @router.delete("/level/manual-override")
-async def remove_manual_level_override(
+def remove_manual_level_override(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -154,26 +233,27 @@ async def remove_manual_level_override(
 
 
 @router.get("/analytics", response_model=UserAnalytics)
-async def get_user_analytics(
+def get_user_analytics(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get detailed analytics about user behavior and adaptation"""
     
     service = UserAdaptationService(db)
+    analytics = service.get_user_analytics(current_user.id)
     
-    # Track analytics access
-    service.track_user_interaction(
+    # Track analytics access (buffered, written off the request path)
+    service.enqueue_user_interaction(
         user_id=current_user.id,
         interaction_type=InteractionType.FEATURE_USE,
         interaction_data={"feature": "user_analytics"}
     )
     
-    return service.get_user_analytics(current_user.id)
+    return analytics
 
 
 @router.post("/recalculate-level")
-async def force_level_recalculation(
+def force_level_recalculation(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -252,7 +332,7 @@ async def get_available_experience_levels():
 
 
 @router.get("/feature-discovery")
-async def get_feature_discovery_suggestions(
+def get_feature_discovery_suggestions(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -312,7 +392,7 @@ async def get_feature_discovery_suggestions(
         if feature in feature_descriptions:
             suggestions.append(feature_descriptions[feature])
     
-    service.track_user_interaction(
+    service.enqueue_user_interaction(
         user_id=current_user.id,
         interaction_type=InteractionType.FEATURE_USE,
         interaction_data={
@@ -329,7 +409,7 @@ async def get_feature_discovery_suggestions(
 
 
 @router.post("/feedback")
-async def provide_adaptation_feedback(
+def provide_adaptation_feedback(
     feedback_data: Dict[str, Any],
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -9,7 +9,7 @@ from typing import Dict, Any
 router = APIRouter()
 
 @router.get("/setup-status")
-async def get_setup_status(
+def get_setup_status(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -17,7 +17,7 @@ async def get_setup_status(
     return UserProfileService.get_setup_status(db, current_user.id)
 
 @router.post("/complete-setup")
-async def complete_setup(
+def complete_setup(
     setup_data: Dict[str, Any],
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -36,7 +36,7 @@ async def complete_setup(
         )
 
 @router.get("/profile")
-async def get_profile(
+def get_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -50,7 +50,7 @@ async def get_profile(
     return profile.to_dict()
 
 @router.put("/profile")
-async def update_profile(
+def update_profile(
     profile_data: Dict[str, Any],
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1,14 +1,17 @@
 from typing import List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.api.deps import get_current_active_user
 from app.models.user import User
-from app.services.workout import WorkoutService
+from app.services.workout import WorkoutService, AsyncWorkoutService, WorkoutVersionConflict
+from app.services.workout_sync import WorkoutSyncService
 from app.schemas.workout import (
     Workout, WorkoutCreate, WorkoutUpdate, WorkoutSummary, 
-    WorkoutProgress, ExerciseCreate
+    WorkoutProgress, ExerciseCreate, WorkoutSyncRequest, WorkoutSyncResponse
 )
 
 router = APIRouter()
@@ -26,45 +29,77 @@ def create_workout(
 
 
 @router.get("/", response_model=List[WorkoutSummary])
-def get_workouts(
+async def get_workouts(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     day_type: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque token from X-Next-Cursor; replaces skip"),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's workouts with optional filters"""
-    workout_service = WorkoutService(db)
-    workouts = workout_service.get_user_workouts(
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        start_date=start_date,
-        end_date=end_date,
-        day_type=day_type
-    )
-    
-    # Convert to summary format
-    summaries = []
-    for workout in workouts:
-        exercise_count = len(workout.exercises)
-        total_sets = sum(len([ex for ex in workout.exercises if ex.completed]) for _ in [workout])
-        
-        summaries.append(WorkoutSummary(
-            id=workout.id,
-            date=workout.date,
-            day_type=workout.day_type,
-            success=workout.success,
-            completed=workout.completed,
-            exercise_count=exercise_count,
-            total_sets=total_sets
-        ))
+    workout_service = AsyncWorkoutService(db)
+    try:
+        # Counts come from one aggregate query instead of loading each workout's exercises
+        summaries = await workout_service.get_user_workout_summaries(
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            start_date=start_date,
+            end_date=end_date,
+            day_type=day_type,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
+    _set_next_cursor(response, summaries, limit)
     return summaries
 
 
+@router.get("/full/list", response_model=List[Workout])
+def get_full_workouts(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    day_type: Optional[str] = None,
+    eager: bool = Query(False, description="Load all exercises with one extra query (selectinload)"),
+    cursor: Optional[str] = Query(None, description="Opaque token from X-Next-Cursor; replaces skip"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get user's workouts including their exercises"""
+    workout_service = WorkoutService(db)
+    try:
+        workouts = workout_service.get_user_workouts(
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            start_date=start_date,
+            end_date=end_date,
+            day_type=day_type,
+            eager=eager,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    _set_next_cursor(response, workouts, limit)
+    return workouts
+
+
+def _set_next_cursor(response: Response, workouts: list, limit: int) -> None:
+    """Expose the cursor of the next page, if there may be one"""
+    cursor = next_cursor(workouts, limit, "date")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
 @router.get("/{workout_id}", response_model=Workout)
 def get_workout(
     workout_id: int,
@@ -125,12 +160,13 @@ def delete_workout(
 
 @router.get("/pending/list", response_model=List[Workout])
 def get_pending_workouts(
+    eager: bool = Query(False, description="Load all exercises with one extra query (selectinload)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get workouts that are in progress"""
     workout_service = WorkoutService(db)
-    return workout_service.get_pending_workouts(current_user.id)
+    return workout_service.get_pending_workouts(current_user.id, eager=eager)
 
 
 @router.post("/progress/save", response_model=Workout)
@@ -139,10 +175,15 @@ def save_workout_progress(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Save workout progress (for in-progress workouts)"""
+    """Save workout progress (for in-progress workouts) as set-level upserts; 409 on a stale expected_version"""
     workout_service = WorkoutService(db)
     try:
         return workout_service.save_workout_progress(progress, current_user.id)
+    except WorkoutVersionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "current_version": e.current_version}
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -150,15 +191,36 @@ def save_workout_progress(
         )
 
 
+@router.post("/sync", response_model=WorkoutSyncResponse)
+def sync_workouts(
+    batch: WorkoutSyncRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply a batch of queued offline mutations (create_workout, upsert_sets,
+    complete, delete) in order and in one transaction. Every operation gets
+    its own result; replayed idempotency keys are reported as duplicates.
+    """
+    return WorkoutSyncService(db).apply_batch(batch, current_user.id)
+
+
 @router.post("/{workout_id}/complete", response_model=Workout)
 def complete_workout(
     workout_id: int,
+    expected_version: Optional[int] = Query(None, description="Reject with 409 unless the workout is at this version"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Mark a workout as completed"""
     workout_service = WorkoutService(db)
-    workout = workout_service.complete_workout(workout_id, current_user.id)
+    try:
+        workout = workout_service.complete_workout(workout_id, current_user.id, expected_version=expected_version)
+    except WorkoutVersionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "current_version": e.current_version}
+        )
     
     if not workout:
         raise HTTPException(
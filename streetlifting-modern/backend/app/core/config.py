@@ -11,6 +11,20 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./streetlifting.db"
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: int = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle_seconds: int = 1800
+    async_db_pool_size: int = 20
+    async_db_max_overflow: int = 10
+    
+    # SQLite pragmas applied on connect (WAL lets readers run alongside the writer)
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size_bytes: int = 268435456
     
     # Security
     secret_key: str = "your-secret-key-change-in-production"
@@ -23,6 +37,60 @@ class Settings(BaseSettings):
     # API
     api_v1_prefix: str = "/api/v1"
     
+    # Authenticated user cache (token -> principal). Invalidation on user changes
+    # only reaches the process that made them: with several workers, others can
+    # serve a deactivated or renamed user until the TTL runs out, so keep it short
+    auth_cache_enabled: bool = True
+    auth_cache_size: int = 10000
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_negative_ttl_seconds: int = 10
+    
+    # Password hashing pool (bcrypt runs off the event loop and request threadpool)
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
+    
+    # Projection cache
+    projection_cache_size: int = 512
+    projection_cache_ttl_seconds: int = 300
+    
+    # Batch program generation
+    program_generation_workers: int = 4  # Size of the shared process pool (1 generates in-process)
+    program_generation_chunk_size: int = 50
+    program_generation_pool_min_jobs: int = 500  # Smaller batches are generated in-process
+    
+    # Interaction ingestion queue
+    interaction_ingestion_enabled: bool = True
+    interaction_batch_size: int = 200
+    interaction_flush_interval_seconds: float = 1.0
+    interaction_queue_size: int = 10000
+    
+    # Interaction retention (raw rows are compacted into the rollups)
+    interaction_retention_days: int = 90
+    interaction_hourly_rollup_retention_days: int = 30
+    
+    # Offline workout sync (idempotency keys of applied operations)
+    workout_sync_key_retention_days: int = 30
+
+    # Streaming data export (rows fetched from the cursor per chunk, gzip level 1-9)
+    export_chunk_size: int = 1000
+    export_gzip_level: int = 6
+
+    # Background level recalculation
+    level_recalculation_enabled: bool = True
+    level_recalculation_interval_seconds: int = 3600
+    level_recalculation_batch_size: int = 500
+    level_recalculation_lease_seconds: int = 600  # One worker runs each pass; renewed after every page
+    
+    # Dashboard configuration snapshot
+    dashboard_config_max_age_seconds: int = 300
+    
+    # Startup ("auto" creates the schema when the schema_version marker is stale, "fast" skips it)
+    startup_mode: str = "auto"
+    seed_on_startup: bool = False
+    
+    # Admin
+    admin_username: str = "admin"
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
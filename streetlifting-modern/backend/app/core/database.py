@@ -1,27 +1,136 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
 from app.core.base import Base
+from app.core.pool_metrics import PoolCheckoutMetrics, timed_pool_class
 
 SQLALCHEMY_DATABASE_URL = settings.database_url
 
+# Checkout wait times of the sync and async pools (see database_stats)
+pool_metrics = {"sync": PoolCheckoutMetrics(), "async": PoolCheckoutMetrics()}
+
+
+def is_sqlite(url: str) -> bool:
+    """Whether url points at a SQLite database"""
+    return url.startswith("sqlite")
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMA profile applied to every new SQLite connection (empty settings are skipped)"""
+    pragmas = {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        # Negative cache_size is in KiB instead of pages
+        "cache_size": -settings.sqlite_cache_size_kib if settings.sqlite_cache_size_kib else None,
+        "mmap_size": settings.sqlite_mmap_size_bytes
+    }
+    return {name: value for name, value in pragmas.items() if value not in (None, "")}
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Engine "connect" listener: WAL lets readers proceed while one connection writes"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _pool_options(url: str, pool_class, metrics: PoolCheckoutMetrics) -> Dict[str, Any]:
+    """create_engine pool arguments from settings (in-memory SQLite keeps its default pool)"""
+    if is_sqlite(url) and (":memory:" in url or url.rstrip("/") in ("sqlite:", "sqlite+aiosqlite:")):
+        return {}
+    options = {
+        "poolclass": timed_pool_class(pool_class, metrics),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        # Local SQLite files cannot drop a connection, so there is nothing to ping
+        "pool_pre_ping": settings.db_pool_pre_ping and not is_sqlite(url)
+    }
+    return options
+
+
+def create_database_engine(url: str):
+    """Pooled sync engine for url (SQLite connections get the sqlite_pragmas profile)"""
+    if is_sqlite(url):
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000},
+            **_pool_options(url, QueuePool, pool_metrics["sync"])
+        )
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+        return engine
+    return create_engine(url, **_pool_options(url, QueuePool, pool_metrics["sync"]))
+
+
 # Create engine with SQLite-specific parameters
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, 
-        connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_database_engine(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# For async operations (if using PostgreSQL)
+
+def async_database_url(url: str) -> str:
+    """Same database through its async driver (asyncpg for PostgreSQL, aiosqlite for SQLite)"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def create_async_database_engine(url: str):
+    """Pooled async engine for url (raises ImportError when its async driver is missing)"""
+    # aiosqlite defaults to NullPool (a new connection and thread per session), so pool it too
+    options = _pool_options(url, AsyncAdaptedQueuePool, pool_metrics["async"])
+    if options:
+        options["pool_size"] = settings.async_db_pool_size
+        options["max_overflow"] = settings.async_db_max_overflow
+    async_engine = create_async_engine(async_database_url(url), **options)
+    if is_sqlite(url):
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return async_engine
+
+
+# For async routes (AsyncSession on a pooled async engine)
 async_engine = None
-if not SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    async_database_url = SQLALCHEMY_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-    async_engine = create_async_engine(async_database_url)
+AsyncSessionLocal = None
+try:
+    async_engine = create_async_database_engine(SQLALCHEMY_DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+except ImportError as e:
+    print(f"Warning: Async database driver not installed, async routes are unavailable: {e}")
+
+
+def database_stats() -> Dict[str, Any]:
+    """Pool occupancy and checkout wait metrics of both engines, plus the SQLite pragmas"""
+    stats = {"sync": _engine_pool_stats(engine, pool_metrics["sync"])}
+    if async_engine is not None:
+        stats["async"] = _engine_pool_stats(async_engine.sync_engine, pool_metrics["async"])
+    if is_sqlite(SQLALCHEMY_DATABASE_URL):
+        stats["sqlite_pragmas"] = sqlite_pragmas()
+    return stats
+
+
+def _engine_pool_stats(sync_engine, metrics: PoolCheckoutMetrics) -> Dict[str, Any]:
+    """Pool size/occupancy (for queue pools) merged with the checkout metrics"""
+    pool = sync_engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow()
+        })
+    stats.update(metrics.stats())
+    return stats
 
 
 def get_db():
@@ -35,13 +144,7 @@ def get_db():
 
 async def get_async_db():
     """Dependency to get async database session"""
-    if async_engine:
-        async with AsyncSession(async_engine) as session:
-            yield session
-    else:
-        # Fallback to sync for SQLite
-        db = SessionLocal()
-        try:
-            yield db
-        finally:
-            db.close() 
\ No newline at end of file
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database driver not installed (asyncpg or aiosqlite)")
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -0,0 +1,68 @@
+"""
+Keyset (cursor) pagination helpers
+
+Listings are ordered newest first by (sort column, id) and the next page
+starts strictly after the last row of the previous one, so a page costs the
+same no matter how deep into the history it is. Cursors are opaque
+url-safe tokens; clients must pass them back unchanged.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Build the opaque token pointing after a (sort value, id) pair"""
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column=None) -> Tuple[Any, int]:
+    """Parse a token back into (sort value, id); raises ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        row_id = int(row_id)
+        if sort_column is not None and sort_value is not None:
+            python_type = sort_column.type.python_type
+            if python_type in (date, datetime):
+                sort_value = python_type.fromisoformat(sort_value)
+    except (ValueError, TypeError, NotImplementedError, json.JSONDecodeError):
+        raise ValueError("Invalid pagination cursor")
+    return sort_value, row_id
+
+
+def apply_keyset(query, id_column, cursor: Optional[str] = None, sort_column=None):
+    """Order a query newest first and skip everything up to the cursor"""
+    if sort_column is None:
+        query = query.order_by(id_column.desc())
+    else:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+
+    if not cursor:
+        return query
+
+    sort_value, row_id = decode_cursor(cursor, sort_column)
+    if sort_column is None:
+        return query.filter(id_column < row_id)
+
+    return query.filter(or_(
+        sort_column < sort_value,
+        and_(sort_column == sort_value, id_column < row_id)
+    ))
+
+
+def next_cursor(items: List[Any], limit: Optional[int], sort_attr: Optional[str] = None) -> Optional[str]:
+    """Cursor for the page after items, or None when the page was not full"""
+    if not limit or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, sort_attr) if sort_attr else None, last.id)
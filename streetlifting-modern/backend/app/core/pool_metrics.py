@@ -0,0 +1,68 @@
+"""
+Connection pool checkout metrics
+
+SQLAlchemy pools do not report how long a checkout waited for a free
+connection. timed_pool_class() derives a pool class that times every
+checkout (including timeouts) into a PoolCheckoutMetrics, so pool
+saturation shows up before requests start failing.
+"""
+
+from typing import Any, Dict
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+
+class PoolCheckoutMetrics:
+    """Thread-safe counters of pool checkouts and their wait times"""
+
+    SLOW_CHECKOUT_MS = 100.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.slow_checkouts = 0  # waited more than SLOW_CHECKOUT_MS
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        """Record one checkout attempt"""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            if wait_ms > self.SLOW_CHECKOUT_MS:
+                self.slow_checkouts += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Checkout counters for monitoring"""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "avg_wait_ms": (self.total_wait_ms / attempts) if attempts else 0.0,
+                "max_wait_ms": self.max_wait_ms
+            }
+
+
+def timed_pool_class(pool_class, metrics: PoolCheckoutMetrics):
+    """Subclass of pool_class recording every checkout wait into metrics"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = pool_class._do_get(self)
+        except PoolTimeoutError:
+            metrics.record((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        metrics.record((time.perf_counter() - started) * 1000)
+        return connection
+
+    return type(f"Timed{pool_class.__name__}", (pool_class,), {"_do_get": _do_get})
@@ -0,0 +1,98 @@
+"""
+Application startup phases
+
+Every worker used to run create_all and the admin/routine seeding on boot,
+repeating the same schema and seed round trips on each cold start. Now the
+schema is created only when the schema_version marker differs from
+SCHEMA_VERSION (or never, with startup_mode="fast" when migrations run as a
+deploy step), seeding is an explicit command (seed_database.py) unless
+seed_on_startup is set, and each phase is timed into startup_timings.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+
+from app.core.base import Base
+from app.core.config import settings
+
+# Latest migration revision; bump it together with every migration that changes the schema
+SCHEMA_VERSION = "add_scheduler_leases"
+
+
+class StartupTimings:
+    """Wall time of each startup phase, in the order they ran"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.schema_status: Optional[str] = None
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        self.phases[name] = round(elapsed_ms, 2)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as phase name"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": settings.startup_mode,
+            "schema": self.schema_status,
+            "phases_ms": dict(self.phases),
+            "total_ms": round(sum(self.phases.values()), 2)
+        }
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name} {elapsed:.0f}ms" for name, elapsed in self.phases.items())
+        return f"🚀 Startup ({settings.startup_mode}, schema {self.schema_status}): {phases}"
+
+
+startup_timings = StartupTimings()
+
+
+def current_schema_version(bind) -> Optional[str]:
+    """Version recorded in the schema_version marker (None when the table or row is missing)"""
+    from app.models.schema_version import SchemaVersion
+
+    try:
+        with bind.connect() as conn:
+            return conn.execute(select(SchemaVersion.version).where(SchemaVersion.id == 1)).scalar()
+    except DBAPIError:
+        return None
+
+
+def prepare_schema(bind, mode: Optional[str] = None) -> str:
+    """Create missing tables unless the marker already matches; returns skipped/current/created"""
+    if (mode or settings.startup_mode) == "fast":
+        return "skipped"
+    if current_schema_version(bind) == SCHEMA_VERSION:
+        return "current"
+
+    import app.models  # noqa: F401 - registers every table on Base.metadata
+    from app.models.schema_version import SchemaVersion
+
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        updated = conn.execute(
+            SchemaVersion.__table__.update().where(SchemaVersion.id == 1).values(version=SCHEMA_VERSION)
+        ).rowcount
+        if not updated:
+            conn.execute(SchemaVersion.__table__.insert().values(id=1, version=SCHEMA_VERSION))
+    return "created"
+
+
+def seed_database() -> None:
+    """Admin user and example routines (both skip what already exists)"""
+    from app.core.init_admin import create_admin_user
+    from app.core.init_routines import create_example_routines
+
+    create_admin_user()
+    create_example_routines()
@@ -1,20 +1,29 @@
 from .user import User
-from .user_profile import UserProfile, UserInteraction, DashboardConfiguration, UserExperienceLevel
-from .workout import Workout, Exercise
-from .training import TrainingBlock, BlockStage, OneRepMax
+from .user_profile import UserProfile, UserInteraction, UserInteractionRollup, DashboardConfiguration, UserExperienceLevel
+from .workout import Workout, Exercise, WorkoutSyncMutation, ExerciseWeeklyStats
+from .training import TrainingBlock, BlockStage, OneRepMax, EstimatedMax, EstimatedMaxDaily
 from .routine import Routine, RoutineExercise
+from .schema_version import SchemaVersion
+from .scheduler_lease import SchedulerLease
 
 __all__ = [
     "User",
     "UserProfile",
     "UserInteraction", 
+    "UserInteractionRollup",
     "DashboardConfiguration",
     "UserExperienceLevel",
     "Workout", 
     "Exercise",
+    "WorkoutSyncMutation",
+    "ExerciseWeeklyStats",
     "TrainingBlock",
     "BlockStage", 
     "OneRepMax",
+    "EstimatedMax",
+    "EstimatedMaxDaily",
     "Routine",
-    "RoutineExercise"
+    "RoutineExercise",
+    "SchemaVersion",
+    "SchedulerLease"
 ] 
\ No newline at end of file
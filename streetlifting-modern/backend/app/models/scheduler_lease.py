@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime
+from app.core.base import Base
+
+
+class SchedulerLease(Base):
+    """Lease on a background job, held by one process at a time until it expires"""
+    __tablename__ = "scheduler_leases"
+    
+    name = Column(String(50), primary_key=True)
+    holder = Column(String(100), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
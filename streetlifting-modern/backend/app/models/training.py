@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, ForeignKey, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, ForeignKey, DateTime, Text, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.base import Base
@@ -68,6 +68,10 @@ class TrainingBlock(Base):
     wave_amplitude = Column(Integer, nullable=True, default=10)
     wave_frequency = Column(String(50), nullable=True, default="weekly")
     max_reps = Column(JSON, nullable=True)  # Max reps for exercises
+    # Planned workout completion counters (NULL until first computed)
+    total_workouts_count = Column(Integer, nullable=True)
+    completed_workouts_count = Column(Integer, nullable=True)
+    weekly_completion = Column(JSON, nullable=True)  # {"week": {"total": n, "completed": n}}
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -76,6 +80,11 @@ class TrainingBlock(Base):
     program = relationship("TrainingProgram", back_populates="blocks")
     stages = relationship("BlockStage", back_populates="block", cascade="all, delete-orphan")
     workouts = relationship("PlannedWorkout", back_populates="block", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Active block of a user
+        Index("ix_training_blocks_user_active", "user_id", "is_active"),
+    )
 
 
 class BlockStage(Base):
@@ -114,6 +123,11 @@ class PlannedWorkout(Base):
     
     # Relationships
     block = relationship("TrainingBlock", back_populates="workouts")
+    
+    __table_args__ = (
+        # Next pending workout of a block in schedule order (also serves the per-block plan lookups)
+        Index("ix_planned_workouts_block_pending", "block_id", "is_completed", "week_number", "day_number"),
+    )
 
 
 class ExerciseTemplate(Base):
@@ -147,4 +161,46 @@ class OneRepMax(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="one_rep_maxes") 
\ No newline at end of file
+    user = relationship("User", back_populates="one_rep_maxes")
+    
+    __table_args__ = (
+        # Latest/history 1RM per user and exercise
+        Index("ix_one_rep_maxes_user_exercise_date", "user_id", "exercise", "date_achieved"),
+    )
+
+
+class EstimatedMax(Base):
+    """Best estimated 1RM per user and exercise, maintained from completed workouts (app/services/e1rm_index.py)"""
+    __tablename__ = "estimated_maxes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    exercise = Column(String(100), nullable=False)
+    best_e1rm = Column(Float, nullable=False)
+    best_date = Column(Date, nullable=False)
+    best_exercise_id = Column(Integer, nullable=True)  # Set that produced best_e1rm
+    last_date = Column(Date, nullable=False)  # Last day the exercise was trained
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "exercise", name="uq_estimated_maxes_user_exercise"),
+    )
+
+
+class EstimatedMaxDaily(Base):
+    """Best estimated 1RM per user, exercise and training day (rolling-window lookups)"""
+    __tablename__ = "estimated_max_daily"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    exercise = Column(String(100), nullable=False)
+    date = Column(Date, nullable=False)
+    best_e1rm = Column(Float, nullable=False)
+    best_exercise_id = Column(Integer, nullable=True)
+    sets = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # Also serves the (user, exercise, date >= cutoff) window lookups
+        UniqueConstraint("user_id", "exercise", "date", name="uq_estimated_max_daily_user_exercise_date"),
+    )
+
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, JSON, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.base import Base
 from enum import Enum
 from typing import Dict, List, Optional
+from datetime import datetime
 
 
 class UserExperienceLevel(str, Enum):
@@ -37,6 +38,29 @@ class UserProfile(Base):
     initial_dips_rm = Column(Float, nullable=True)  # kg
     initial_squats_rm = Column(Float, nullable=True)  # kg
     
+    # Adaptive experience profile (maintained by UserAdaptationService)
+    manual_override_level = Column(String(50), nullable=True)
+    technical_experience_score = Column(Float, default=0.0)
+    training_commitment_score = Column(Float, default=0.0)
+    needs_sophistication_score = Column(Float, default=0.0)
+    
+    # Behaviour counters, updated from tracked interactions
+    navigation_patterns = Column(JSON, default=dict)  # Legacy page -> visits, no longer written (see interaction_rollups)
+    feature_usage_frequency = Column(JSON, default=dict)  # Legacy feature -> uses, no longer written (see interaction_rollups)
+    session_duration_avg = Column(Float, default=0.0)  # seconds, moving average
+    terminology_usage = Column(JSON, default=dict)  # term -> uses
+    manual_adjustments_count = Column(Integer, default=0)
+    help_requests = Column(JSON, default=dict)  # topic -> requests
+    workout_frequency_7d = Column(Float, default=0.0)
+    workout_frequency_30d = Column(Float, default=0.0)
+    data_quality_score = Column(Float, default=0.0)
+    
+    # Adaptive dashboard preferences
+    preferred_dashboard_layout = Column(String(50), default="auto")
+    feature_discovery_enabled = Column(Boolean, default=True)
+    auto_adaptation_enabled = Column(Boolean, default=True)
+    last_level_calculation = Column(DateTime, default=datetime.utcnow)
+    
     # Training preferences
     preferred_training_time = Column(String(20), nullable=True)  # morning, afternoon, evening
     available_training_days = Column(JSON, nullable=True)  # Array of days
@@ -64,6 +88,11 @@ class UserProfile(Base):
     # Relationship
     user = relationship("User", back_populates="profile")
     
+    __table_args__ = (
+        # Profiles due for the periodic level re-score
+        Index("ix_user_profiles_level_due", "last_level_calculation"),
+    )
+    
     def to_dict(self):
         return {
             "id": self.id,
@@ -116,6 +145,33 @@ class UserInteraction(Base):
     
     # Relationships
     user = relationship("User")
+    
+    __table_args__ = (
+        # Per-user interaction history, optionally by type, in time order
+        Index("ix_user_interactions_user_type_created", "user_id", "interaction_type", "created_at"),
+    )
+
+
+class UserInteractionRollup(Base):
+    """Hourly/daily interaction counts per user, type and page/feature, maintained incrementally"""
+    __tablename__ = "user_interaction_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    granularity = Column(String(10), nullable=False)  # hour, day
+    bucket_start = Column(DateTime, nullable=False)  # UTC start of the hour/day
+    interaction_type = Column(String(100), nullable=False)
+    key = Column(String(100), nullable=False, default="")  # page or feature, "" for other types
+    count = Column(Integer, nullable=False, default=0)
+    duration_total = Column(Float, nullable=False, default=0.0)  # seconds
+    
+    __table_args__ = (
+        # One row per bucket; also serves per-user range reads by granularity
+        UniqueConstraint(
+            "user_id", "granularity", "bucket_start", "interaction_type", "key",
+            name="uq_user_interaction_rollups_bucket"
+        ),
+    )
 
 
 class DashboardConfiguration(Base):
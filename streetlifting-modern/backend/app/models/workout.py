@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, ForeignKey, DateTime, Text, Index, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.base import Base
@@ -16,6 +16,8 @@ class Workout(Base):
     in_progress = Column(Boolean, nullable=False, default=False)
     completed = Column(Boolean, nullable=False, default=False)
     notes = Column(Text, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped by every progress save/completion that changes it
+    client_id = Column(String(64), nullable=True)  # Id assigned by the client when created offline
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -23,13 +25,22 @@ class Workout(Base):
     user = relationship("User", back_populates="workouts")
     routine = relationship("Routine", back_populates="workouts")
     exercises = relationship("Exercise", back_populates="workout", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # History and recent-workout lookups (filtered by user, sorted by date)
+        Index("ix_workouts_user_date", "user_id", "date"),
+        # Pending (in progress) workouts of a user
+        Index("ix_workouts_user_in_progress", "user_id", "in_progress"),
+        # Offline-created workouts, resolved by their client id on sync
+        Index("ix_workouts_user_client_id", "user_id", "client_id", unique=True),
+    )
 
 
 class Exercise(Base):
     __tablename__ = "exercises"
     
     id = Column(Integer, primary_key=True, index=True)
-    workout_id = Column(Integer, ForeignKey("workouts.id"), nullable=False)
+    workout_id = Column(Integer, ForeignKey("workouts.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     weight = Column(Float, nullable=False)
     reps = Column(Integer, nullable=False)
@@ -37,7 +48,47 @@ class Exercise(Base):
     notes = Column(String(200), nullable=True)
     completed = Column(Boolean, default=True)
     set_number = Column(Integer, nullable=False, default=1)
+    client_set_id = Column(String(64), nullable=True)  # Set id assigned by the client (offline autosave)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    workout = relationship("Workout", back_populates="exercises") 
\ No newline at end of file
+    workout = relationship("Workout", back_populates="exercises") 
+
+
+class WorkoutSyncMutation(Base):
+    """Applied offline sync operation, kept so replays of its idempotency key return the same result"""
+    __tablename__ = "workout_sync_mutations"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    idempotency_key = Column(String(64), nullable=False)
+    op = Column(String(20), nullable=False)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "idempotency_key", name="uq_workout_sync_mutations_key"),
+    )
+
+
+class ExerciseWeeklyStats(Base):
+    """Completed-set totals per user, exercise and ISO week (week_start is the Monday)"""
+    __tablename__ = "exercise_weekly_stats"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    exercise = Column(String(100), nullable=False)
+    week_start = Column(Date, nullable=False)
+    sets = Column(Integer, nullable=False, default=0)
+    total_reps = Column(Integer, nullable=False, default=0)
+    total_weight = Column(Float, nullable=False, default=0)  # Sum of set weights (average weight = total_weight / sets)
+    volume = Column(Float, nullable=False, default=0)  # Sum of weight * reps
+    max_weight = Column(Float, nullable=False, default=0)
+    rpe_total = Column(Float, nullable=False, default=0)
+    rpe_sets = Column(Integer, nullable=False, default=0)  # Sets with an RPE (average RPE = rpe_total / rpe_sets)
+    
+    __table_args__ = (
+        # Also serves the (user, week_start range) stats lookups
+        UniqueConstraint("user_id", "exercise", "week_start", name="uq_exercise_weekly_stats_user_exercise_week"),
+        Index("ix_exercise_weekly_stats_user_week", "user_id", "week_start"),
+    )
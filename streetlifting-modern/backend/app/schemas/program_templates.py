@@ -113,7 +113,9 @@ class ProgramGenerationRequest(BaseModel):
     template_key: str
     start_date: date
     user_rms: UserRMData
-    customizations: Optional[Dict[str, Any]] = None
+    customizations: Optional[Dict[str, Any]] = None  # Strategy/parameter columns of the block (CUSTOMIZABLE_BLOCK_FIELDS)
+    bulk: bool = False  # Write stages/workouts with executemany INSERTs
+
 
 
 class ProgramGenerationResponse(BaseModel):
@@ -125,6 +127,55 @@ class ProgramGenerationResponse(BaseModel):
     total_workouts: int
     start_date: date
     end_date: date
+    timings: Optional[Dict[str, float]] = None  # Generation phase durations (ms)
+
+
+class ProgramBatchItem(BaseModel):
+    user_id: int
+    template_key: str
+    start_date: date
+    user_rms: UserRMData
+    customizations: Optional[Dict[str, Any]] = None  # Strategy/parameter columns of the block (CUSTOMIZABLE_BLOCK_FIELDS)
+
+
+class ProgramBatchRequest(BaseModel):
+    items: List[ProgramBatchItem] = Field(..., min_length=1, max_length=1000)
+    chunk_size: Optional[int] = Field(None, ge=1, le=500)
+
+
+class ProgramBatchItemResult(BaseModel):
+    index: int
+    user_id: int
+    template_key: str
+    success: bool
+    block_id: Optional[int] = None
+    block_name: Optional[str] = None
+    total_workouts: int = 0
+    error: Optional[str] = None
+
+
+class ProgramBatchResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[ProgramBatchItemResult]
+    duration_ms: float
+
+
+class ProgramRegenerationRequest(BaseModel):
+    from_week: Optional[int] = Field(None, ge=1)
+    user_rms: Optional[Dict[str, float]] = None  # Only the retested lifts
+    customizations: Optional[Dict[str, Any]] = None  # Strategy/parameter columns of the block (CUSTOMIZABLE_BLOCK_FIELDS)
+
+
+class ProgramRegenerationResponse(BaseModel):
+    block_id: int
+    from_week: int
+    changed_training_maxes: Dict[str, Dict[str, Optional[float]]]
+    changed_fields: List[str]
+    workouts_checked: int
+    workouts_updated: int
+    updated_weeks: List[int]
 
 
 class WeeklyPlanView(BaseModel):
@@ -31,6 +31,20 @@ class User(UserInDB):
     pass
 
 
+class AuthenticatedUser(BaseModel):
+    """Immutable identity of the user behind a request (cached, no ORM session needed)"""
+    id: int
+    username: str
+    email: str
+    is_active: bool = True
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
 class UserLogin(BaseModel):
     username: str
     password: str
@@ -42,4 +56,5 @@ class Token(BaseModel):
 
 
 class TokenData(BaseModel):
-    username: Optional[str] = None 
\ No newline at end of file
+    username: Optional[str] = None
+    expires_at: Optional[datetime] = None 
\ No newline at end of file
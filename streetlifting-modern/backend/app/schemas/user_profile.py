@@ -157,6 +157,7 @@ class UserAnalytics(BaseModel):
     recent_interactions: List[UserInteraction]
     level_progression_timeline: List[Dict[str, Any]]
     recommendations: List[str]
+    activity_summary: Dict[str, Any] = {}  # Last 30 days, from the interaction rollups
 
 
 class LevelTransition(BaseModel):
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Any
 from datetime import date, datetime
+from datetime import date as date_type  # for fields named date
 
 
 class ExerciseBase(BaseModel):
@@ -30,6 +31,7 @@ class ExerciseUpdate(BaseModel):
 class Exercise(ExerciseBase):
     id: int
     workout_id: int
+    client_set_id: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -61,6 +63,8 @@ class Workout(WorkoutBase):
     success: bool
     in_progress: bool
     completed: bool
+    version: int = 1
+    client_id: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     exercises: List[Exercise] = []
@@ -82,10 +86,66 @@ class WorkoutSummary(BaseModel):
         from_attributes = True
 
 
+class WorkoutSetUpsert(BaseModel):
+    """One set of an autosave, matched by client_set_id or else by set_number; unset fields are kept"""
+    set_number: int = Field(..., gt=0)
+    client_set_id: Optional[str] = Field(None, max_length=64)
+    deleted: bool = False
+    name: Optional[str] = None
+    weight: Optional[float] = Field(None, gt=0)
+    reps: Optional[int] = Field(None, gt=0)
+    rpe: Optional[float] = Field(None, ge=1, le=10)
+    notes: Optional[str] = None
+    completed: Optional[bool] = None
+
+
 class WorkoutProgress(BaseModel):
     workout_id: Optional[int] = None
+    client_workout_id: Optional[str] = Field(None, max_length=64)  # Creates once, later saves resolve to it
+    expected_version: Optional[int] = None  # Rejected with 409 when the workout moved past it
     date: date
     day_type: str
     in_progress: bool = True
     completed: bool = False
-    exercises: List[ExerciseCreate] = [] 
\ No newline at end of file
+    exercises: Optional[List[ExerciseCreate]] = None  # Full set list (set i = position i); omitted keeps the sets
+    sets: List[WorkoutSetUpsert] = [] 
+
+
+# Largest batch accepted by POST /workouts/sync
+MAX_SYNC_OPERATIONS = 500
+
+
+class WorkoutSyncOperation(BaseModel):
+    idempotency_key: str = Field(..., min_length=1, max_length=64)
+    op: str = Field(..., pattern="^(create_workout|upsert_sets|complete|delete)$")
+    workout_id: Optional[int] = None
+    client_workout_id: Optional[str] = Field(None, max_length=64)
+    expected_version: Optional[int] = None
+    # create_workout
+    date: Optional[date_type] = None
+    day_type: Optional[str] = None
+    notes: Optional[str] = None
+    # create_workout / upsert_sets
+    exercises: Optional[List[ExerciseCreate]] = None
+    sets: List[WorkoutSetUpsert] = []
+
+
+class WorkoutSyncRequest(BaseModel):
+    operations: List[WorkoutSyncOperation] = Field(..., max_length=MAX_SYNC_OPERATIONS)
+
+
+class WorkoutSyncResult(BaseModel):
+    idempotency_key: str
+    op: str
+    status: str  # applied, duplicate, conflict, not_found, invalid
+    workout_id: Optional[int] = None
+    client_workout_id: Optional[str] = None
+    version: Optional[int] = None
+    detail: Optional[Any] = None
+
+
+class WorkoutSyncResponse(BaseModel):
+    results: List[WorkoutSyncResult]
+    applied: int
+    duplicates: int
+    failed: int
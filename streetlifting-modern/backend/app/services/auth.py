@@ -1,15 +1,35 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import hashlib
+from fastapi.concurrency import run_in_threadpool
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.models.user import User
-from app.schemas.user import UserCreate, TokenData
+from app.schemas.user import UserCreate, TokenData, AuthenticatedUser
+from app.services.password_hashing import password_pool
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Token -> (principal, error detail). Failed lookups are cached too, for
+# auth_cache_negative_ttl_seconds. Entries are tagged with the token's
+# username (and user id) so committed changes to that user drop them (see
+# the User listeners below). Bulk Query.update() bypasses the listeners:
+# call invalidate_user_principals() or principal_cache.clear() after one.
+# The cache is per process; other workers only see a change once their
+# entries expire (auth_cache_ttl_seconds).
+principal_cache = TTLCache(
+    maxsize=settings.auth_cache_size,
+    ttl_seconds=settings.auth_cache_ttl_seconds
+)
+
+# Session.info key of the cache tags of users written in the open transaction
+PENDING_PRINCIPAL_TAGS = "pending_principal_tags"
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -21,6 +41,16 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing pool (raises PasswordHashingBusy when saturated)"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the hashing pool (raises PasswordHashingBusy when saturated)"""
+    return await password_pool.run(get_password_hash, password)
+
+
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
     """Authenticate a user with username and password"""
     user = db.query(User).filter(User.username == username).first()
@@ -31,6 +61,16 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     return user
 
 
+async def authenticate_user_async(db: Session, username: str, password: str) -> Optional[User]:
+    """authenticate_user for async routes: lookup on the threadpool, bcrypt on the hashing pool"""
+    user = await run_in_threadpool(get_user_by_username, db, username)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -51,7 +91,11 @@ def verify_token(token: str) -> Optional[TokenData]:
         username: str = payload.get("sub")
         if username is None:
             return None
-        token_data = TokenData(username=username)
+        expires = payload.get("exp")
+        token_data = TokenData(
+            username=username,
+            expires_at=datetime.utcfromtimestamp(expires) if expires is not None else None
+        )
         return token_data
     except JWTError:
         return None
@@ -62,11 +106,100 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
 
-def create_user(db: Session, user: UserCreate) -> User:
-    """Create a new user with adaptive profile initialization"""
+def resolve_principal(db: Session, token: str) -> Tuple[Optional[AuthenticatedUser], Optional[str]]:
+    """
+    Resolve a bearer token to the user behind it, through principal_cache.
+
+    Returns (principal, None) or (None, error detail). Only a cache miss
+    decodes the JWT and queries the database. Positive entries never outlive
+    the token's own expiry.
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    if settings.auth_cache_enabled:
+        cached = principal_cache.get(key)
+        if cached is not None:
+            return cached
+    
+    token_data = verify_token(token)
+    ttl_seconds = settings.auth_cache_negative_ttl_seconds
+    tags = ()
+    if token_data is None:
+        result = (None, "Could not validate credentials")
+    else:
+        tags = (_principal_tag(token_data.username),)
+        user = get_user_by_username(db, username=token_data.username)
+        if user is None:
+            result = (None, "User not found")
+        else:
+            result = (AuthenticatedUser.model_validate(user), None)
+            tags += (_principal_id_tag(user.id),)
+            ttl_seconds = settings.auth_cache_ttl_seconds
+            if token_data.expires_at is not None:
+                ttl_seconds = min(ttl_seconds, (token_data.expires_at - datetime.utcnow()).total_seconds())
+    
+    if settings.auth_cache_enabled and ttl_seconds > 0:
+        principal_cache.set(key, result, tags=tags, ttl_seconds=ttl_seconds)
+    return result
+
+
+def invalidate_user_principals(username: str) -> int:
+    """Drop every cached token resolution of a user; returns the entries dropped"""
+    return principal_cache.invalidate(_principal_tag(username))
+
+
+def _principal_tag(username: str) -> Tuple[str, str]:
+    """Cache tag shared by every token of a username"""
+    return ("user", username)
+
+
+def _principal_id_tag(user_id: int) -> Tuple[str, int]:
+    """Cache tag shared by every token resolved to a user id"""
+    return ("user_id", user_id)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_on_change(mapper, connection, target: User) -> None:
+    """
+    Keep principal_cache in sync with ORM writes to users (incl. deactivation
+    and renames). The flush only records the user's tags; they are dropped
+    once the transaction commits, so a rollback leaves the cache alone.
+    """
+    tags = set()
+    if target.id is not None:
+        tags.add(_principal_id_tag(target.id))
+    if target.username:
+        tags.add(_principal_tag(target.username))
+
+    session = object_session(target)
+    if session is None:
+        for tag in tags:
+            principal_cache.invalidate(tag)
+    else:
+        session.info.setdefault(PENDING_PRINCIPAL_TAGS, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    """Drop the cached principals of the users written by the committed transaction"""
+    for tag in session.info.pop(PENDING_PRINCIPAL_TAGS, ()):
+        principal_cache.invalidate(tag)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_rolled_back_users(session: Session, transaction) -> None:
+    """Forget the tags of a transaction that ended without committing"""
+    if transaction.parent is None:
+        session.info.pop(PENDING_PRINCIPAL_TAGS, None)
+
+
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
+    """Create a new user with adaptive profile initialization (hashes the password unless given)"""
     from app.services.user_adaptation import UserAdaptationService
     
-    hashed_password = get_password_hash(user.password)
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
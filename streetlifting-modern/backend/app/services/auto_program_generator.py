@@ -5,16 +5,25 @@ This service creates complete training blocks with daily workouts
 based on user's 1RM data and selected program template.
 """
 
+from sqlalchemy import Boolean, Float, Integer, String, insert, update, func, case
 from sqlalchemy.orm import Session
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import date, datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+import logging
 import json
+import time
 
 from app.models.training import (
     TrainingProgram, TrainingBlock, BlockStage, 
     PlannedWorkout, OneRepMax, ExerciseTemplate
 )
 from app.models.user import User
+from app.core.config import settings
+from app.services.training_block import projection_cache
 from app.core.program_templates import (
     STREETLIFTING_PROGRAM_TEMPLATES, 
     calculate_training_max, 
@@ -22,6 +31,54 @@ from app.core.program_templates import (
     MethodologyType
 )
 
+logger = logging.getLogger(__name__)
+
+
+# Lift keys used in user_rms -> training block 1RM column
+RM_COLUMNS = {
+    "pullups": "rm_pullups",
+    "dips": "rm_dips",
+    "muscle_ups": "rm_muscleups",
+    "squats": "rm_squats",
+    "deadlift": "rm_deadlift",
+    "bench_press": "rm_bench_press",
+    "overhead_press": "rm_overhead_press"
+}
+
+# TrainingBlock columns a client may customize: the strategy and its parameters
+CUSTOMIZABLE_BLOCK_FIELDS = {
+    "strategy", "weekly_increment", "deload_week", "increment_type", "auto_progression",
+    "volume_multiplier", "intensity_focus", "daily_variation", "intensity_range", "volume_cycles",
+    "max_effort_days", "dynamic_effort_days", "repetition_effort_days",
+    "wave_pattern", "wave_amplitude", "wave_frequency", "max_reps"
+}
+
+
+# Shared pool for large batch generations: created on first use, shut down with the app
+_program_pool: Optional[ProcessPoolExecutor] = None
+_program_pool_lock = threading.Lock()
+
+
+def _get_program_pool() -> ProcessPoolExecutor:
+    global _program_pool
+    with _program_pool_lock:
+        if _program_pool is None:
+            # spawn, not fork: the API worker runs the ingestion and scheduler threads
+            _program_pool = ProcessPoolExecutor(
+                max_workers=settings.program_generation_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _program_pool
+
+
+def shutdown_program_pool() -> None:
+    """Stop the generation pool (app shutdown)"""
+    global _program_pool
+    with _program_pool_lock:
+        if _program_pool is not None:
+            _program_pool.shutdown(cancel_futures=True)
+            _program_pool = None
+
 
 class AutoProgramGeneratorService:
     
@@ -32,14 +89,31 @@ class AutoProgramGeneratorService:
         template_key: str,
         start_date: date,
         user_rms: Dict[str, float],
-        customizations: Optional[Dict[str, Any]] = None
+        customizations: Optional[Dict[str, Any]] = None,
+        bulk: bool = False,
+        timings: Optional[Dict[str, float]] = None
     ) -> TrainingBlock:
         """
         Create a complete training block with daily workouts from a template
+        
+        With bulk=True stages and workouts are written as plain rows with
+        executemany INSERTs instead of one ORM object each. If a timings dict
+        is given it is filled with the duration of every phase in milliseconds.
         """
         template = STREETLIFTING_PROGRAM_TEMPLATES.get(template_key)
         if not template:
             raise ValueError(f"Template {template_key} not found")
+        AutoProgramGeneratorService._validate_customizations(customizations)
+        
+        started = time.perf_counter()
+        phase_started = started
+        
+        def mark(phase: str):
+            nonlocal phase_started
+            now = time.perf_counter()
+            if timings is not None:
+                timings[phase] = round((now - phase_started) * 1000, 3)
+            phase_started = now
         
         # Create training program record
         program = AutoProgramGeneratorService._create_program_record(db, template, template_key)
@@ -51,16 +125,194 @@ class AutoProgramGeneratorService:
         block = AutoProgramGeneratorService._create_training_block(
             db, user_id, program, template, start_date, user_rms, training_maxes, customizations
         )
+        mark("block")
         
         # Generate stages
-        AutoProgramGeneratorService._generate_block_stages(db, block, template)
+        AutoProgramGeneratorService._generate_block_stages(db, block, template, bulk)
+        mark("stages")
         
         # Generate all planned workouts
-        AutoProgramGeneratorService._generate_planned_workouts(db, block, template, training_maxes)
+        AutoProgramGeneratorService._generate_planned_workouts(db, block, template, training_maxes, bulk)
+        mark("workouts")
         
         db.commit()
+        mark("commit")
+        
+        if timings is not None:
+            timings["total"] = round((time.perf_counter() - started) * 1000, 3)
         return block
     
+    @staticmethod
+    def create_programs_batch(
+        db: Session,
+        specs: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create programs for many users at once
+        
+        Each spec holds user_id, template_key, start_date, user_rms and
+        optionally customizations. Program records are resolved once per
+        template, stage/workout rows are built (in the shared process pool
+        for large batches) and every chunk of specs is written (with bulk
+        inserts) in its own transaction.
+        Returns one result dict per spec, in order, with either the created
+        block or the error that prevented it.
+        """
+        chunk_size = chunk_size or settings.program_generation_chunk_size
+        max_workers = max_workers or settings.program_generation_workers
+        
+        results: List[Dict[str, Any]] = [
+            {
+                "index": index,
+                "user_id": spec.get("user_id"),
+                "template_key": spec.get("template_key"),
+                "success": False,
+                "block_id": None,
+                "block_name": None,
+                "total_workouts": 0,
+                "error": None
+            }
+            for index, spec in enumerate(specs)
+        ]
+        
+        # Validate everything that can be checked without touching each user
+        user_ids = {spec.get("user_id") for spec in specs}
+        existing_users = {
+            user_id for (user_id,) in db.query(User.id).filter(User.id.in_(user_ids)).all()
+        }
+        valid = []
+        for index, spec in enumerate(specs):
+            if spec.get("template_key") not in STREETLIFTING_PROGRAM_TEMPLATES:
+                results[index]["error"] = f"Template {spec.get('template_key')} not found"
+            elif spec.get("user_id") not in existing_users:
+                results[index]["error"] = f"User {spec.get('user_id')} not found"
+            else:
+                try:
+                    AutoProgramGeneratorService._validate_customizations(spec.get("customizations"))
+                except ValueError as e:
+                    results[index]["error"] = str(e)
+                    continue
+                valid.append(index)
+        
+        if not valid:
+            return results
+        
+        programs = AutoProgramGeneratorService._resolve_program_records(
+            db, {specs[index]["template_key"] for index in valid}
+        )
+        db.commit()
+        
+        # Row generation is pure CPU work, so it runs outside the DB session;
+        # only batches large enough to outweigh the IPC go to the process pool
+        jobs = [
+            (specs[index]["template_key"], specs[index]["user_rms"])
+            for index in valid
+        ]
+        generated = None
+        if max_workers > 1 and len(jobs) >= settings.program_generation_pool_min_jobs:
+            try:
+                generated = list(_get_program_pool().map(
+                    AutoProgramGeneratorService._build_program_rows_job,
+                    jobs,
+                    chunksize=max(1, len(jobs) // (max_workers * 4))
+                ))
+            except BrokenProcessPool as e:
+                logger.warning("Program generation pool failed, generating in-process: %s", e)
+                shutdown_program_pool()
+        if generated is None:
+            generated = [AutoProgramGeneratorService._build_program_rows_job(job) for job in jobs]
+        
+        for start in range(0, len(valid), chunk_size):
+            chunk = list(zip(valid[start:start + chunk_size], generated[start:start + chunk_size]))
+            
+            for index, rows in chunk:
+                result = results[index]
+                if "error" in rows:
+                    result["error"] = rows["error"]
+                    continue
+                
+                spec = specs[index]
+                template = STREETLIFTING_PROGRAM_TEMPLATES[spec["template_key"]]
+                
+                # A savepoint per item keeps one bad spec from failing its whole chunk
+                savepoint = db.begin_nested()
+                try:
+                    block = AutoProgramGeneratorService._create_training_block(
+                        db, spec["user_id"], programs[spec["template_key"]], template,
+                        spec["start_date"], spec["user_rms"], rows["training_maxes"],
+                        spec.get("customizations")
+                    )
+                    AutoProgramGeneratorService._insert_block_rows(db, BlockStage, block.id, rows["stages"], bulk=True)
+                    AutoProgramGeneratorService._insert_block_rows(db, PlannedWorkout, block.id, rows["workouts"], bulk=True)
+                    AutoProgramGeneratorService._set_completion_counters(
+                        block, [(row["week_number"], row["is_completed"]) for row in rows["workouts"]]
+                    )
+                    savepoint.commit()
+                except Exception as e:
+                    savepoint.rollback()
+                    result["error"] = str(e)
+                    continue
+                
+                result.update({
+                    "success": True,
+                    "block_id": block.id,
+                    "block_name": block.name,
+                    "total_workouts": len(rows["workouts"])
+                })
+            
+            try:
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                for index, _ in chunk:
+                    results[index].update({
+                        "success": False,
+                        "block_id": None,
+                        "block_name": None,
+                        "total_workouts": 0,
+                        "error": results[index]["error"] or f"Chunk commit failed: {str(e)}"
+                    })
+        
+        return results
+    
+    @staticmethod
+    def _build_program_rows_job(job) -> Dict[str, Any]:
+        """Process pool entry point: build every row of one program"""
+        template_key, user_rms = job
+        try:
+            template = STREETLIFTING_PROGRAM_TEMPLATES[template_key]
+            training_maxes = AutoProgramGeneratorService._calculate_training_maxes(user_rms)
+            return {
+                "training_maxes": training_maxes,
+                "stages": AutoProgramGeneratorService._build_stage_rows(template),
+                "workouts": AutoProgramGeneratorService._build_workout_rows(template, training_maxes)
+            }
+        except Exception as e:
+            return {"error": str(e)}
+    
+    @staticmethod
+    def _resolve_program_records(db: Session, template_keys) -> Dict[str, TrainingProgram]:
+        """Get (or create) the program record of every template with a single lookup"""
+        templates = {key: STREETLIFTING_PROGRAM_TEMPLATES[key] for key in template_keys}
+        existing = {
+            program.name: program
+            for program in db.query(TrainingProgram).filter(
+                TrainingProgram.name.in_([template["name"] for template in templates.values()])
+            ).all()
+        }
+        
+        programs = {}
+        for key, template in templates.items():
+            program = existing.get(template["name"])
+            if program is None:
+                program = AutoProgramGeneratorService._create_program_record(db, template, key)
+                existing[template["name"]] = program
+            programs[key] = program
+        
+        return programs
+    
     @staticmethod
     def _create_program_record(db: Session, template: Dict[str, Any], template_key: str) -> TrainingProgram:
         """Create or get existing program record"""
@@ -87,6 +339,33 @@ class AutoProgramGeneratorService:
         db.flush()
         return program
     
+    @staticmethod
+    def _validate_customizations(customizations: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Check customization keys against CUSTOMIZABLE_BLOCK_FIELDS and their column types"""
+        customizations = customizations or {}
+        unknown = set(customizations) - CUSTOMIZABLE_BLOCK_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown customizations: {', '.join(sorted(unknown))}")
+        
+        columns = TrainingBlock.__table__.columns
+        for key, value in customizations.items():
+            column_type = columns[key].type
+            if value is None:
+                valid = columns[key].nullable
+            elif isinstance(column_type, Boolean):
+                valid = isinstance(value, bool)
+            elif isinstance(column_type, (Integer, Float)):
+                valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+                if isinstance(column_type, Integer):
+                    valid = valid and float(value).is_integer()
+            elif isinstance(column_type, String):
+                valid = isinstance(value, str) and len(value) <= column_type.length
+            else:
+                valid = True  # JSON
+            if not valid:
+                raise ValueError(f"Invalid value for customization {key}")
+        return customizations
+    
     @staticmethod
     def _calculate_training_maxes(user_rms: Dict[str, float]) -> Dict[str, float]:
         """Calculate training maxes (90% of 1RM) for each lift"""
@@ -136,33 +415,39 @@ class AutoProgramGeneratorService:
             auto_progression=True
         )
         
-        # Apply customizations if provided
-        if customizations:
-            for key, value in customizations.items():
-                if hasattr(block, key):
-                    setattr(block, key, value)
+        # Apply customizations if provided (validated by the caller)
+        for key, value in (customizations or {}).items():
+            setattr(block, key, value)
         
         db.add(block)
         db.flush()
         return block
     
     @staticmethod
-    def _generate_block_stages(db: Session, block: TrainingBlock, template: Dict[str, Any]):
+    def _generate_block_stages(db: Session, block: TrainingBlock, template: Dict[str, Any], bulk: bool = False):
         """Generate training stages for the block"""
+        rows = AutoProgramGeneratorService._build_stage_rows(template)
+        AutoProgramGeneratorService._insert_block_rows(db, BlockStage, block.id, rows, bulk)
+    
+    @staticmethod
+    def _build_stage_rows(template: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build the stage rows (without block_id) for the template methodology"""
         
         if template["methodology"] == MethodologyType.LINEAR_PROGRESSION:
-            AutoProgramGeneratorService._generate_linear_stages(db, block, template)
+            return AutoProgramGeneratorService._build_linear_stage_rows(template)
         elif template["methodology"] == MethodologyType.FIVE_THREE_ONE:
-            AutoProgramGeneratorService._generate_531_stages(db, block, template)
+            return AutoProgramGeneratorService._build_531_stage_rows(template)
         elif template["methodology"] == MethodologyType.BLOCK_PERIODIZATION:
-            AutoProgramGeneratorService._generate_block_periodization_stages(db, block, template)
+            return AutoProgramGeneratorService._build_block_periodization_stage_rows(template)
         elif template["methodology"] == MethodologyType.CONJUGATE:
-            AutoProgramGeneratorService._generate_conjugate_stages(db, block, template)
+            return AutoProgramGeneratorService._build_conjugate_stage_rows(template)
+        return []
     
     @staticmethod
-    def _generate_linear_stages(db: Session, block: TrainingBlock, template: Dict[str, Any]):
-        """Generate stages for linear progression"""
+    def _build_linear_stage_rows(template: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build stages for linear progression"""
         program_structure = template["program_structure"]
+        rows = []
         
         for stage_key, stage_info in program_structure.items():
             if stage_key == "weeks_1_8":
@@ -175,101 +460,116 @@ class AutoProgramGeneratorService:
                 continue
             
             for week in weeks:
-                stage = BlockStage(
-                    block_id=block.id,
-                    name=f"Week {week} - {stage_info['description']}",
-                    week_number=week,
-                    load_percentage=stage_info["load_percentage"],
-                    volume_multiplier=stage_info["volume_multiplier"],
-                    intensity_focus="strength" if week > 8 else "volume",
-                    description=stage_info["description"]
-                )
-                db.add(stage)
-    
-    @staticmethod
-    def _generate_531_stages(db: Session, block: TrainingBlock, template: Dict[str, Any]):
-        """Generate stages for 5/3/1 methodology"""
+                rows.append({
+                    "name": f"Week {week} - {stage_info['description']}",
+                    "week_number": week,
+                    "load_percentage": stage_info["load_percentage"],
+                    "volume_multiplier": stage_info["volume_multiplier"],
+                    "intensity_focus": "strength" if week > 8 else "volume",
+                    "description": stage_info["description"]
+                })
+        
+        return rows
+    
+    @staticmethod
+    def _build_531_stage_rows(template: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build stages for 5/3/1 methodology"""
         program_structure = template["program_structure"]
+        rows = []
         
         for cycle_key, cycle_info in program_structure.items():
             for week in cycle_info["weeks"]:
                 is_deload = week == cycle_info["deload_week"]
                 
-                stage = BlockStage(
-                    block_id=block.id,
-                    name=f"Week {week} - {cycle_info['description']}" + (" (Deload)" if is_deload else ""),
-                    week_number=week,
-                    load_percentage=95 if not is_deload else 60,
-                    volume_multiplier=1.0 if not is_deload else 0.5,
-                    intensity_focus="strength" if not is_deload else "recovery",
-                    description=cycle_info["description"]
-                )
-                db.add(stage)
-    
-    @staticmethod
-    def _generate_block_periodization_stages(db: Session, block: TrainingBlock, template: Dict[str, Any]):
-        """Generate stages for block periodization"""
+                rows.append({
+                    "name": f"Week {week} - {cycle_info['description']}" + (" (Deload)" if is_deload else ""),
+                    "week_number": week,
+                    "load_percentage": 95 if not is_deload else 60,
+                    "volume_multiplier": 1.0 if not is_deload else 0.5,
+                    "intensity_focus": "strength" if not is_deload else "recovery",
+                    "description": cycle_info["description"]
+                })
+        
+        return rows
+    
+    @staticmethod
+    def _build_block_periodization_stage_rows(template: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build stages for block periodization"""
         program_structure = template["program_structure"]
+        rows = []
         
         for block_key, block_info in program_structure.items():
             for week in block_info["weeks"]:
-                stage = BlockStage(
-                    block_id=block.id,
-                    name=f"Week {week} - {block_info['description']}",
-                    week_number=week,
-                    load_percentage=block_info["load_percentage"],
-                    volume_multiplier=block_info["volume_multiplier"],
-                    intensity_focus=block_info["focus"],
-                    description=block_info["description"]
-                )
-                db.add(stage)
-    
-    @staticmethod
-    def _generate_conjugate_stages(db: Session, block: TrainingBlock, template: Dict[str, Any]):
-        """Generate stages for conjugate methodology"""
+                rows.append({
+                    "name": f"Week {week} - {block_info['description']}",
+                    "week_number": week,
+                    "load_percentage": block_info["load_percentage"],
+                    "volume_multiplier": block_info["volume_multiplier"],
+                    "intensity_focus": block_info["focus"],
+                    "description": block_info["description"]
+                })
+        
+        return rows
+    
+    @staticmethod
+    def _build_conjugate_stage_rows(template: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build stages for conjugate methodology"""
         # Conjugate method has a repeating weekly pattern
-        for week in range(1, template["duration_weeks"] + 1):
-            stage = BlockStage(
-                block_id=block.id,
-                name=f"Week {week} - Conjugate Training",
-                week_number=week,
-                load_percentage=95,  # Varies by day
-                volume_multiplier=1.0,
-                intensity_focus="max_strength",
-                description="Max effort and dynamic effort training"
-            )
-            db.add(stage)
+        return [
+            {
+                "name": f"Week {week} - Conjugate Training",
+                "week_number": week,
+                "load_percentage": 95,  # Varies by day
+                "volume_multiplier": 1.0,
+                "intensity_focus": "max_strength",
+                "description": "Max effort and dynamic effort training"
+            }
+            for week in range(1, template["duration_weeks"] + 1)
+        ]
     
     @staticmethod
     def _generate_planned_workouts(
         db: Session, 
         block: TrainingBlock, 
         template: Dict[str, Any], 
-        training_maxes: Dict[str, float]
+        training_maxes: Dict[str, float],
+        bulk: bool = False
     ):
         """Generate all planned workouts for the entire block"""
+        rows = AutoProgramGeneratorService._build_workout_rows(template, training_maxes)
+        AutoProgramGeneratorService._insert_block_rows(db, PlannedWorkout, block.id, rows, bulk)
+        AutoProgramGeneratorService._set_completion_counters(
+            block, [(row["week_number"], row["is_completed"]) for row in rows]
+        )
+    
+    @staticmethod
+    def _build_workout_rows(
+        template: Dict[str, Any],
+        training_maxes: Dict[str, float]
+    ) -> List[Dict[str, Any]]:
+        """Build the planned workout rows (without block_id) for the template methodology"""
         
         methodology = template["methodology"]
         
         if methodology == MethodologyType.LINEAR_PROGRESSION:
-            AutoProgramGeneratorService._generate_linear_workouts(db, block, template, training_maxes)
+            return AutoProgramGeneratorService._build_linear_workout_rows(template, training_maxes)
         elif methodology == MethodologyType.FIVE_THREE_ONE:
-            AutoProgramGeneratorService._generate_531_workouts(db, block, template, training_maxes)
+            return AutoProgramGeneratorService._build_531_workout_rows(template, training_maxes)
         elif methodology == MethodologyType.BLOCK_PERIODIZATION:
-            AutoProgramGeneratorService._generate_block_workouts(db, block, template, training_maxes)
+            return AutoProgramGeneratorService._build_block_workout_rows(template, training_maxes)
         elif methodology == MethodologyType.CONJUGATE:
-            AutoProgramGeneratorService._generate_conjugate_workouts(db, block, template, training_maxes)
+            return AutoProgramGeneratorService._build_conjugate_workout_rows(template, training_maxes)
+        return []
     
     @staticmethod
-    def _generate_linear_workouts(
-        db: Session, 
-        block: TrainingBlock, 
+    def _build_linear_workout_rows(
         template: Dict[str, Any], 
         training_maxes: Dict[str, float]
-    ):
-        """Generate workouts for linear progression methodology"""
+    ) -> List[Dict[str, Any]]:
+        """Build workouts for linear progression methodology"""
         weekly_structure = template["weekly_structure"]
         frequency = template["frequency_per_week"]
+        rows = []
         
         for week in range(1, template["duration_weeks"] + 1):
             # Calculate week-specific adjustments
@@ -297,33 +597,33 @@ class AutoProgramGeneratorService:
                 exercises = []
                 for exercise_template in day_template["exercises"]:
                     exercise = AutoProgramGeneratorService._create_exercise_from_template(
-                        exercise_template, training_maxes, base_increment + load_adjustment, phase_multiplier
+                        exercise_template, training_maxes, base_increment + load_adjustment,
+                        phase_multiplier
                     )
                     exercises.append(exercise)
                 
-                # Create planned workout
-                workout = PlannedWorkout(
-                    block_id=block.id,
-                    week_number=week,
-                    day_number=day,
-                    workout_name=day_template["name"],
-                    focus=day_template["focus"],
-                    estimated_duration=60,  # Default 60 minutes
-                    exercises=exercises,
-                    notes=f"Week {week} of linear progression"
-                )
-                db.add(workout)
-    
-    @staticmethod
-    def _generate_531_workouts(
-        db: Session, 
-        block: TrainingBlock, 
+                rows.append({
+                    "week_number": week,
+                    "day_number": day,
+                    "workout_name": day_template["name"],
+                    "focus": day_template["focus"],
+                    "estimated_duration": 60,  # Default 60 minutes
+                    "exercises": exercises,
+                    "notes": f"Week {week} of linear progression",
+                    "is_completed": False
+                })
+        
+        return rows
+    
+    @staticmethod
+    def _build_531_workout_rows(
         template: Dict[str, Any], 
         training_maxes: Dict[str, float]
-    ):
-        """Generate workouts for 5/3/1 methodology"""
+    ) -> List[Dict[str, Any]]:
+        """Build workouts for 5/3/1 methodology"""
         weekly_structure = template["weekly_structure"]
         intensity_zones = template["intensity_zones"]
+        rows = []
         
         for week in range(1, template["duration_weeks"] + 1):
             # Determine which week in the 4-week cycle
@@ -375,41 +675,50 @@ class AutoProgramGeneratorService:
                     }
                     exercises.append(accessory)
                 
-                workout = PlannedWorkout(
-                    block_id=block.id,
-                    week_number=week,
-                    day_number=day,
-                    workout_name=day_template["name"],
-                    focus=day_template["focus"],
-                    estimated_duration=75,
-                    exercises=exercises,
-                    notes=f"5/3/1 Week {cycle_week} - Cycle {(week-1)//4 + 1}"
-                )
-                db.add(workout)
-    
-    @staticmethod
-    def _generate_block_workouts(
-        db: Session, 
-        block: TrainingBlock, 
+                rows.append({
+                    "week_number": week,
+                    "day_number": day,
+                    "workout_name": day_template["name"],
+                    "focus": day_template["focus"],
+                    "estimated_duration": 75,
+                    "exercises": exercises,
+                    "notes": f"5/3/1 Week {cycle_week} - Cycle {(week-1)//4 + 1}",
+                    "is_completed": False
+                })
+        
+        return rows
+    
+    @staticmethod
+    def _build_block_workout_rows(
         template: Dict[str, Any], 
         training_maxes: Dict[str, float]
-    ):
-        """Generate workouts for block periodization"""
+    ) -> List[Dict[str, Any]]:
+        """Build workouts for block periodization"""
         # Implementation for block periodization
         # This would create workouts based on the accumulation/intensification/realization phases
-        pass
+        return []
     
     @staticmethod
-    def _generate_conjugate_workouts(
-        db: Session, 
-        block: TrainingBlock, 
+    def _build_conjugate_workout_rows(
         template: Dict[str, Any], 
         training_maxes: Dict[str, float]
-    ):
-        """Generate workouts for conjugate methodology"""
+    ) -> List[Dict[str, Any]]:
+        """Build workouts for conjugate methodology"""
         # Implementation for conjugate method
         # This would create max effort and dynamic effort workouts
-        pass
+        return []
+    
+    @staticmethod
+    def _insert_block_rows(db: Session, model, block_id: int, rows: List[Dict[str, Any]], bulk: bool = False):
+        """Persist generated rows for a block, either as ORM objects or as one executemany INSERT"""
+        if not rows:
+            return
+        
+        if bulk:
+            # Skips the unit of work: one INSERT statement executed for every row
+            db.execute(insert(model), [{**row, "block_id": block_id} for row in rows])
+        else:
+            db.add_all([model(block_id=block_id, **row) for row in rows])
     
     @staticmethod
     def _create_exercise_from_template(
@@ -448,11 +757,183 @@ class AutoProgramGeneratorService:
     def regenerate_remaining_workouts(
         db: Session, 
         block_id: int, 
-        from_week: int = None
-    ) -> bool:
-        """Regenerate workouts from a specific week onwards (useful for adjustments)"""
-        # Implementation to regenerate workouts when user makes adjustments
-        pass
+        from_week: int = None,
+        user_rms: Optional[Dict[str, float]] = None,
+        customizations: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Regenerate workouts from a specific week onwards (useful for adjustments)
+        
+        New 1RMs and customizations are diffed against the stored block; only
+        uncompleted workouts from from_week on whose exercises actually change
+        are rewritten, with a single bulk UPDATE. Returns a change summary.
+        """
+        block = db.query(TrainingBlock).filter(TrainingBlock.id == block_id).first()
+        if not block:
+            raise ValueError(f"Training block {block_id} not found")
+        
+        template = AutoProgramGeneratorService._get_block_template(db, block)
+        if not template:
+            raise ValueError(f"No program template found for block {block_id}")
+        
+        unknown_lifts = set(user_rms or {}) - set(RM_COLUMNS)
+        if unknown_lifts:
+            raise ValueError(f"Unknown lifts: {', '.join(sorted(unknown_lifts))}")
+        customizations = AutoProgramGeneratorService._validate_customizations(customizations)
+        
+        from_week = max(1, from_week or block.current_week or 1)
+        
+        # Diff training maxes
+        old_maxes = dict(block.training_maxes or {})
+        new_maxes = {
+            **old_maxes,
+            **AutoProgramGeneratorService._calculate_training_maxes(user_rms or {})
+        }
+        changed_maxes = {
+            lift: {"old": old_maxes.get(lift), "new": new_max}
+            for lift, new_max in new_maxes.items()
+            if old_maxes.get(lift) != new_max
+        }
+        
+        # Diff block customizations
+        changed_fields = []
+        for key, value in customizations.items():
+            if getattr(block, key) != value:
+                setattr(block, key, value)
+                changed_fields.append(key)
+        
+        summary = {
+            "block_id": block.id,
+            "from_week": from_week,
+            "changed_training_maxes": changed_maxes,
+            "changed_fields": changed_fields,
+            "workouts_checked": 0,
+            "workouts_updated": 0,
+            "updated_weeks": []
+        }
+        
+        if changed_maxes:
+            for lift, one_rm in (user_rms or {}).items():
+                setattr(block, RM_COLUMNS[lift], one_rm)
+            block.training_maxes = new_maxes
+        
+        # The generated exercises depend only on the training maxes
+        if changed_maxes:
+            planned = {
+                (row["week_number"], row["day_number"]): row["exercises"]
+                for row in AutoProgramGeneratorService._build_workout_rows(template, new_maxes)
+                if row["week_number"] >= from_week
+            }
+            stored = db.query(
+                PlannedWorkout.id, PlannedWorkout.week_number,
+                PlannedWorkout.day_number, PlannedWorkout.exercises
+            ).filter(
+                PlannedWorkout.block_id == block.id,
+                PlannedWorkout.week_number >= from_week,
+                PlannedWorkout.is_completed == False
+            ).all()
+            
+            updates = []
+            for workout_id, week_number, day_number, exercises in stored:
+                new_exercises = planned.get((week_number, day_number))
+                if new_exercises is not None and new_exercises != exercises:
+                    updates.append({"id": workout_id, "exercises": new_exercises})
+                    summary["updated_weeks"].append(week_number)
+            
+            # Bulk UPDATE by primary key
+            if updates:
+                db.execute(update(PlannedWorkout), updates)
+            
+            summary["workouts_checked"] = len(stored)
+            summary["workouts_updated"] = len(updates)
+            summary["updated_weeks"] = sorted(set(summary["updated_weeks"]))
+        
+        if changed_maxes or changed_fields:
+            block.updated_at = datetime.utcnow()
+            db.commit()
+            projection_cache.invalidate(block.id)
+        
+        return summary
+    
+    @staticmethod
+    def _get_block_template(db: Session, block: TrainingBlock) -> Optional[Dict[str, Any]]:
+        """Find the template a block was generated from (through its program record)"""
+        if not block.program_id:
+            return None
+        
+        program = db.query(TrainingProgram).filter(TrainingProgram.id == block.program_id).first()
+        if not program:
+            return None
+        
+        return next(
+            (template for template in STREETLIFTING_PROGRAM_TEMPLATES.values() if template["name"] == program.name),
+            None
+        )
+    
+    @staticmethod
+    def _set_completion_counters(block: TrainingBlock, workouts) -> None:
+        """Set a block's completion counters from (week_number, is_completed) pairs"""
+        weekly: Dict[str, Dict[str, int]] = {}
+        for week_number, is_completed in workouts:
+            week = weekly.setdefault(str(week_number), {"total": 0, "completed": 0})
+            week["total"] += 1
+            week["completed"] += 1 if is_completed else 0
+        
+        block.weekly_completion = weekly
+        block.total_workouts_count = sum(week["total"] for week in weekly.values())
+        block.completed_workouts_count = sum(week["completed"] for week in weekly.values())
+    
+    @staticmethod
+    def ensure_completion_counters(db: Session, block: TrainingBlock) -> None:
+        """Backfill the completion counters of blocks created before they existed"""
+        if block.weekly_completion is not None:
+            return
+        
+        weeks = db.query(
+            PlannedWorkout.week_number,
+            func.count(PlannedWorkout.id),
+            func.sum(case((PlannedWorkout.is_completed == True, 1), else_=0))
+        ).filter(
+            PlannedWorkout.block_id == block.id
+        ).group_by(PlannedWorkout.week_number).all()
+        
+        block.weekly_completion = {
+            str(week_number): {"total": total, "completed": int(completed or 0)}
+            for week_number, total, completed in weeks
+        }
+        block.total_workouts_count = sum(total for _, total, _ in weeks)
+        block.completed_workouts_count = sum(int(completed or 0) for _, _, completed in weeks)
+    
+    @staticmethod
+    def record_workout_completion(block: TrainingBlock, week_number: int) -> Tuple[bool, bool]:
+        """
+        Count one more completed workout on the block's counters
+        
+        Must run in the same transaction that marks the workout completed.
+        Returns (week_completed, block_completed).
+        """
+        weekly = dict(block.weekly_completion or {})
+        week = dict(weekly.get(str(week_number), {"total": 0, "completed": 0}))
+        week["completed"] = min(week["completed"] + 1, week["total"])
+        weekly[str(week_number)] = week
+        
+        # Reassign so the JSON column is flagged as modified
+        block.weekly_completion = weekly
+        block.completed_workouts_count = min(
+            (block.completed_workouts_count or 0) + 1, block.total_workouts_count or 0
+        )
+        
+        week_completed = week["completed"] >= week["total"]
+        block_completed = block.completed_workouts_count >= (block.total_workouts_count or 0)
+        return week_completed, block_completed
+    
+    @staticmethod
+    def get_next_workout(db: Session, block_id: int) -> Optional[PlannedWorkout]:
+        """Next pending workout of a block in schedule order (index lookup)"""
+        return db.query(PlannedWorkout).filter(
+            PlannedWorkout.block_id == block_id,
+            PlannedWorkout.is_completed == False
+        ).order_by(PlannedWorkout.week_number, PlannedWorkout.day_number).first()
     
     @staticmethod
     def get_recommended_templates_for_user(
@@ -0,0 +1,214 @@
+"""
+Shared snapshot of the per-level dashboard configurations
+
+There is one DashboardConfiguration row per experience level and they almost
+never change, so every process keeps an immutable snapshot of all of them
+and building a dashboard needs no configuration queries. The snapshot is
+loaded at startup, reloaded when invalidated (admin endpoint, or after the
+defaults are seeded) and, so other worker processes pick up changes too,
+when it is older than settings.dashboard_config_max_age_seconds.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+from datetime import datetime
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user_profile import DashboardConfiguration, UserExperienceLevel
+from app.schemas.user_profile import DashboardConfiguration as DashboardConfigurationSchema
+
+
+DEFAULT_DASHBOARD_CONFIGURATIONS = {
+    UserExperienceLevel.ABSOLUTE_BEGINNER: {
+        "visible_widgets": ["quick_start", "progress_summary"],
+        "widget_order": ["quick_start", "progress_summary"],
+        "visible_nav_items": ["dashboard", "workouts", "progress"],
+        "featured_actions": ["log_workout"],
+        "show_advanced_metrics": False,
+        "show_projections": False,
+        "show_analytics": False,
+        "enable_manual_overrides": False,
+        "suggested_features": ["track_rpe", "view_progress"],
+        "onboarding_flow": ["welcome", "first_workout", "track_progress"]
+    },
+    UserExperienceLevel.COMMITTED_BEGINNER: {
+        "visible_widgets": ["quick_start", "progress_summary", "recent_workouts"],
+        "widget_order": ["quick_start", "progress_summary", "recent_workouts"],
+        "visible_nav_items": ["dashboard", "workouts", "progress", "routines"],
+        "featured_actions": ["log_workout", "view_progress"],
+        "show_advanced_metrics": False,
+        "show_projections": True,
+        "show_analytics": False,
+        "enable_manual_overrides": False,
+        "suggested_features": ["create_routine", "set_goals"],
+        "onboarding_flow": ["routine_intro", "goal_setting"]
+    },
+    UserExperienceLevel.INTERMEDIATE: {
+        "visible_widgets": ["quick_start", "progress_summary", "recent_workouts", "projections"],
+        "widget_order": ["quick_start", "progress_summary", "projections", "recent_workouts"],
+        "visible_nav_items": ["dashboard", "workouts", "progress", "routines", "analytics"],
+        "featured_actions": ["log_workout", "view_analytics", "plan_block"],
+        "show_advanced_metrics": True,
+        "show_projections": True,
+        "show_analytics": True,
+        "enable_manual_overrides": False,
+        "suggested_features": ["training_blocks", "load_management"],
+        "onboarding_flow": ["blocks_intro", "analytics_tour"]
+    },
+    UserExperienceLevel.ADVANCED: {
+        "visible_widgets": ["quick_start", "progress_summary", "projections", "analytics", "recent_workouts"],
+        "widget_order": ["quick_start", "analytics", "projections", "progress_summary", "recent_workouts"],
+        "visible_nav_items": ["dashboard", "workouts", "progress", "routines", "analytics", "settings"],
+        "featured_actions": ["log_workout", "analyze_data", "adjust_program"],
+        "show_advanced_metrics": True,
+        "show_projections": True,
+        "show_analytics": True,
+        "enable_manual_overrides": True,
+        "suggested_features": ["auto_regulation", "advanced_programming"],
+        "onboarding_flow": ["advanced_features_tour"]
+    },
+    UserExperienceLevel.ELITE_ATHLETE: {
+        "visible_widgets": ["analytics", "projections", "progress_summary", "quick_start", "recent_workouts"],
+        "widget_order": ["analytics", "projections", "progress_summary", "quick_start", "recent_workouts"],
+        "visible_nav_items": ["dashboard", "workouts", "progress", "routines", "analytics", "settings", "export"],
+        "featured_actions": ["analyze_data", "export_data", "customize_program"],
+        "show_advanced_metrics": True,
+        "show_projections": True,
+        "show_analytics": True,
+        "enable_manual_overrides": True,
+        "suggested_features": ["api_access", "custom_formulas"],
+        "onboarding_flow": ["elite_features_tour"]
+    }
+}
+
+
+def ensure_dashboard_configurations(db: Session) -> int:
+    """Insert the default configuration of every level that has none; returns rows created"""
+    existing = {
+        level for (level,) in db.query(DashboardConfiguration.experience_level)
+    }
+
+    created = 0
+    for level, config_data in DEFAULT_DASHBOARD_CONFIGURATIONS.items():
+        if level.value not in existing:
+            db.add(DashboardConfiguration(experience_level=level, **config_data))
+            created += 1
+
+    if created:
+        db.commit()
+    return created
+
+
+class DashboardConfigSnapshot:
+    """
+    Process-wide, read-only view of all dashboard configurations.
+
+    Entries are validated schema objects shared by every request and must
+    not be mutated. Each reload bumps version.
+    """
+
+    def __init__(self, max_age_seconds: float = 300):
+        self.max_age_seconds = max_age_seconds
+        self.version = 0
+        self.loads = 0
+        self.invalidations = 0
+        self.loaded_at: Optional[datetime] = None
+        self._configs: Mapping[str, DashboardConfigurationSchema] = MappingProxyType({})
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, level: UserExperienceLevel) -> Optional[DashboardConfigurationSchema]:
+        """Configuration of a level, or None for an unknown level"""
+        return self.configs(db).get(getattr(level, "value", level))
+
+    def configs(self, db: Session) -> Mapping[str, DashboardConfigurationSchema]:
+        """All configurations by level, reloading first if the snapshot is stale"""
+        if time.monotonic() >= self._expires_at:
+            self.load(db)
+        return self._configs
+
+    async def configs_async(self, db: AsyncSession) -> Mapping[str, DashboardConfigurationSchema]:
+        """configs() for async routes (a reload is queried through the async driver)"""
+        if time.monotonic() >= self._expires_at:
+            await self.load_async(db)
+        return self._configs
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Load (seeding defaults if needed) unless a fresh snapshot exists"""
+        self.configs(db)
+
+    def load(self, db: Session) -> int:
+        """Seed missing defaults and replace the snapshot with one query; returns the version"""
+        with self._lock:
+            # Another request may have reloaded while we waited for the lock
+            if time.monotonic() < self._expires_at:
+                return self.version
+
+            ensure_dashboard_configurations(db)
+            return self._replace(db.query(DashboardConfiguration).all())
+
+    async def load_async(self, db: AsyncSession) -> int:
+        """load() for async routes; returns the version"""
+        rows = (await db.execute(select(DashboardConfiguration))).scalars().all()
+        if len(rows) < len(DEFAULT_DASHBOARD_CONFIGURATIONS):
+            # Seeding the missing defaults is a write, left to the sync loader
+            return await db.run_sync(self.load)
+        with self._lock:
+            return self._replace(rows)
+
+    def _replace(self, rows) -> int:
+        """Swap in a snapshot of the configuration rows (caller holds the lock)"""
+        configs = {
+            config.experience_level: DashboardConfigurationSchema.model_validate(config)
+            for config in rows
+        }
+
+        self._configs = MappingProxyType(configs)
+        self._expires_at = time.monotonic() + self.max_age_seconds
+        self.loaded_at = datetime.utcnow()
+        self.version += 1
+        self.loads += 1
+        return self.version
+
+    def invalidate(self) -> int:
+        """Mark the snapshot stale so the next access reloads it; returns the current version"""
+        with self._lock:
+            self._expires_at = 0.0
+            self.invalidations += 1
+            return self.version
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot version and reload counters for monitoring"""
+        with self._lock:
+            return {
+                "version": self.version,
+                "levels": sorted(self._configs),
+                "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+                "max_age_seconds": self.max_age_seconds,
+                "loads": self.loads,
+                "invalidations": self.invalidations
+            }
+
+
+dashboard_configurations = DashboardConfigSnapshot(
+    max_age_seconds=settings.dashboard_config_max_age_seconds
+)
+
+
+def load_dashboard_configurations() -> None:
+    """Load the snapshot at startup so the first dashboard request needs no config queries"""
+    db = SessionLocal()
+    try:
+        dashboard_configurations.invalidate()
+        dashboard_configurations.load(db)
+    except Exception as e:
+        print(f"Warning: Failed to load dashboard configurations: {e}")
+    finally:
+        db.close()
@@ -0,0 +1,224 @@
+"""
+Streaming export of training history
+
+Each dataset is read with a column SELECT executed with yield_per, so rows
+come off a server-side cursor (PostgreSQL) in chunks of export_chunk_size
+and never enter the identity map; every chunk is encoded and handed to the
+response before the next one is fetched. Memory stays flat however long
+the history (or, for admin roster exports, however many users).
+
+Formats: NDJSON (one object per line, tagged with its dataset, so a single
+stream can hold every dataset), CSV and Parquet (one dataset per file, a
+row group per chunk; needs pyarrow). Any of them can be gzip-compressed
+on the fly.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from datetime import date, datetime
+import csv
+import io
+import json
+import zlib
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Select, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.training import OneRepMax, PlannedWorkout, TrainingBlock
+from app.models.workout import Exercise, Workout
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is unavailable without pyarrow
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {
+    # format: (media type, file extension)
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def _workouts(user_id: Optional[int]) -> Select:
+    query = select(*Workout.__table__.columns).order_by(Workout.id)
+    return query if user_id is None else query.where(Workout.user_id == user_id)
+
+
+def _exercises(user_id: Optional[int]) -> Select:
+    query = select(
+        Workout.user_id, Workout.date.label("workout_date"), *Exercise.__table__.columns
+    ).join(Workout, Exercise.workout_id == Workout.id).order_by(Exercise.id)
+    return query if user_id is None else query.where(Workout.user_id == user_id)
+
+
+def _one_rep_maxes(user_id: Optional[int]) -> Select:
+    query = select(*OneRepMax.__table__.columns).order_by(OneRepMax.id)
+    return query if user_id is None else query.where(OneRepMax.user_id == user_id)
+
+
+def _training_blocks(user_id: Optional[int]) -> Select:
+    query = select(*TrainingBlock.__table__.columns).order_by(TrainingBlock.id)
+    return query if user_id is None else query.where(TrainingBlock.user_id == user_id)
+
+
+def _planned_workouts(user_id: Optional[int]) -> Select:
+    query = select(TrainingBlock.user_id, *PlannedWorkout.__table__.columns).join(
+        TrainingBlock, PlannedWorkout.block_id == TrainingBlock.id
+    ).order_by(PlannedWorkout.id)
+    return query if user_id is None else query.where(TrainingBlock.user_id == user_id)
+
+
+# dataset: query of its rows for a user (None exports every user)
+EXPORT_DATASETS: Dict[str, Callable[[Optional[int]], Select]] = {
+    "workouts": _workouts,
+    "exercises": _exercises,
+    "one_rep_maxes": _one_rep_maxes,
+    "training_blocks": _training_blocks,
+    "planned_workouts": _planned_workouts,
+}
+
+
+def export_filename(dataset: str, export_format: str, compress: bool) -> str:
+    return f"{dataset}.{EXPORT_FORMATS[export_format][1]}" + (".gz" if compress else "")
+
+
+def export_stream(
+    datasets: Sequence[str],
+    export_format: str,
+    user_id: Optional[int] = None,
+    compress: bool = False,
+    chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Encoded chunks of the datasets of user_id (every user when None).
+
+    The stream opens its own session, since it is consumed after the
+    request's dependencies are torn down, and closes it when exhausted or
+    abandoned. CSV and Parquet take a single dataset.
+    """
+    if export_format != "ndjson" and len(datasets) != 1:
+        raise ValueError(f"{export_format} exports one dataset at a time")
+    if export_format == "parquet" and pa is None:
+        raise RuntimeError("Parquet export needs pyarrow installed")
+
+    chunks = _encoded_chunks(datasets, export_format, user_id, chunk_size or settings.export_chunk_size)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def _encoded_chunks(datasets: Sequence[str], export_format: str, user_id: Optional[int], chunk_size: int) -> Iterator[bytes]:
+    db = SessionLocal()
+    try:
+        for dataset in datasets:
+            query = EXPORT_DATASETS[dataset](user_id)
+            result = db.execute(query.execution_options(yield_per=chunk_size))
+            columns, partitions = list(result.keys()), result.partitions()
+            if export_format == "ndjson":
+                yield from ndjson_chunks(dataset, columns, partitions)
+            elif export_format == "csv":
+                yield from csv_chunks(columns, partitions)
+            else:
+                yield from parquet_chunks(arrow_schema(query), partitions)
+    finally:
+        db.close()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def ndjson_chunks(dataset: str, columns: List[str], partitions: Iterable[Sequence]) -> Iterator[bytes]:
+    for rows in partitions:
+        yield "".join(
+            json.dumps({"dataset": dataset, **dict(zip(columns, row))}, default=_json_default) + "\n"
+            for row in rows
+        ).encode()
+
+
+def _flat(value: Any) -> Any:
+    """Scalar form of a value for CSV/Parquet cells (JSON columns become JSON text)"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def csv_chunks(columns: List[str], partitions: Iterable[Sequence]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in partitions:
+        writer.writerows([_flat(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _DrainedBuffer(io.RawIOBase):
+    """Write-only file whose bytes are taken out as they are written (the Parquet sink)"""
+
+    def __init__(self):
+        self.pending = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.pending += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self.pending)
+        self.pending.clear()
+        return data
+
+
+def arrow_schema(query: Select) -> "pa.Schema":
+    """Parquet schema of a dataset from its column types (JSON and text columns are strings)"""
+    fields = []
+    for column in query.selected_columns:
+        column_type = column.type
+        if isinstance(column_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column_type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+        elif isinstance(column_type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append((column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def parquet_chunks(schema: "pa.Schema", partitions: Iterable[Sequence]) -> Iterator[bytes]:
+    """One row group per chunk"""
+    sink = _DrainedBuffer()
+    writer = pq.ParquetWriter(sink, schema)
+    for rows in partitions:
+        columns = list(zip(*rows))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array([_flat(value) for value in values], type=field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        ))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: Optional[int] = None) -> Iterator[bytes]:
+    """gzip-compress a byte stream incrementally"""
+    compressor = zlib.compressobj(level or settings.export_gzip_level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,275 @@
+"""
+Estimated 1RM index
+
+The best estimated 1RM of every (user, exercise) is kept in estimated_maxes,
+and the best of every training day in estimated_max_daily, so "current e1RM"
+and "best e1RM" are index lookups instead of re-running the Epley formula
+over recent sets on every call. Only completed workouts count.
+
+WorkoutService refreshes the (exercise, day) buckets a write touches, in
+the caller's transaction: the buckets are recomputed from their sets (so
+edits and deletions that lower a best are handled) and the per-exercise
+rows are updated in place from the touched days. Only when a touched day
+held the stored best (or was the last training day) and was lowered or
+emptied are the exercise's daily rows consulted again.
+backfill_e1rm_index() rebuilds everything from history with the
+vectorized formula.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.training import EstimatedMax, EstimatedMaxDaily
+from app.models.workout import Exercise, Workout
+from app.services.rm_calculator import estimated_one_rms
+
+# (exercise name, workout date)
+IndexKey = Tuple[str, date]
+
+SET_COLUMNS = (
+    Workout.user_id,
+    Exercise.name,
+    Workout.date,
+    Exercise.id,
+    Exercise.weight,
+    Exercise.reps,
+    Exercise.rpe
+)
+
+
+def workout_index_keys(workout: Workout, names: Optional[Iterable[str]] = None) -> Set[IndexKey]:
+    """Buckets of a workout: its date with every exercise name in names (default: its loaded sets)"""
+    if names is None:
+        names = [exercise.name for exercise in workout.exercises]
+    return {(name, workout.date) for name in names if name}
+
+
+def refresh_e1rm_index(db: Session, user_id: int, keys: Iterable[IndexKey]) -> None:
+    """
+    Recompute the given (exercise, day) buckets of a user and the
+    per-exercise bests of their exercises. Pending changes must be flushed
+    first; nothing is committed.
+    """
+    keys = {key for key in keys if key[0] and key[1]}
+    if not keys:
+        return
+    names = {name for name, _ in keys}
+    days = {day for _, day in keys}
+
+    rows = db.execute(
+        select(*SET_COLUMNS).join(Workout, Exercise.workout_id == Workout.id).where(
+            Workout.user_id == user_id,
+            Workout.completed == True,
+            Exercise.name.in_(names),
+            Workout.date.in_(days)
+        )
+    ).all()
+    daily = {key: bucket for key, bucket in _daily_bests(rows).items() if key[1:] in keys}
+
+    db.execute(
+        delete(EstimatedMaxDaily).where(
+            EstimatedMaxDaily.user_id == user_id,
+            or_(*(
+                and_(EstimatedMaxDaily.exercise == name, EstimatedMaxDaily.date == day)
+                for name, day in keys
+            ))
+        ).execution_options(synchronize_session=False)
+    )
+    if daily:
+        db.execute(insert(EstimatedMaxDaily), _daily_rows(daily))
+
+    _refresh_bests(db, user_id, keys, daily)
+
+
+def _refresh_bests(
+    db: Session,
+    user_id: int,
+    keys: Set[IndexKey],
+    daily: Dict[Tuple[int, str, date], list]
+) -> None:
+    """Fold the refreshed buckets (daily, keyed like _daily_bests) into the estimated_maxes rows"""
+    names = {name for name, _ in keys}
+    stored = {
+        row.exercise: row
+        for row in db.execute(
+            select(
+                EstimatedMax.id,
+                EstimatedMax.exercise,
+                EstimatedMax.best_e1rm,
+                EstimatedMax.best_date,
+                EstimatedMax.best_exercise_id,
+                EstimatedMax.last_date
+            ).where(EstimatedMax.user_id == user_id, EstimatedMax.exercise.in_(names))
+        )
+    }
+
+    inserts, updates, deletes = [], [], []
+    for name in names:
+        # New bucket of every touched day (None: no qualifying sets left that day)
+        touched = {day: daily.get((user_id, name, day)) for key_name, day in keys if key_name == name}
+        current = stored.get(name)
+
+        if current is not None and _lowers_stored(current, touched):
+            best = _scan_best(db, user_id, name)
+        else:
+            best = None if current is None else {
+                "user_id": user_id, "exercise": name, "best_e1rm": current.best_e1rm,
+                "best_date": current.best_date, "best_exercise_id": current.best_exercise_id,
+                "last_date": current.last_date
+            }
+            for day, bucket in sorted(touched.items()):
+                if bucket is None:
+                    continue
+                e1rm, exercise_id, _ = bucket
+                if best is None:
+                    best = {
+                        "user_id": user_id, "exercise": name, "best_e1rm": e1rm,
+                        "best_date": day, "best_exercise_id": exercise_id, "last_date": day
+                    }
+                    continue
+                if e1rm > best["best_e1rm"] or day == best["best_date"]:
+                    best.update(best_e1rm=e1rm, best_date=day, best_exercise_id=exercise_id)
+                best["last_date"] = max(best["last_date"], day)
+
+        if best is None:
+            if current is not None:
+                deletes.append(current.id)
+        elif current is None:
+            inserts.append(best)
+        elif any(best[field] != getattr(current, field) for field in ("best_e1rm", "best_date", "best_exercise_id", "last_date")):
+            updates.append({"id": current.id, **best})
+
+    if deletes:
+        db.execute(
+            delete(EstimatedMax).where(EstimatedMax.id.in_(deletes))
+            .execution_options(synchronize_session=False)
+        )
+    if updates:
+        db.execute(update(EstimatedMax), updates)
+    if inserts:
+        db.execute(insert(EstimatedMax), inserts)
+
+
+def _lowers_stored(current, touched: Dict[date, Optional[list]]) -> bool:
+    """Whether a touched day held the stored best and dropped below it, or was the last day and emptied"""
+    if current.best_date in touched:
+        bucket = touched[current.best_date]
+        if bucket is None or bucket[0] < current.best_e1rm:
+            return True
+    return current.last_date in touched and touched[current.last_date] is None
+
+
+def _scan_best(db: Session, user_id: int, name: str) -> Optional[dict]:
+    """estimated_maxes row of an exercise re-derived from its daily rows (None when none are left)"""
+    in_exercise = and_(EstimatedMaxDaily.user_id == user_id, EstimatedMaxDaily.exercise == name)
+    top = db.execute(
+        select(EstimatedMaxDaily.date, EstimatedMaxDaily.best_e1rm, EstimatedMaxDaily.best_exercise_id)
+        .where(in_exercise)
+        .order_by(EstimatedMaxDaily.best_e1rm.desc(), EstimatedMaxDaily.date)
+        .limit(1)
+    ).first()
+    if top is None:
+        return None
+    last_date = db.execute(select(func.max(EstimatedMaxDaily.date)).where(in_exercise)).scalar()
+    return {
+        "user_id": user_id, "exercise": name, "best_e1rm": top.best_e1rm,
+        "best_date": top.date, "best_exercise_id": top.best_exercise_id, "last_date": last_date
+    }
+
+
+def _fold_bests(daily: Iterable[tuple]) -> List[dict]:
+    """estimated_maxes rows from (user, exercise, day, best e1RM, set id) daily tuples"""
+    bests: Dict[Tuple[int, str], dict] = {}
+    for user_id, name, day, e1rm, exercise_id in daily:
+        best = bests.get((user_id, name))
+        if best is None:
+            bests[(user_id, name)] = {
+                "user_id": user_id, "exercise": name, "best_e1rm": e1rm,
+                "best_date": day, "best_exercise_id": exercise_id, "last_date": day
+            }
+            continue
+        if e1rm > best["best_e1rm"]:
+            best.update(best_e1rm=e1rm, best_date=day, best_exercise_id=exercise_id)
+        best["last_date"] = max(best["last_date"], day)
+    return list(bests.values())
+
+
+def _daily_bests(rows: List, into: Optional[Dict] = None) -> Dict[Tuple[int, str, date], list]:
+    """Fold set rows (SET_COLUMNS) into {(user, exercise, day): [best e1RM, set id, sets]}"""
+    into = {} if into is None else into
+    if not rows:
+        return into
+
+    user_ids, names, days, ids, weights, reps, rpes = zip(*rows)
+    e1rms = estimated_one_rms(
+        weights, reps, np.array([np.nan if rpe is None else rpe for rpe in rpes], dtype=float)
+    )
+    for user_id, name, day, exercise_id, e1rm in zip(user_ids, names, days, ids, e1rms.tolist()):
+        if e1rm <= 0:
+            continue
+        bucket = into.get((user_id, name, day))
+        if bucket is None:
+            into[(user_id, name, day)] = [e1rm, exercise_id, 1]
+        else:
+            if e1rm > bucket[0]:
+                bucket[0], bucket[1] = e1rm, exercise_id
+            bucket[2] += 1
+    return into
+
+
+def _daily_rows(daily: Dict[Tuple[int, str, date], list]) -> List[dict]:
+    """estimated_max_daily rows for the folded buckets"""
+    return [
+        {"user_id": user_id, "exercise": name, "date": day, "best_e1rm": e1rm, "best_exercise_id": exercise_id, "sets": sets}
+        for (user_id, name, day), (e1rm, exercise_id, sets) in daily.items()
+    ]
+
+
+def current_e1rm(db: Session, user_id: int, exercise: str, days_back: int = 30) -> Optional[float]:
+    """Best estimated 1RM of the last days_back days (index range over at most days_back rows)"""
+    return db.execute(
+        select(EstimatedMaxDaily.best_e1rm).where(
+            EstimatedMaxDaily.user_id == user_id,
+            EstimatedMaxDaily.exercise == exercise,
+            EstimatedMaxDaily.date >= date.today() - timedelta(days=days_back)
+        ).order_by(EstimatedMaxDaily.best_e1rm.desc()).limit(1)
+    ).scalar()
+
+
+def best_e1rm(db: Session, user_id: int, exercise: str) -> Optional[EstimatedMax]:
+    """All-time best estimated 1RM row (point lookup)"""
+    return db.execute(
+        select(EstimatedMax).where(EstimatedMax.user_id == user_id, EstimatedMax.exercise == exercise)
+    ).scalar_one_or_none()
+
+
+def backfill_e1rm_index(db: Session, chunk_size: int = 10000) -> int:
+    """Rebuild the whole index from completed workouts and commit; returns the sets read"""
+    db.execute(delete(EstimatedMax))
+    db.execute(delete(EstimatedMaxDaily))
+
+    daily: Dict[Tuple[int, str, date], list] = {}
+    read = 0
+    result = db.execute(
+        select(*SET_COLUMNS).join(Workout, Exercise.workout_id == Workout.id)
+        .where(Workout.completed == True)
+        .execution_options(yield_per=chunk_size)
+    )
+    for chunk in result.partitions(chunk_size):
+        _daily_bests(chunk, into=daily)
+        read += len(chunk)
+
+    rows = _daily_rows(daily)
+    bests = _fold_bests(
+        (user_id, name, day, e1rm, exercise_id) for (user_id, name, day), (e1rm, exercise_id, _) in daily.items()
+    )
+    for table, table_rows in ((EstimatedMaxDaily, rows), (EstimatedMax, bests)):
+        for start in range(0, len(table_rows), chunk_size):
+            db.execute(insert(table), table_rows[start:start + chunk_size])
+
+    db.commit()
+    return read
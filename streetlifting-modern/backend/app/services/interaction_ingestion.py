@@ -0,0 +1,282 @@
+"""
+Buffered ingestion of user interaction telemetry
+
+Read endpoints record an interaction on every request. Instead of writing
+each one synchronously, events are queued in memory and a background worker
+flushes them in micro-batches: one executemany INSERT for the interactions,
+one upsert for the rollup buckets and one UPDATE per user for the
+aggregated profile counters.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime
+import logging
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user_profile import UserProfile, UserInteraction
+from app.schemas.user_profile import UserProfileCreate
+from app.services.interaction_rollups import apply_rollups
+from app.services.user_adaptation import UserAdaptationService
+
+logger = logging.getLogger(__name__)
+
+
+class InteractionIngestionQueue:
+    """
+    In-memory queue of interaction events drained by a daemon worker thread.
+
+    A batch is flushed when it reaches max_batch_size events or when its
+    oldest event has waited flush_interval_seconds. submit() never blocks:
+    when the queue is full it returns False and the caller decides what to
+    do with the event (UserAdaptationService falls back to a direct write).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_batch_size: int = 200,
+        flush_interval_seconds: float = 1.0,
+        max_queue_size: int = 10000
+    ):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue_size = max_queue_size
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self.submitted = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.failed_events = 0
+        self.high_water_mark = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.max_event_age_ms = 0.0
+
+    def submit(
+        self,
+        user_id: int,
+        interaction_type: str,
+        interaction_data: Optional[Dict[str, Any]] = None,
+        duration_seconds: Optional[float] = None,
+        session_id: Optional[str] = None
+    ) -> bool:
+        """Queue an interaction; returns False if the queue is full"""
+        self._ensure_worker()
+
+        event = {
+            "user_id": user_id,
+            "interaction_type": getattr(interaction_type, "value", interaction_type),
+            "interaction_data": interaction_data or {},
+            "duration_seconds": duration_seconds,
+            "session_id": session_id,
+            "queued_at": time.monotonic()
+        }
+
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            return False
+
+        with self._lock:
+            self.submitted += 1
+            self.high_water_mark = max(self.high_water_mark, self._queue.qsize())
+        return True
+
+    def drain(self) -> int:
+        """Synchronously flush everything queued so far; returns the events written"""
+        written = 0
+        while True:
+            batch = self._take(block=False)
+            if not batch:
+                return written
+            written += self._flush(batch)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop the worker after flushing the events still queued"""
+        self._stop.set()
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+        self.drain()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and backpressure counters for monitoring"""
+        with self._lock:
+            depth = self._queue.qsize()
+            return {
+                "running": bool(self._worker and self._worker.is_alive()),
+                "depth": depth,
+                "max_queue_size": self.max_queue_size,
+                "utilization": depth / self.max_queue_size if self.max_queue_size else 0.0,
+                "high_water_mark": self.high_water_mark,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "flushed": self.flushed,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "failed_events": self.failed_events,
+                "avg_batch_size": (self.flushed / self.batches) if self.batches else 0.0,
+                "last_batch_size": self.last_batch_size,
+                "last_flush_ms": self.last_flush_ms,
+                "max_flush_ms": self.max_flush_ms,
+                "max_event_age_ms": self.max_event_age_ms,
+                "max_batch_size": self.max_batch_size,
+                "flush_interval_seconds": self.flush_interval_seconds
+            }
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread on first use"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._stop.clear()
+                self._worker = threading.Thread(
+                    target=self._run, name="interaction-ingestion", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        """Worker loop: collect a micro-batch, write it, repeat until stopped"""
+        while not self._stop.is_set():
+            batch = self._take(block=True)
+            if batch:
+                self._flush(batch)
+
+    def _take(self, block: bool) -> List[Dict[str, Any]]:
+        """Collect up to max_batch_size events, waiting at most one flush interval"""
+        batch = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self.flush_interval_seconds))
+            else:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            return batch
+
+        deadline = batch[0]["queued_at"] + self.flush_interval_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if block and remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> int:
+        """Write one batch in its own session and transaction"""
+        started = time.monotonic()
+        oldest_age_ms = (started - min(event["queued_at"] for event in batch)) * 1000
+
+        with self._flush_lock:
+            db = self.session_factory()
+            try:
+                write_interaction_batch(db, batch)
+                success = True
+            except Exception:
+                db.rollback()
+                success = False
+                logger.exception("Failed to write %d queued interactions", len(batch))
+            finally:
+                db.close()
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self.batches += 1
+            self.last_batch_size = len(batch)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self.max_event_age_ms = max(self.max_event_age_ms, oldest_age_ms)
+            if success:
+                self.flushed += len(batch)
+            else:
+                self.failed_batches += 1
+                self.failed_events += len(batch)
+
+        return len(batch) if success else 0
+
+
+def write_interaction_batch(db: Session, events: List[Dict[str, Any]]) -> None:
+    """
+    Persist a batch of interaction events.
+
+    Profiles of every user in the batch are loaded with one query (missing
+    ones are created), interactions are written with one executemany INSERT
+    and each profile gets the counters of all its events applied in order,
+    so the commit issues a single UPDATE per user. The profile rows are
+    locked before their counters are read, so direct writes running at the
+    same time (track_user_interaction) don't lose increments. The events
+    are added to their hourly/daily rollup buckets in the same transaction.
+    """
+    user_ids = {event["user_id"] for event in events}
+    UserAdaptationService.lock_profiles(db, user_ids)
+    profiles = {
+        profile.user_id: profile
+        for profile in db.query(UserProfile).filter(UserProfile.user_id.in_(user_ids))
+        .populate_existing()
+    }
+
+    for user_id in user_ids - set(profiles):
+        profile = UserProfile(**UserProfileCreate(user_id=user_id).dict())
+        db.add(profile)
+        profiles[user_id] = profile
+    db.flush()
+
+    db.execute(insert(UserInteraction), [
+        {
+            "user_id": event["user_id"],
+            "interaction_type": event["interaction_type"],
+            "interaction_data": event["interaction_data"],
+            "duration_seconds": event["duration_seconds"],
+            "session_id": event["session_id"],
+            "user_level_at_time": profiles[event["user_id"]].experience_level
+        }
+        for event in events
+    ])
+    apply_rollups(db, events)
+
+    counters = {
+        user_id: UserAdaptationService._profile_counters(profile)
+        for user_id, profile in profiles.items()
+    }
+    for event in events:
+        UserAdaptationService._apply_interaction_counters(
+            counters[event["user_id"]],
+            event["interaction_type"],
+            event["interaction_data"],
+            event["duration_seconds"]
+        )
+
+    now = datetime.utcnow()
+    for user_id, profile in profiles.items():
+        for field, value in counters[user_id].items():
+            setattr(profile, field, value)
+        profile.updated_at = now
+
+    db.commit()
+
+
+interaction_queue = InteractionIngestionQueue(
+    max_batch_size=settings.interaction_batch_size,
+    flush_interval_seconds=settings.interaction_flush_interval_seconds,
+    max_queue_size=settings.interaction_queue_size
+)
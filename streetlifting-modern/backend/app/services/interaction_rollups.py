@@ -0,0 +1,308 @@
+"""
+Hourly and daily interaction rollups
+
+Every tracked interaction also increments the hour and day bucket of its
+(user, interaction type, page/feature) in user_interaction_rollups, so
+analytics and scoring read a few pre-aggregated rows instead of scanning
+user_interactions. Raw interactions older than the retention period are
+compacted away; level transitions (MANUAL_OVERRIDE) are always kept
+because the progression timeline needs their details.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import Select, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user_profile import UserInteraction, UserInteractionRollup
+from app.schemas.user_profile import InteractionType
+
+GRANULARITIES = ("hour", "day")
+RETAINED_INTERACTION_TYPES = [InteractionType.MANUAL_OVERRIDE.value]
+
+RollupKey = Tuple[int, str, datetime, str, str]
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Start of the hour/day containing moment (naive UTC)"""
+    moment = moment.replace(tzinfo=None, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def rollup_key(interaction_type: str, interaction_data: Optional[Dict[str, Any]]) -> str:
+    """Page of a visit or feature of a use (as the profile counters), "" otherwise"""
+    interaction_type = getattr(interaction_type, "value", interaction_type)
+    data = interaction_data or {}
+    if interaction_type == InteractionType.PAGE_VISIT.value:
+        return str(data.get("page", "unknown"))[:100]
+    if interaction_type == InteractionType.FEATURE_USE.value:
+        return str(data.get("feature", "unknown"))[:100]
+    return ""
+
+
+def rollup_increments(events: Iterable[Dict[str, Any]], occurred_at: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Aggregate events into one increment per rollup bucket.
+
+    Events may carry their own "occurred_at"; otherwise occurred_at (default
+    now) is used for all of them.
+    """
+    default_moment = occurred_at or datetime.utcnow()
+    totals: Dict[RollupKey, List[float]] = defaultdict(lambda: [0, 0.0])
+
+    for event in events:
+        interaction_type = getattr(event["interaction_type"], "value", event["interaction_type"])
+        key = rollup_key(interaction_type, event.get("interaction_data"))
+        moment = event.get("occurred_at") or default_moment
+        for granularity in GRANULARITIES:
+            total = totals[(event["user_id"], granularity, bucket_start(moment, granularity), interaction_type, key)]
+            total[0] += 1
+            total[1] += event.get("duration_seconds") or 0.0
+
+    return [
+        {
+            "user_id": user_id,
+            "granularity": granularity,
+            "bucket_start": start,
+            "interaction_type": interaction_type,
+            "key": key,
+            "count": count,
+            "duration_total": duration
+        }
+        for (user_id, granularity, start, interaction_type, key), (count, duration) in totals.items()
+    ]
+
+
+def apply_rollups(db: Session, events: Iterable[Dict[str, Any]], occurred_at: Optional[datetime] = None) -> int:
+    """Add a batch of events to their rollup buckets (caller commits); returns buckets touched"""
+    rows = rollup_increments(events, occurred_at)
+    if rows:
+        _upsert_increments(db, rows)
+    return len(rows)
+
+
+def _upsert_increments(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """INSERT ... ON CONFLICT DO UPDATE count = count + excluded.count"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        _merge_increments(db, rows)
+        return
+
+    table = UserInteractionRollup.__table__
+    statement = dialect_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "granularity", "bucket_start", "interaction_type", "key"],
+        set_={
+            "count": table.c.count + statement.excluded["count"],
+            "duration_total": table.c.duration_total + statement.excluded.duration_total
+        }
+    )
+    db.execute(statement, rows)
+
+
+def _merge_increments(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Portable fallback: UPDATE each bucket, INSERT the ones that did not exist"""
+    table = UserInteractionRollup.__table__
+    missing = []
+    for row in rows:
+        result = db.execute(
+            update(table).where(
+                table.c.user_id == row["user_id"],
+                table.c.granularity == row["granularity"],
+                table.c.bucket_start == row["bucket_start"],
+                table.c.interaction_type == row["interaction_type"],
+                table.c.key == row["key"]
+            ).values(
+                count=table.c.count + row["count"],
+                duration_total=table.c.duration_total + row["duration_total"]
+            )
+        )
+        if result.rowcount == 0:
+            missing.append(row)
+    if missing:
+        db.execute(insert(table), missing)
+
+
+def rollup_counters(db: Session, user_ids: Iterable[int]) -> Dict[int, Dict[str, Dict[str, int]]]:
+    """
+    All-time page visit and feature use counts per user from the daily rollups.
+
+    Same shape as the profile's navigation_patterns / feature_usage_frequency.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return _fold_counters(user_ids, [])
+    return _fold_counters(user_ids, db.execute(_counters_query(user_ids)).all())
+
+
+async def rollup_counters_async(db: AsyncSession, user_ids: Iterable[int]) -> Dict[int, Dict[str, Dict[str, int]]]:
+    """rollup_counters on an AsyncSession"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return _fold_counters(user_ids, [])
+    return _fold_counters(user_ids, (await db.execute(_counters_query(user_ids))).all())
+
+
+def _counters_query(user_ids: List[int]) -> Select:
+    return select(
+        UserInteractionRollup.user_id,
+        UserInteractionRollup.interaction_type,
+        UserInteractionRollup.key,
+        func.sum(UserInteractionRollup.count)
+    ).where(
+        UserInteractionRollup.user_id.in_(user_ids),
+        UserInteractionRollup.granularity == "day",
+        UserInteractionRollup.interaction_type.in_([
+            InteractionType.PAGE_VISIT.value, InteractionType.FEATURE_USE.value
+        ])
+    ).group_by(
+        UserInteractionRollup.user_id,
+        UserInteractionRollup.interaction_type,
+        UserInteractionRollup.key
+    )
+
+
+def _fold_counters(user_ids: List[int], rows) -> Dict[int, Dict[str, Dict[str, int]]]:
+    counters = {
+        user_id: {"navigation_patterns": {}, "feature_usage_frequency": {}}
+        for user_id in user_ids
+    }
+    for user_id, interaction_type, key, count in rows:
+        field = "navigation_patterns" if interaction_type == InteractionType.PAGE_VISIT.value else "feature_usage_frequency"
+        counters[user_id][field][key] = int(count)
+    return counters
+
+
+def usage_counters(profile: Any, counters: Optional[Dict[str, Dict[str, int]]]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Page visit and feature use counts of a profile: its rollup counters,
+    falling back to the legacy navigation_patterns / feature_usage_frequency
+    maps (no longer written) for keys the rollups don't have.
+    """
+    navigation = dict(profile.navigation_patterns or {})
+    features = dict(profile.feature_usage_frequency or {})
+    if counters:
+        navigation.update(counters.get("navigation_patterns", {}))
+        features.update(counters.get("feature_usage_frequency", {}))
+    return navigation, features
+
+
+def activity_summary(db: Session, user_id: int, days: int = 30, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Interaction counts of the last days, by type, page and feature and per day"""
+    now = now or datetime.utcnow()
+    since = bucket_start(now, "day") - timedelta(days=days - 1)
+
+    rows = db.query(
+        UserInteractionRollup.bucket_start,
+        UserInteractionRollup.interaction_type,
+        UserInteractionRollup.key,
+        UserInteractionRollup.count,
+        UserInteractionRollup.duration_total
+    ).filter(
+        UserInteractionRollup.user_id == user_id,
+        UserInteractionRollup.granularity == "day",
+        UserInteractionRollup.bucket_start >= since
+    ).all()
+
+    by_type: Dict[str, int] = defaultdict(int)
+    pages: Dict[str, int] = defaultdict(int)
+    features: Dict[str, int] = defaultdict(int)
+    daily: Dict[str, int] = defaultdict(int)
+    total_duration = 0.0
+    for start, interaction_type, key, count, duration in rows:
+        by_type[interaction_type] += count
+        daily[start.date().isoformat()] += count
+        total_duration += duration or 0.0
+        if interaction_type == InteractionType.PAGE_VISIT.value:
+            pages[key] += count
+        elif interaction_type == InteractionType.FEATURE_USE.value:
+            features[key] += count
+
+    return {
+        "period_days": days,
+        "total_interactions": sum(by_type.values()),
+        "total_duration_seconds": total_duration,
+        "by_type": dict(by_type),
+        "pages": dict(pages),
+        "features": dict(features),
+        "daily": [{"date": day, "count": daily[day]} for day in sorted(daily)]
+    }
+
+
+def compact_interactions(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Apply the retention policy and commit; returns the rows deleted.
+
+    Deletes raw interactions older than interaction_retention_days (except
+    RETAINED_INTERACTION_TYPES) and hourly rollups older than
+    interaction_hourly_rollup_retention_days. Daily rollups are kept.
+    """
+    now = now or datetime.utcnow()
+    summary = {"interactions_deleted": 0, "hourly_rollups_deleted": 0}
+
+    if settings.interaction_retention_days > 0:
+        cutoff = now - timedelta(days=settings.interaction_retention_days)
+        result = db.execute(
+            delete(UserInteraction).where(
+                UserInteraction.created_at < cutoff,
+                UserInteraction.interaction_type.not_in(RETAINED_INTERACTION_TYPES)
+            ).execution_options(synchronize_session=False)
+        )
+        summary["interactions_deleted"] = result.rowcount
+
+    if settings.interaction_hourly_rollup_retention_days > 0:
+        cutoff = bucket_start(now, "hour") - timedelta(days=settings.interaction_hourly_rollup_retention_days)
+        result = db.execute(
+            delete(UserInteractionRollup).where(
+                UserInteractionRollup.granularity == "hour",
+                UserInteractionRollup.bucket_start < cutoff
+            ).execution_options(synchronize_session=False)
+        )
+        summary["hourly_rollups_deleted"] = result.rowcount
+
+    db.commit()
+    return summary
+
+
+def backfill_rollups(db: Session, chunk_size: int = 5000) -> int:
+    """Rebuild every rollup from the raw interactions still stored; returns interactions read"""
+    db.execute(delete(UserInteractionRollup))
+    read = 0
+    events = []
+    query = db.query(
+        UserInteraction.user_id,
+        UserInteraction.interaction_type,
+        UserInteraction.interaction_data,
+        UserInteraction.duration_seconds,
+        UserInteraction.created_at
+    ).order_by(UserInteraction.id).yield_per(chunk_size)
+
+    for user_id, interaction_type, data, duration, created_at in query:
+        events.append({
+            "user_id": user_id,
+            "interaction_type": interaction_type,
+            "interaction_data": data,
+            "duration_seconds": duration,
+            "occurred_at": created_at or datetime.utcnow()
+        })
+        if len(events) >= chunk_size:
+            apply_rollups(db, events)
+            read += len(events)
+            events = []
+
+    if events:
+        apply_rollups(db, events)
+        read += len(events)
+
+    db.commit()
+    return read
@@ -0,0 +1,240 @@
+"""
+Background experience level recalculation
+
+Profiles are re-scored every RECALCULATION_INTERVAL_DAYS. Instead of doing
+it inline when an interaction is tracked, a scheduler thread periodically
+pages through the profiles that are due (indexed on last_level_calculation),
+scores each page with the vectorized scorer and writes the results with
+one bulk UPDATE. Level transitions are recorded as interactions in bulk.
+Page/feature counts come from the interaction rollups, and each pass also
+applies the raw interaction retention policy and forgets expired offline
+sync idempotency keys. Every worker process runs a scheduler, so a pass
+first takes the "level_recalculation" lease and workers that don't get it
+skip the pass.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+import os
+import threading
+import time
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user_profile import UserProfile
+from app.schemas.user_profile import InteractionType
+from app.services.interaction_ingestion import write_interaction_batch
+from app.services.interaction_rollups import compact_interactions, rollup_counters
+from app.services.level_scoring import score_profiles
+from app.services.scheduler_lease import acquire_lease, lease_holder_id, release_lease
+from app.services.workout_sync import prune_sync_mutations
+
+RECALCULATION_INTERVAL_DAYS = 7
+LEASE_NAME = "level_recalculation"
+
+
+def due_profiles_query(db: Session, now: datetime):
+    """Profiles without a manual override whose level is due for re-scoring"""
+    cutoff = now - timedelta(days=RECALCULATION_INTERVAL_DAYS)
+    return db.query(UserProfile).filter(
+        UserProfile.manual_override_level.is_(None),
+        or_(
+            UserProfile.last_level_calculation.is_(None),
+            UserProfile.last_level_calculation <= cutoff
+        )
+    )
+
+
+def recalculate_due_levels(
+    db: Session,
+    batch_size: int = 500,
+    now: Optional[datetime] = None,
+    keep_going: Optional[Callable[[], bool]] = None
+) -> Dict[str, Any]:
+    """
+    Re-score every due profile, one page per transaction; returns a run summary.
+
+    keep_going is called after each page (the scheduler renews its lease
+    there); the pass stops early when it returns False.
+    """
+    now = now or datetime.utcnow()
+    started = time.perf_counter()
+    summary = {"checked": 0, "updated": 0, "transitions": 0, "batches": 0}
+
+    # Re-scored profiles stop being due, so each query returns the next page
+    while True:
+        profiles = due_profiles_query(db, now).limit(batch_size).all()
+        if not profiles:
+            break
+
+        counters = rollup_counters(db, [profile.user_id for profile in profiles])
+        results = score_profiles(profiles, now, counters)
+        db.execute(update(UserProfile), [
+            {
+                "id": result["id"],
+                "technical_experience_score": result["technical_experience_score"],
+                "training_commitment_score": result["training_commitment_score"],
+                "needs_sophistication_score": result["needs_sophistication_score"],
+                "experience_level": result["new_level"],
+                "last_level_calculation": now,
+                "updated_at": now
+            }
+            for result in results
+        ])
+        db.commit()
+
+        transitions = _transition_events(results)
+        if transitions:
+            write_interaction_batch(db, transitions)
+
+        # Drop this page from the identity map before loading the next one
+        db.expunge_all()
+
+        summary["checked"] += len(profiles)
+        summary["updated"] += len(results)
+        summary["transitions"] += len(transitions)
+        summary["batches"] += 1
+
+        if keep_going is not None and not keep_going():
+            summary["interrupted"] = True
+            break
+
+    summary["duration_ms"] = (time.perf_counter() - started) * 1000
+    return summary
+
+
+def _transition_events(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Interaction events for the profiles whose level changed (as _track_level_transition)"""
+    return [
+        {
+            "user_id": result["user_id"],
+            "interaction_type": InteractionType.MANUAL_OVERRIDE.value,  # Reusing this type for system transitions
+            "interaction_data": {
+                "from_level": result["old_level"],
+                "to_level": result["new_level"],
+                "confidence_score": result["composite_score"],
+                "trigger": "automatic_calculation"
+            },
+            "duration_seconds": None,
+            "session_id": None
+        }
+        for result in results
+        if result["old_level"] != result["new_level"]
+    ]
+
+
+class LevelRecalculationScheduler:
+    """Daemon thread that runs recalculate_due_levels every interval_seconds"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval_seconds: float = 3600,
+        batch_size: int = 500,
+        lease_seconds: float = 600
+    ):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self._holder: Optional[str] = None
+        self._holder_pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.runs = 0
+        self.failed_runs = 0
+        self.skipped_runs = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_summary: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        """Start the scheduler thread (first pass runs immediately)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="level-recalculation", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the scheduler thread after the current pass"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def holder(self) -> str:
+        """Lease holder id of this process (workers forked after import get their own)"""
+        if self._holder is None or self._holder_pid != os.getpid():
+            self._holder = lease_holder_id()
+            self._holder_pid = os.getpid()
+        return self._holder
+
+    def run_once(self) -> Dict[str, Any]:
+        """
+        Run one recalculation pass (and the retention cleanups) in a fresh
+        session, unless another process holds the recalculation lease.
+        """
+        with self._run_lock:
+            db = self.session_factory()
+            try:
+                holder = self.holder
+                if not acquire_lease(db, LEASE_NAME, holder, self.lease_seconds):
+                    self.skipped_runs += 1
+                    return {"skipped": True, "reason": "Another process is running the recalculation pass"}
+
+                try:
+                    summary = recalculate_due_levels(
+                        db,
+                        batch_size=self.batch_size,
+                        keep_going=lambda: acquire_lease(db, LEASE_NAME, holder, self.lease_seconds)
+                    )
+                    if not summary.get("interrupted"):
+                        summary["compacted"] = compact_interactions(db)
+                        summary["sync_keys_pruned"] = prune_sync_mutations(db)
+                except Exception:
+                    db.rollback()
+                    self.failed_runs += 1
+                    raise
+                finally:
+                    release_lease(db, LEASE_NAME, holder)
+            finally:
+                db.close()
+
+            self.runs += 1
+            self.last_run_at = datetime.utcnow()
+            self.last_summary = summary
+            return summary
+
+    def stats(self) -> Dict[str, Any]:
+        """Scheduler state and the summary of the last pass"""
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "interval_seconds": self.interval_seconds,
+            "batch_size": self.batch_size,
+            "runs": self.runs,
+            "failed_runs": self.failed_runs,
+            "skipped_runs": self.skipped_runs,
+            "lease_holder": self.holder,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_summary": self.last_summary
+        }
+
+    def _run(self) -> None:
+        """Scheduler loop"""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Warning: Level recalculation pass failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+
+level_scheduler = LevelRecalculationScheduler(
+    interval_seconds=settings.level_recalculation_interval_seconds,
+    batch_size=settings.level_recalculation_batch_size,
+    lease_seconds=settings.level_recalculation_lease_seconds
+)
@@ -0,0 +1,247 @@
+"""
+Vectorized experience level scoring
+
+Turns N profiles into a feature matrix and computes every scoring term, the
+three component scores, the weighted composite and the level as array
+operations, with the same arithmetic as UserAdaptationService._calculate_*_score,
+SCORING_WEIGHTS and LEVEL_THRESHOLDS. The per-term arrays double as the
+analytics breakdowns, so nothing is computed twice. Used by the analytics
+endpoint (one profile) and the background cohort re-score (pages of them).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime
+
+import numpy as np
+
+from app.models.user_profile import UserExperienceLevel
+from app.services.interaction_rollups import usage_counters
+from app.services.user_adaptation import UserAdaptationService
+
+ADVANCED_SECTIONS = ["analytics", "projections", "advanced_stats", "export"]
+COMPLEX_FEATURES = ["manual_programming", "advanced_analytics", "data_export", "custom_formulas"]
+DOWNGRADE_BLOCKING_FEATURES = ["manual_programming", "advanced_analytics", "custom_formulas"]
+
+LEVEL_ORDER = [
+    UserExperienceLevel.ABSOLUTE_BEGINNER,
+    UserExperienceLevel.COMMITTED_BEGINNER,
+    UserExperienceLevel.INTERMEDIATE,
+    UserExperienceLevel.ADVANCED,
+    UserExperienceLevel.ELITE_ATHLETE
+]
+LEVEL_RANK = {level.value: rank for rank, level in enumerate(LEVEL_ORDER)}
+
+# Columns of the feature matrix
+FEATURE_COLUMNS = [
+    "terms", "adjustments", "features_used", "basic_help",
+    "frequency_7d", "frequency_30d", "data_quality", "session_avg",
+    "advanced_navigation", "complex_usage", "analysis_time"
+]
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURE_COLUMNS)}
+
+# Scoring terms of each component, in summation order (the breakdown keys)
+COMPONENT_TERMS = {
+    "technical_experience": ["terminology_usage", "manual_adjustments", "feature_diversity", "help_independence"],
+    "training_commitment": ["weekly_frequency", "monthly_consistency", "data_quality", "session_engagement"],
+    "needs_sophistication": ["advanced_navigation", "complex_features", "analysis_depth"]
+}
+
+
+def profile_features(profile: Any, counters: Optional[Dict[str, Dict[str, int]]] = None) -> List[float]:
+    """
+    One feature matrix row (missing counters count as zero).
+
+    counters, from interaction_rollups.rollup_counters, are the page/feature
+    counts; the legacy maps stored on the profile only fill in missing keys.
+    """
+    navigation, features = usage_counters(profile, counters)
+    return [
+        len(profile.terminology_usage or {}),
+        profile.manual_adjustments_count or 0,
+        len(features),
+        (profile.help_requests or {}).get("basic_concepts", 0),
+        profile.workout_frequency_7d or 0.0,
+        profile.workout_frequency_30d or 0.0,
+        profile.data_quality_score or 0.0,
+        profile.session_duration_avg or 0.0,
+        sum(navigation.get(section, 0) for section in ADVANCED_SECTIONS),
+        sum(features.get(feature, 0) for feature in COMPLEX_FEATURES),
+        navigation.get("detailed_analysis_time", 0)
+    ]
+
+
+def profile_feature_matrix(
+    profiles: Sequence[Any],
+    counters: Optional[Dict[int, Dict[str, Dict[str, int]]]] = None
+) -> np.ndarray:
+    """N x len(FEATURE_COLUMNS) matrix of scoring inputs (counters keyed by user_id)"""
+    if not profiles:
+        return np.zeros((0, len(FEATURE_COLUMNS)))
+    return np.array(
+        [profile_features(profile, counters and counters.get(profile.user_id)) for profile in profiles],
+        dtype=float
+    )
+
+
+def score_feature_matrix(matrix: np.ndarray) -> Dict[str, Any]:
+    """
+    Score every row of a feature matrix.
+
+    Returns the per-term arrays ("terms"), the three component scores, the
+    composite and the index of the level in LEVEL_THRESHOLDS order.
+    """
+    x = {name: matrix[:, index] for name, index in FEATURE_INDEX.items()}
+
+    terms = {
+        # Technical experience (0-100)
+        "terminology_usage": np.minimum(25, x["terms"] * 2.5),
+        "manual_adjustments": np.minimum(20, x["adjustments"]) * 1.25,
+        "feature_diversity": np.minimum(25, x["features_used"] * 1.67),
+        "help_independence": np.maximum(0, 25 - x["basic_help"] * 2.5),
+        # Training commitment (0-100)
+        "weekly_frequency": np.minimum(7, x["frequency_7d"]) * 4.29,
+        "monthly_consistency": np.minimum(30, x["frequency_30d"]) * 0.83,
+        "data_quality": x["data_quality"] * 25,
+        "session_engagement": np.minimum(20, x["session_avg"] / 60 * 0.67),
+        # Needs sophistication (0-100)
+        "advanced_navigation": np.minimum(30, x["advanced_navigation"] * 2),
+        "complex_features": np.minimum(35, x["complex_usage"] * 3.5),
+        "analysis_depth": np.minimum(35, x["analysis_time"] / 60 * 0.58)
+    }
+
+    components = {}
+    for component, names in COMPONENT_TERMS.items():
+        # Same left-to-right summation as the per-profile scorers
+        total = np.zeros(len(matrix))
+        for name in names:
+            total = total + terms[name]
+        components[component] = np.minimum(100, total)
+
+    weights = UserAdaptationService.SCORING_WEIGHTS
+    composite = (
+        components["technical_experience"] * weights["technical_experience"] +
+        components["training_commitment"] * weights["training_commitment"] +
+        components["needs_sophistication"] * weights["needs_sophistication"]
+    )
+
+    return {
+        "terms": terms,
+        "technical_experience_score": components["technical_experience"],
+        "training_commitment_score": components["training_commitment"],
+        "needs_sophistication_score": components["needs_sophistication"],
+        "composite_score": composite,
+        "level_index": _level_indices(composite)
+    }
+
+
+def _level_indices(composite: np.ndarray) -> np.ndarray:
+    """Vectorized _score_to_level: index into LEVEL_THRESHOLDS, -1 above every threshold"""
+    thresholds = UserAdaptationService.LEVEL_THRESHOLDS.values()
+    mins = np.array([threshold["min_score"] for threshold in thresholds])
+    maxs = np.array([threshold["max_score"] for threshold in thresholds])
+    matches = (mins <= composite[:, None]) & (composite[:, None] < maxs)
+    return np.where(matches.any(axis=1), matches.argmax(axis=1), -1)
+
+
+def scores_to_levels(scores: Dict[str, Any]) -> List[UserExperienceLevel]:
+    """Levels of a score_feature_matrix result (ELITE_ATHLETE above every threshold)"""
+    levels = list(UserAdaptationService.LEVEL_THRESHOLDS)
+    return [
+        levels[index] if index >= 0 else UserExperienceLevel.ELITE_ATHLETE
+        for index in scores["level_index"]
+    ]
+
+
+def breakdowns(scores: Dict[str, Any]) -> List[Dict[str, Dict[str, float]]]:
+    """Per-term breakdown of every row, keyed by component"""
+    columns = {name: values.tolist() for name, values in scores["terms"].items()}
+    return [
+        {
+            component: {name: columns[name][row] for name in names}
+            for component, names in COMPONENT_TERMS.items()
+        }
+        for row in range(len(scores["composite_score"]))
+    ]
+
+
+def score_profile_breakdowns(
+    profiles: Sequence[Any],
+    counters: Optional[Dict[int, Dict[str, Dict[str, int]]]] = None
+) -> List[Dict[str, Any]]:
+    """Scores, level and breakdowns of each profile, for analytics"""
+    scores = score_feature_matrix(profile_feature_matrix(profiles, counters))
+    levels = scores_to_levels(scores)
+    rows = zip(
+        scores["technical_experience_score"].tolist(),
+        scores["training_commitment_score"].tolist(),
+        scores["needs_sophistication_score"].tolist(),
+        scores["composite_score"].tolist(),
+        levels,
+        breakdowns(scores)
+    )
+    return [
+        {
+            "technical_experience_score": technical,
+            "training_commitment_score": commitment,
+            "needs_sophistication_score": sophistication,
+            "composite_score": composite,
+            "level": level.value,
+            "breakdown": breakdown
+        }
+        for technical, commitment, sophistication, composite, level, breakdown in rows
+    ]
+
+
+def score_profiles(
+    profiles: Sequence[Any],
+    now: Optional[datetime] = None,
+    counters: Optional[Dict[int, Dict[str, Dict[str, int]]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Re-score profiles the way _recalculate_user_level does, as array operations.
+
+    Downgrades are only applied when the profile has been inactive for 30+
+    days and has not used advanced features (_should_allow_downgrade).
+    Previous levels outside LEVEL_ORDER are never treated as a downgrade.
+    """
+    if not profiles:
+        return []
+
+    now = now or datetime.utcnow()
+    counters = counters or {}
+    scores = score_feature_matrix(profile_feature_matrix(profiles, counters))
+    new_levels = scores_to_levels(scores)
+
+    old_rank = np.array([LEVEL_RANK.get(getattr(p.experience_level, "value", p.experience_level), -1) for p in profiles])
+    new_rank = np.array([LEVEL_RANK[level.value] for level in new_levels])
+    inactive_days = np.array([
+        (now - p.updated_at.replace(tzinfo=None)).days if p.updated_at else 0
+        for p in profiles
+    ])
+    advanced_usage = np.array([
+        any(
+            usage_counters(p, counters.get(p.user_id))[1].get(feature, 0) > 0
+            for feature in DOWNGRADE_BLOCKING_FEATURES
+        )
+        for p in profiles
+    ])
+    keep_old = ((new_rank < old_rank) & ((inactive_days < 30) | advanced_usage)).tolist()
+    technical = scores["technical_experience_score"].tolist()
+    commitment = scores["training_commitment_score"].tolist()
+    sophistication = scores["needs_sophistication_score"].tolist()
+    composite = scores["composite_score"].tolist()
+
+    results = []
+    for row, profile in enumerate(profiles):
+        new_level = profile.experience_level if keep_old[row] else new_levels[row].value
+        results.append({
+            "id": profile.id,
+            "user_id": profile.user_id,
+            "old_level": profile.experience_level,
+            "new_level": getattr(new_level, "value", new_level),
+            "technical_experience_score": technical[row],
+            "training_commitment_score": commitment[row],
+            "needs_sophistication_score": sophistication[row],
+            "composite_score": composite[row]
+        })
+    return results
@@ -0,0 +1,108 @@
+"""
+Bounded worker pool for bcrypt
+
+Hashing and verifying passwords costs tens of milliseconds of CPU each. Run
+on the event loop they stall every request; run on the shared request
+threadpool a login burst can take every thread. They get their own small
+executor instead, with a cap on the work waiting for it: once
+max_pending hashes are queued or running, new ones are refused
+(PasswordHashingBusy) so callers can shed load with a 503 instead of
+piling up requests behind the burst.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import asyncio
+import threading
+import time
+
+from app.core.config import settings
+
+
+class PasswordHashingBusy(RuntimeError):
+    """Raised when the hashing pool already has max_pending jobs"""
+
+
+class PasswordHashingPool:
+    """Fixed-size executor for password hashing with load shedding"""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hashing")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.high_water_mark = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.total_run_ms = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) on the pool and await its result; raises PasswordHashingBusy when saturated"""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusy("Password hashing queue is full")
+            self.pending += 1
+            self.submitted += 1
+            self.high_water_mark = max(self.high_water_mark, self.pending)
+
+        queued_at = time.perf_counter()
+        try:
+            future = self._executor.submit(self._timed, queued_at, func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the job itself finishes, not when the awaiting request
+        # is cancelled (a cancelled await leaves a running hash on the workers)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for the running jobs"""
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and load shedding counters for monitoring"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "depth": self.pending,
+                "waiting": max(0, self.pending - self.max_workers),
+                "high_water_mark": self.high_water_mark,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "avg_wait_ms": (self.total_wait_ms / self.completed) if self.completed else 0.0,
+                "max_wait_ms": self.max_wait_ms,
+                "avg_run_ms": (self.total_run_ms / self.completed) if self.completed else 0.0
+            }
+
+    def _release(self, _future: Any = None) -> None:
+        """Drop one job from the pending count"""
+        with self._lock:
+            self.pending -= 1
+
+    def _timed(self, queued_at: float, func: Callable[..., Any], *args: Any) -> Any:
+        """Worker side: record queue wait and run time around func"""
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            wait_ms = (started - queued_at) * 1000
+            with self._lock:
+                self.completed += 1
+                self.total_wait_ms += wait_ms
+                self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+                self.total_run_ms += (finished - started) * 1000
+
+
+password_pool = PasswordHashingPool(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending
+)
@@ -0,0 +1,401 @@
+"""
+Projection Engine
+
+Batched, array-based version of TrainingCalculatorService.calculate_weekly_progression.
+Every week and every lift of a block is computed in a single pass with NumPy;
+dict-shaped responses are only built at the edge by the to_* helpers.
+"""
+
+from typing import Dict, List, Any, Sequence
+import numpy as np
+
+
+# Main lifts stored on a training block (exercise key -> block column)
+BLOCK_LIFTS = {
+    'pullups': 'rm_pullups',
+    'dips': 'rm_dips',
+    'muscleups': 'rm_muscleups',
+    'squats': 'rm_squats'
+}
+
+# Strategy-specific block columns passed to the calculators
+STRATEGY_PARAM_FIELDS = (
+    'duration',
+    'weekly_increment',
+    'increment_type',
+    'deload_week',
+    'volume_multiplier',
+    'intensity_focus',
+    'daily_variation',
+    'intensity_range',
+    'volume_cycles',
+    'max_effort_days',
+    'dynamic_effort_days',
+    'repetition_effort_days',
+    'wave_pattern',
+    'wave_amplitude',
+    'wave_frequency'
+)
+
+
+class ProjectionEngine:
+
+    @staticmethod
+    def strategy_params(block) -> Dict[str, Any]:
+        """Build the strategy parameters dict from a training block"""
+        return {field: getattr(block, field) for field in STRATEGY_PARAM_FIELDS}
+
+    @staticmethod
+    def block_one_rms(block) -> Dict[str, float]:
+        """Get the 1RM of every main lift stored on a training block"""
+        return {lift: getattr(block, column) or 0.0 for lift, column in BLOCK_LIFTS.items()}
+
+    @staticmethod
+    def project(
+        one_rms: Sequence[float],
+        strategy: str,
+        total_weeks: int,
+        strategy_params: Dict[str, Any],
+        body_weight: float = 0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Project every week x lift of a block.
+
+        Returns arrays of shape (weeks, lifts) for working weights, load percentages
+        and rep ranges, plus per-week arrays for sets and RPE. Strategies that
+        prescribe a range (DUP) fill *_min and *_max with different values; for the
+        rest both ends are equal. Lifts with a 1RM of 0 are left at zero.
+        """
+        rms = np.asarray(one_rms, dtype=float).reshape(1, -1)
+        weeks = np.arange(1, total_weeks + 1, dtype=float).reshape(-1, 1)
+        shape = (weeks.shape[0], rms.shape[1])
+
+        if strategy == 'linear_progression':
+            result = ProjectionEngine._project_linear(rms, weeks, strategy_params, body_weight)
+        elif strategy == 'block_periodization':
+            result = ProjectionEngine._project_block_periodization(rms, weeks, strategy_params)
+        elif strategy == 'dub_progression':
+            result = ProjectionEngine._project_dup(rms, weeks, strategy_params)
+        elif strategy == 'conjugate':
+            result = ProjectionEngine._project_conjugate(rms, weeks)
+        elif strategy == 'wave_loading':
+            result = ProjectionEngine._project_wave_loading(rms, weeks, strategy_params)
+        else:
+            result = ProjectionEngine._project_default(rms, weeks)
+
+        # Broadcast everything to (weeks, lifts) and zero out lifts without a 1RM
+        active = np.broadcast_to(rms > 0, shape)
+        for key in ('load_min', 'load_max', 'working_min', 'working_max', 'reps_min', 'reps_max'):
+            result[key] = np.where(active, np.broadcast_to(result[key], shape), 0)
+        for key in ('sets', 'rpe', 'deload'):
+            result[key] = np.broadcast_to(result[key], (shape[0],)).copy()
+
+        result['weeks'] = weeks.ravel().astype(int)
+        result['active'] = active
+        result['is_range'] = strategy == 'dub_progression'
+        return result
+
+    @staticmethod
+    def _round(values: np.ndarray, ndigits: int = 1) -> np.ndarray:
+        """np.round that agrees with Python's round() on values sitting near a tie"""
+        values = np.asarray(values, dtype=float)
+        rounded = np.round(values, ndigits)
+        scaled = values * 10 ** ndigits
+        ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        if ties.any():
+            rounded[ties] = [round(value, ndigits) for value in values[ties].tolist()]
+        return rounded
+
+    @staticmethod
+    def _working_weight(rms: np.ndarray, percentage: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_working_weight"""
+        return rms * (percentage / 100)
+
+    @staticmethod
+    def _reps_for_weight(rms: np.ndarray, weight: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_reps_for_weight (Brzycki)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            reps = np.clip(np.rint(30 * (rms / weight - 1)), 1, 20)
+            reps = np.where(weight >= rms, 1, reps)
+            reps = np.where(weight <= 0, 0, np.nan_to_num(reps))
+        return reps.astype(int)
+
+    @staticmethod
+    def _project_linear(
+        rms: np.ndarray,
+        weeks: np.ndarray,
+        params: Dict[str, Any],
+        body_weight: float
+    ) -> Dict[str, Any]:
+        """Linear progression loads for every week"""
+
+        increment = params.get('weekly_increment', 2.5)
+        increment_type = params.get('increment_type', 'absolute')
+        deload_week = params.get('deload_week')
+
+        if increment_type == 'percentage':
+            percentage = 70 + (weeks - 1) * increment
+        else:
+            # Absolute increment in kg
+            with np.errstate(divide='ignore', invalid='ignore'):
+                percentage = (rms * 0.7 + (weeks - 1) * increment) / rms * 100
+
+        # Cap at 95% to avoid overtraining
+        percentage = np.minimum(95, percentage)
+
+        deload = (weeks == deload_week) if deload_week else np.zeros_like(weeks, dtype=bool)
+        percentage = np.where(deload, 60, percentage)
+
+        base_weight = ProjectionEngine._working_weight(rms, percentage)
+        estimated_reps = ProjectionEngine._reps_for_weight(rms, base_weight)
+        working_weight = ProjectionEngine._round(base_weight + body_weight, 1)
+
+        return {
+            'load_min': ProjectionEngine._round(percentage, 1),
+            'load_max': ProjectionEngine._round(percentage, 1),
+            'working_min': working_weight,
+            'working_max': working_weight,
+            'reps_min': np.where(deload, 8, np.maximum(1, estimated_reps - 2)),
+            'reps_max': np.where(deload, 12, estimated_reps),
+            'sets': 3,
+            'rpe': np.where(deload, 6, 8).ravel(),
+            'deload': deload.ravel()
+        }
+
+    @staticmethod
+    def _project_block_periodization(
+        rms: np.ndarray,
+        weeks: np.ndarray,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Block periodization loads for every week"""
+
+        weeks_per_phase = params.get('duration', 12) // 3
+        volume_multiplier = params.get('volume_multiplier', 1.0)
+        if volume_multiplier is None:
+            volume_multiplier = 1.0
+
+        # Accumulation, intensification and realization phases
+        phases = [weeks <= weeks_per_phase, weeks <= weeks_per_phase * 2]
+        percentage = np.select(phases, [
+            70 + (weeks - 1) * 2,
+            80 + (weeks - weeks_per_phase - 1) * 3
+        ], 90 + (weeks - weeks_per_phase * 2 - 1) * 2)
+
+        working_weight = ProjectionEngine._round(ProjectionEngine._working_weight(rms, percentage), 1)
+
+        return {
+            'load_min': ProjectionEngine._round(percentage, 1),
+            'load_max': ProjectionEngine._round(percentage, 1),
+            'working_min': working_weight,
+            'working_max': working_weight,
+            'reps_min': np.select(phases, [8, 5], 1),
+            'reps_max': np.select(phases, [12, 8], 5),
+            'sets': np.select(phases, [int(4 * volume_multiplier), 4], 3).ravel(),
+            'rpe': np.select(phases, [7, 8], 9).ravel(),
+            'deload': False
+        }
+
+    @staticmethod
+    def _project_dup(
+        rms: np.ndarray,
+        weeks: np.ndarray,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """DUP load ranges for every week"""
+
+        base_load = 75 + (weeks - 1) * 2
+        daily_variation = params.get('daily_variation', 'intensity')
+
+        # DUP varies daily, so we provide ranges
+        if daily_variation == 'intensity':
+            load_min, load_max, reps_range = base_load - 5, base_load + 5, (3, 8)
+        elif daily_variation == 'volume':
+            load_min, load_max, reps_range = base_load - 10, base_load, (8, 15)
+        else:  # both
+            load_min, load_max, reps_range = base_load - 10, base_load + 5, (3, 15)
+
+        return {
+            'load_min': load_min,
+            'load_max': load_max,
+            'working_min': ProjectionEngine._round(ProjectionEngine._working_weight(rms, load_min), 1),
+            'working_max': ProjectionEngine._round(ProjectionEngine._working_weight(rms, load_max), 1),
+            'reps_min': reps_range[0],
+            'reps_max': reps_range[1],
+            'sets': 4,
+            'rpe': 8,
+            'deload': False
+        }
+
+    @staticmethod
+    def _project_conjugate(rms: np.ndarray, weeks: np.ndarray) -> Dict[str, Any]:
+        """Conjugate method loads for every week"""
+
+        # Conjugate maintains high intensity
+        percentage = np.minimum(95, 90 + (weeks - 1) * 1)
+        working_weight = ProjectionEngine._round(ProjectionEngine._working_weight(rms, percentage), 1)
+
+        return {
+            'load_min': ProjectionEngine._round(percentage, 1),
+            'load_max': ProjectionEngine._round(percentage, 1),
+            'working_min': working_weight,
+            'working_max': working_weight,
+            'reps_min': 1,
+            'reps_max': 3,
+            'sets': 3,
+            'rpe': 9,
+            'deload': False
+        }
+
+    @staticmethod
+    def _project_wave_loading(
+        rms: np.ndarray,
+        weeks: np.ndarray,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Wave loading progression for every week"""
+
+        wave_pattern = params.get('wave_pattern', 'ascending')
+        wave_amplitude = params.get('wave_amplitude', 10)
+        if wave_amplitude is None:
+            wave_amplitude = 10
+
+        if wave_pattern == 'ascending':
+            percentage = 70 + (weeks - 1) * 3 + (weeks % 3) * wave_amplitude
+        elif wave_pattern == 'descending':
+            percentage = 95 - (weeks - 1) * 2 - (weeks % 3) * wave_amplitude
+        elif wave_pattern == 'pyramid':
+            mid_week = params.get('duration', 12) // 2
+            percentage = np.where(
+                weeks <= mid_week,
+                70 + (weeks - 1) * 5,
+                95 - (weeks - mid_week - 1) * 5
+            )
+        else:  # undulating
+            percentage = 80 + (weeks % 2) * wave_amplitude
+
+        # Ensure load percentage is within reasonable bounds
+        percentage = np.clip(percentage, 60, 95)
+
+        return ProjectionEngine._estimated_reps_result(rms, percentage, sets=4)
+
+    @staticmethod
+    def _project_default(rms: np.ndarray, weeks: np.ndarray) -> Dict[str, Any]:
+        """Default progression for every week"""
+
+        percentage = 70 + (weeks / 12) * 25  # 70% to 95%
+        return ProjectionEngine._estimated_reps_result(rms, percentage, sets=3)
+
+    @staticmethod
+    def _estimated_reps_result(rms: np.ndarray, percentage: np.ndarray, sets: int) -> Dict[str, Any]:
+        """Result for strategies whose rep range comes from the Brzycki estimate"""
+
+        working_weight = ProjectionEngine._working_weight(rms, percentage)
+        estimated_reps = ProjectionEngine._reps_for_weight(rms, working_weight)
+
+        return {
+            'load_min': ProjectionEngine._round(percentage, 1),
+            'load_max': ProjectionEngine._round(percentage, 1),
+            'working_min': ProjectionEngine._round(working_weight, 1),
+            'working_max': ProjectionEngine._round(working_weight, 1),
+            'reps_min': np.maximum(1, estimated_reps - 2),
+            'reps_max': estimated_reps,
+            'sets': sets,
+            'rpe': 8,
+            'deload': False
+        }
+
+    @staticmethod
+    def to_weekly_projections(lifts: List[str], projection: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+        """Build the {week_N: {lift: working_weight}} dict (ranges are averaged)"""
+
+        working_weight = ProjectionEngine._round((projection['working_min'] + projection['working_max']) / 2, 1)
+        return {
+            f"week_{week}": dict(zip(lifts, row))
+            for week, row in zip(projection['weeks'].tolist(), working_weight.tolist())
+        }
+
+    @staticmethod
+    def to_detailed_projections(
+        one_rms: Dict[str, float],
+        strategy: str,
+        strategy_params: Dict[str, Any],
+        projection: Dict[str, np.ndarray]
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Build the per-week, per-lift progression dicts served by /projections"""
+
+        lifts = list(one_rms.keys())
+        is_range = projection['is_range']
+        load_min = projection['load_min'].tolist()
+        load_max = projection['load_max'].tolist()
+        working_min = projection['working_min'].tolist()
+        working_max = projection['working_max'].tolist()
+        reps_min = projection['reps_min'].tolist()
+        reps_max = projection['reps_max'].tolist()
+        active = projection['active'].tolist()
+
+        projections = {}
+        for i, week in enumerate(projection['weeks'].tolist()):
+            notes = ProjectionEngine._progression_notes(
+                strategy, week, strategy_params, bool(projection['deload'][i])
+            )
+            week_projection = {}
+
+            for j, lift in enumerate(lifts):
+                if not active[i][j]:
+                    week_projection[lift] = {
+                        'one_rm': 0,
+                        'load_percentage': 0,
+                        'working_weight': 0,
+                        'reps_range': [0, 0],
+                        'sets': 0,
+                        'rpe': 0,
+                        'notes': 'No 1RM establecido'
+                    }
+                    continue
+
+                if is_range:
+                    load_percentage = f"{int(load_min[i][j])}-{int(load_max[i][j])}"
+                    working_weight = f"{working_min[i][j]}-{working_max[i][j]}"
+                else:
+                    load_percentage = load_min[i][j]
+                    working_weight = working_min[i][j]
+
+                week_projection[lift] = {
+                    'one_rm': one_rms[lift],
+                    'load_percentage': load_percentage,
+                    'working_weight': working_weight,
+                    'reps_range': [int(reps_min[i][j]), int(reps_max[i][j])],
+                    'sets': int(projection['sets'][i]),
+                    'rpe': int(projection['rpe'][i]),
+                    'notes': notes
+                }
+
+            projections[f"week_{week}"] = week_projection
+
+        return projections
+
+    @staticmethod
+    def _progression_notes(strategy: str, week: int, params: Dict[str, Any], is_deload: bool) -> str:
+        """Notes for a projected week, matching calculate_weekly_progression"""
+
+        if strategy == 'linear_progression':
+            if is_deload:
+                return 'Semana de descarga - intensidad reducida'
+            return f'Progresión lineal semana {week}'
+        elif strategy == 'block_periodization':
+            weeks_per_phase = params.get('duration', 12) // 3
+            if week <= weeks_per_phase:
+                phase = 'Acumulación'
+            elif week <= weeks_per_phase * 2:
+                phase = 'Intensificación'
+            else:
+                phase = 'Realización'
+            return f'Periodización en bloques - {phase}'
+        elif strategy == 'dub_progression':
+            return f'DUP semana {week} - variación diaria'
+        elif strategy == 'conjugate':
+            return f'Método conjugado semana {week} - esfuerzo máximo'
+        elif strategy == 'wave_loading':
+            return f"Carga en ondas semana {week} - patrón {params.get('wave_pattern', 'ascending')}"
+        return f'Entrenamiento general semana {week}'
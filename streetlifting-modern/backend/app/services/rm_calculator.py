@@ -1,4 +1,5 @@
 from typing import Dict, List, Optional
+import numpy as np
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc, func
@@ -6,6 +7,11 @@ from app.models.workout import Exercise, Workout
 from app.models.training import OneRepMax
 
 
+# RPE adjustment factors (approximate), as arrays for np.interp: RPE 5 -> 0.80 ... RPE 10 -> 1.0
+RPE_POINTS = np.arange(5.0, 10.5, 0.5)
+RPE_FACTORS = np.round(0.80 + (RPE_POINTS - 5.0) * 0.04, 2)
+
+
 def calculate_estimated_one_rm(weight: float, reps: int, rpe: Optional[float] = None) -> float:
     """
     Calculate estimated one-rep max using Epley formula with RPE adjustment
@@ -16,30 +22,27 @@ def calculate_estimated_one_rm(weight: float, reps: int, rpe: Optional[float] =
     # Epley formula: 1RM = weight × (1 + reps/30)
     estimated_rm = weight * (1 + reps / 30)
     
-    # RPE adjustment (if RPE is provided)
+    # RPE adjustment (if RPE is provided), interpolated between the tabulated factors
     if rpe is not None and 1 <= rpe <= 10:
-        # RPE adjustment factors (approximate)
-        rpe_factors = {
-            10: 1.0,    # Max effort
-            9.5: 0.98,
-            9: 0.96,
-            8.5: 0.94,
-            8: 0.92,
-            7.5: 0.90,
-            7: 0.88,
-            6.5: 0.86,
-            6: 0.84,
-            5.5: 0.82,
-            5: 0.80
-        }
-        
-        # Find closest RPE factor
-        closest_rpe = min(rpe_factors.keys(), key=lambda x: abs(x - rpe))
-        estimated_rm *= rpe_factors[closest_rpe]
+        estimated_rm *= float(np.interp(rpe, RPE_POINTS, RPE_FACTORS))
     
     return round(estimated_rm, 2)
 
 
+def estimated_one_rms(weights: np.ndarray, reps: np.ndarray, rpes: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_estimated_one_rm (rpes holds NaN where no RPE was logged)"""
+    weights = np.asarray(weights, dtype=float)
+    reps = np.asarray(reps, dtype=float)
+    rpes = np.asarray(rpes, dtype=float)
+    
+    estimated = weights * (1 + reps / 30)
+    with np.errstate(invalid="ignore"):
+        adjusted = (rpes >= 1) & (rpes <= 10)
+    factors = np.where(adjusted, np.interp(np.nan_to_num(rpes, nan=10.0), RPE_POINTS, RPE_FACTORS), 1.0)
+    estimated = np.round(estimated * factors, 2)
+    return np.where((weights > 0) & (reps > 0), estimated, 0.0)
+
+
 def calculate_percentage_of_rm(one_rm: float, percentage: float) -> float:
     """Calculate weight for a given percentage of 1RM"""
     return round(one_rm * (percentage / 100), 2)
@@ -69,34 +72,17 @@ class RMCalculatorService:
         return latest_rm.one_rm if latest_rm else None
     
     def calculate_from_recent_workouts(self, user_id: int, exercise: str, days_back: int = 30) -> Optional[float]:
-        """Calculate estimated 1RM from recent workout data"""
-        cutoff_date = date.today() - timedelta(days=days_back)
+        """Best estimated 1RM of recent completed workouts (from the e1RM index)"""
+        from app.services.e1rm_index import current_e1rm
         
-        # Get recent exercises for this exercise
-        recent_exercises = self.db.query(Exercise).join(Workout).filter(
-            and_(
-                Workout.user_id == user_id,
-                Exercise.name == exercise,
-                Workout.date >= cutoff_date,
-                Workout.completed == True
-            )
-        ).order_by(desc(Workout.date)).limit(10).all()
-        
-        if not recent_exercises:
-            return None
-        
-        # Calculate estimated 1RM for each set and take the highest
-        estimated_rms = []
-        for exercise_record in recent_exercises:
-            if exercise_record.weight > 0 and exercise_record.reps > 0:
-                estimated_rm = calculate_estimated_one_rm(
-                    exercise_record.weight, 
-                    exercise_record.reps, 
-                    exercise_record.rpe
-                )
-                estimated_rms.append(estimated_rm)
+        return current_e1rm(self.db, user_id, exercise, days_back=days_back)
+    
+    def get_best_estimated_one_rm(self, user_id: int, exercise: str) -> Optional[float]:
+        """All-time best estimated 1RM from completed workouts (from the e1RM index)"""
+        from app.services.e1rm_index import best_e1rm
         
-        return max(estimated_rms) if estimated_rms else None
+        best = best_e1rm(self.db, user_id, exercise)
+        return best.best_e1rm if best else None
     
     def update_one_rm(self, user_id: int, exercise: str, one_rm: float) -> OneRepMax:
         """Update or create a one-rep max record"""
@@ -153,7 +139,9 @@ class RMCalculatorService:
     
     def get_exercise_history(self, user_id: int, exercise: str, limit: int = 20) -> List[Dict]:
         """Get recent workout history for an exercise"""
-        recent_workouts = self.db.query(Exercise).join(Workout).filter(
+        recent_sets = self.db.query(
+            Workout.date, Exercise.weight, Exercise.reps, Exercise.rpe
+        ).join(Workout).filter(
             and_(
                 Workout.user_id == user_id,
                 Exercise.name == exercise,
@@ -161,17 +149,21 @@ class RMCalculatorService:
             )
         ).order_by(desc(Workout.date)).limit(limit).all()
         
+        if not recent_sets:
+            return []
+        
+        estimated_rms = estimated_one_rms(
+            [record.weight for record in recent_sets],
+            [record.reps for record in recent_sets],
+            [np.nan if record.rpe is None else record.rpe for record in recent_sets]
+        )
         return [
             {
-                "date": exercise_record.workout.date.isoformat(),
-                "weight": exercise_record.weight,
-                "reps": exercise_record.reps,
-                "rpe": exercise_record.rpe,
-                "estimated_rm": calculate_estimated_one_rm(
-                    exercise_record.weight, 
-                    exercise_record.reps, 
-                    exercise_record.rpe
-                )
+                "date": record.date.isoformat(),
+                "weight": record.weight,
+                "reps": record.reps,
+                "rpe": record.rpe,
+                "estimated_rm": estimated_rm
             }
-            for exercise_record in recent_workouts
-        ] 
\ No newline at end of file
+            for record, estimated_rm in zip(recent_sets, estimated_rms.tolist())
+        ]
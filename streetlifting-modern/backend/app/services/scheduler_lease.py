@@ -0,0 +1,71 @@
+"""
+Cross-process leases for background jobs
+
+Every worker process starts the same schedulers. A job that must run in
+one process at a time takes a lease row first: a conditional UPDATE (or
+the INSERT of a missing row) succeeds only when the lease is free, has
+expired or is already ours, so exactly one process wins on SQLite and
+PostgreSQL alike. The holder renews the lease while it works and releases
+it when done; a crashed holder's lease simply expires.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+import os
+import socket
+import uuid
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.scheduler_lease import SchedulerLease
+
+
+def lease_holder_id() -> str:
+    """Identifier of this process (host, pid and a random suffix)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire_lease(
+    db: Session,
+    name: str,
+    holder: str,
+    ttl_seconds: float,
+    now: Optional[datetime] = None
+) -> bool:
+    """Take or renew the lease; returns False while another holder has it"""
+    now = now or datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+
+    taken = db.execute(
+        update(SchedulerLease)
+        .where(
+            SchedulerLease.name == name,
+            or_(SchedulerLease.holder == holder, SchedulerLease.expires_at <= now)
+        )
+        .values(holder=holder, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    if not taken:
+        # The row is missing (first run) or held by someone else
+        try:
+            db.execute(insert(SchedulerLease).values(name=name, holder=holder, expires_at=expires_at))
+        except IntegrityError:
+            db.rollback()
+            return False
+
+    db.commit()
+    return True
+
+
+def release_lease(db: Session, name: str, holder: str) -> None:
+    """Expire the lease now if we still hold it"""
+    db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+        .values(expires_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+from app.core.pagination import apply_keyset
 from app.models.training import OneRepMax
 from app.schemas.training import OneRepMaxCreate, OneRepMaxUpdate
 
@@ -10,9 +12,20 @@ from app.schemas.training import OneRepMaxCreate, OneRepMaxUpdate
 class TrainingService:
     
     @staticmethod
-    def get_one_rep_maxes(db: Session, user_id: int) -> List[OneRepMax]:
-        """Get all OneRepMax records for a user"""
-        return db.query(OneRepMax).filter(OneRepMax.user_id == user_id).order_by(OneRepMax.date_achieved.desc()).all()
+    def get_one_rep_maxes(
+        db: Session,
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[OneRepMax]:
+        """Get OneRepMax records for a user, newest first (a page of them when limit/cursor are given)"""
+        query = apply_keyset(
+            db.query(OneRepMax).filter(OneRepMax.user_id == user_id),
+            OneRepMax.id, cursor, sort_column=OneRepMax.date_achieved
+        )
+        if limit:
+            query = query.limit(limit)
+        return query.all()
     
     @staticmethod
     def get_one_rep_max(db: Session, one_rm_id: int, user_id: int) -> Optional[OneRepMax]:
@@ -92,4 +105,25 @@ class TrainingService:
                 "weights_3x8": round(record.one_rm * 0.75, 1)
             })
         
-        return suggested_weights 
\ No newline at end of file
+        return suggested_weights
+
+
+class AsyncTrainingService:
+    """Read-only 1RM lookups on an AsyncSession (for async routes)"""
+    
+    @staticmethod
+    async def get_one_rep_maxes(
+        db: AsyncSession,
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[OneRepMax]:
+        """Async TrainingService.get_one_rep_maxes"""
+        query = apply_keyset(
+            select(OneRepMax).filter(OneRepMax.user_id == user_id),
+            OneRepMax.id, cursor, sort_column=OneRepMax.date_achieved
+        )
+        if limit:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return list(result.scalars().all())
@@ -1,12 +1,27 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, insert, select
 from typing import List, Optional, Dict, Any
 import json
+import hashlib
 from datetime import date, datetime, timedelta
 
 from app.models.training import TrainingBlock, BlockStage
 from app.schemas.training_block import TrainingBlockCreate, TrainingBlockUpdate, BlockProgress
 from app.services.training_calculator import TrainingCalculatorService
+from app.services.projection_engine import ProjectionEngine
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Bump whenever the projection/RPE math changes so stale entries are never served
+PROJECTION_CACHE_VERSION = 1
+
+# Projections and RPE tables only depend on the block's 1RMs, strategy and
+# strategy fields, so they are shared across requests (and identical blocks)
+projection_cache = TTLCache(
+    maxsize=settings.projection_cache_size,
+    ttl_seconds=settings.projection_cache_ttl_seconds
+)
 
 
 class TrainingBlockService:
@@ -96,6 +111,7 @@ class TrainingBlockService:
         
         db_block.updated_at = datetime.utcnow()
         db.commit()
+        projection_cache.invalidate(block_id)
         db.refresh(db_block)
         return db_block
     
@@ -108,6 +124,7 @@ class TrainingBlockService:
         
         db.delete(db_block)
         db.commit()
+        projection_cache.invalidate(block_id)
         return True
     
     @staticmethod
@@ -156,87 +173,95 @@ class TrainingBlockService:
             rpe_tables=rpe_tables
         )
     
+    @staticmethod
+    def _projection_cache_key(block: TrainingBlock, kind: str) -> str:
+        """Hash of every block input the projections and RPE tables depend on"""
+        inputs = {
+            'version': PROJECTION_CACHE_VERSION,
+            'kind': kind,
+            'one_rms': ProjectionEngine.block_one_rms(block),
+            'strategy': block.strategy,
+            'total_weeks': block.total_weeks,
+            'params': ProjectionEngine.strategy_params(block)
+        }
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+    
     @staticmethod
     def _generate_weekly_projections(block: TrainingBlock) -> Dict[str, Dict[str, float]]:
         """Generate weekly weight projections for the block"""
-        projections = {}
-        
-        exercises = {
-            'pullups': block.rm_pullups,
-            'dips': block.rm_dips,
-            'muscleups': block.rm_muscleups,
-            'squats': block.rm_squats
-        }
+        cache_key = TrainingBlockService._projection_cache_key(block, 'projections')
+        cached = projection_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Get strategy parameters
-        strategy_params = {
-            'duration': block.duration,
-            'weekly_increment': block.weekly_increment,
-            'increment_type': block.increment_type,
-            'deload_week': block.deload_week,
-            'volume_multiplier': block.volume_multiplier,
-            'intensity_focus': block.intensity_focus,
-            'daily_variation': block.daily_variation,
-            'intensity_range': block.intensity_range,
-            'volume_cycles': block.volume_cycles,
-            'max_effort_days': block.max_effort_days,
-            'dynamic_effort_days': block.dynamic_effort_days,
-            'repetition_effort_days': block.repetition_effort_days,
-            'wave_pattern': block.wave_pattern,
-            'wave_amplitude': block.wave_amplitude,
-            'wave_frequency': block.wave_frequency
-        }
+        one_rms = ProjectionEngine.block_one_rms(block)
         
         # For now, we'll use 0 as body weight since it's not stored in the block
         # In the future, this could come from user profile
         body_weight = 0
         
-        for week in range(1, block.total_weeks + 1):
-            week_key = f"week_{week}"
-            projections[week_key] = {}
-            
-            for exercise, base_weight in exercises.items():
-                if base_weight > 0:
-                    # Calculate progression using the training calculator
-                    progression = TrainingCalculatorService.calculate_weekly_progression(
-                        base_weight, block.strategy, week, strategy_params, body_weight
-                    )
-                    
-                    # Extract working weight
-                    working_weight = progression['working_weight']
-                    if isinstance(working_weight, str) and '-' in working_weight:
-                        # For ranges, take the average
-                        min_weight, max_weight = map(float, working_weight.split('-'))
-                        working_weight = (min_weight + max_weight) / 2
-                    
-                    # For bodyweight exercises, the working weight is the base weight
-                    # The user will add their body weight during training
-                    projections[week_key][exercise] = round(working_weight, 1)
-                else:
-                    projections[week_key][exercise] = 0.0
+        # Project every week x exercise at once; ranges (DUP) are averaged.
+        # For bodyweight exercises, the working weight is the base weight
+        # The user will add their body weight during training
+        projection = ProjectionEngine.project(
+            list(one_rms.values()),
+            block.strategy,
+            block.total_weeks,
+            ProjectionEngine.strategy_params(block),
+            body_weight
+        )
         
-        return projections
+        weekly_projections = ProjectionEngine.to_weekly_projections(list(one_rms.keys()), projection)
+        projection_cache.set(cache_key, weekly_projections, tags=(block.id,))
+        return weekly_projections
     
     @staticmethod
     def _generate_rpe_tables(block: TrainingBlock) -> Dict[str, Dict[str, List[float]]]:
         """Generate RPE tables for different exercises"""
-        rpe_tables = {}
-        
-        exercises = {
-            'pullups': block.rm_pullups,
-            'dips': block.rm_dips,
-            'muscleups': block.rm_muscleups,
-            'squats': block.rm_squats
-        }
-        
-        for exercise, base_rm in exercises.items():
-            if base_rm > 0:
-                # Use the training calculator to generate RPE table
-                rpe_tables[exercise] = TrainingCalculatorService.get_rpe_table(base_rm)
-            else:
-                rpe_tables[exercise] = {}
-        
-        return rpe_tables
+        return TrainingBlockService._generate_rpe_tables_batch([block])[0]
+    
+    @staticmethod
+    def _generate_rpe_tables_batch(blocks: List[TrainingBlock]) -> List[Dict[str, Dict[str, List[float]]]]:
+        """Generate RPE tables for many blocks with one batched calculator call"""
+        results: List[Optional[Dict[str, Dict[str, List[float]]]]] = []
+        pending = []
+        
+        for index, block in enumerate(blocks):
+            cache_key = TrainingBlockService._projection_cache_key(block, 'rpe_tables')
+            cached = projection_cache.get(cache_key)
+            results.append(cached)
+            if cached is None:
+                pending.append((index, cache_key, ProjectionEngine.block_one_rms(block)))
+        
+        # Scale every established 1RM of every uncached block in a single pass
+        one_rms = [rm for _, _, rms in pending for rm in rms.values() if rm > 0]
+        tables = iter(TrainingCalculatorService.get_rpe_tables(one_rms))
+        
+        for index, cache_key, rms in pending:
+            rpe_tables = {
+                exercise: next(tables) if base_rm > 0 else {}
+                for exercise, base_rm in rms.items()
+            }
+            projection_cache.set(cache_key, rpe_tables, tags=(blocks[index].id,))
+            results[index] = rpe_tables
+        
+        return results
+    
+    @staticmethod
+    def get_rpe_tables_for_blocks(
+        db: Session,
+        user_id: int,
+        block_ids: Optional[List[int]] = None
+    ) -> Dict[int, Dict[str, Dict[str, List[float]]]]:
+        """Get RPE tables for several of a user's blocks (all of them by default)"""
+        query = db.query(TrainingBlock).filter(TrainingBlock.user_id == user_id)
+        if block_ids:
+            query = query.filter(TrainingBlock.id.in_(block_ids))
+        
+        blocks = query.order_by(TrainingBlock.id).all()
+        rpe_tables = TrainingBlockService._generate_rpe_tables_batch(blocks)
+        return {block.id: tables for block, tables in zip(blocks, rpe_tables)}
     
     @staticmethod
     def advance_week(db: Session, block_id: int, user_id: int) -> Optional[TrainingBlock]:
@@ -255,6 +280,7 @@ class TrainingBlockService:
             
             db_block.updated_at = datetime.utcnow()
             db.commit()
+            projection_cache.invalidate(block_id)
             db.refresh(db_block)
         
         return db_block
@@ -264,22 +290,27 @@ class TrainingBlockService:
         """Generate stages based on the selected strategy"""
         
         if block_data.strategy == 'linear_progression':
-            TrainingBlockService._generate_linear_progression_stages(db, block, block_data)
+            rows = TrainingBlockService._build_linear_progression_stage_rows(block_data)
         elif block_data.strategy == 'block_periodization':
-            TrainingBlockService._generate_block_periodization_stages(db, block, block_data)
+            rows = TrainingBlockService._build_block_periodization_stage_rows(block_data)
         elif block_data.strategy == 'dub_progression':
-            TrainingBlockService._generate_dup_stages(db, block, block_data)
+            rows = TrainingBlockService._build_dup_stage_rows(block_data)
         elif block_data.strategy == 'conjugate':
-            TrainingBlockService._generate_conjugate_stages(db, block, block_data)
+            rows = TrainingBlockService._build_conjugate_stage_rows(block_data)
         elif block_data.strategy == 'wave_loading':
-            TrainingBlockService._generate_wave_loading_stages(db, block, block_data)
+            rows = TrainingBlockService._build_wave_loading_stage_rows(block_data)
         else:
             # Default stages
-            TrainingBlockService._generate_default_stages(db, block, block_data)
+            rows = TrainingBlockService._build_default_stage_rows(block_data)
+        
+        # One executemany INSERT for every week instead of one ORM object each
+        if rows:
+            db.execute(insert(BlockStage), [{**row, 'block_id': block.id} for row in rows])
 
     @staticmethod
-    def _generate_linear_progression_stages(db: Session, block: TrainingBlock, block_data: TrainingBlockCreate):
-        """Generate stages for linear progression strategy"""
+    def _build_linear_progression_stage_rows(block_data: TrainingBlockCreate) -> List[Dict[str, Any]]:
+        """Build stages for linear progression strategy"""
+        rows = []
         
         for week in range(1, block_data.duration + 1):
             # Calculate load percentage based on week
@@ -299,20 +330,21 @@ class TrainingBlockService:
                 load_percentage = 60
                 phase = "Descarga"
             
-            stage = BlockStage(
-                block_id=block.id,
-                name=f"Semana {week} - {phase}",
-                week_number=week,
-                load_percentage=load_percentage,
-                volume_multiplier=0.5 if is_deload else 1.0,
-                intensity_focus="recovery" if is_deload else "strength",
-                description=f"Progresión lineal semana {week}. {phase} con {load_percentage}% de carga."
-            )
-            db.add(stage)
+            rows.append({
+                'name': f"Semana {week} - {phase}",
+                'week_number': week,
+                'load_percentage': load_percentage,
+                'volume_multiplier': 0.5 if is_deload else 1.0,
+                'intensity_focus': "recovery" if is_deload else "strength",
+                'description': f"Progresión lineal semana {week}. {phase} con {load_percentage}% de carga."
+            })
+        
+        return rows
 
     @staticmethod
-    def _generate_block_periodization_stages(db: Session, block: TrainingBlock, block_data: TrainingBlockCreate):
-        """Generate stages for block periodization strategy"""
+    def _build_block_periodization_stage_rows(block_data: TrainingBlockCreate) -> List[Dict[str, Any]]:
+        """Build stages for block periodization strategy"""
+        rows = []
         
         total_weeks = block_data.duration
         weeks_per_phase = total_weeks // 3
@@ -320,86 +352,85 @@ class TrainingBlockService:
         # Phase 1: Accumulation (Volume)
         for week in range(1, weeks_per_phase + 1):
             load_percentage = 70 + (week - 1) * 2  # 70% to 78%
-            stage = BlockStage(
-                block_id=block.id,
-                name=f"Semana {week} - Acumulación",
-                week_number=week,
-                load_percentage=load_percentage,
-                volume_multiplier=block_data.volume_multiplier or 1.5,
-                intensity_focus="volume",
-                description=f"Fase de acumulación. Volumen alto con {load_percentage}% de carga."
-            )
-            db.add(stage)
+            rows.append({
+                'name': f"Semana {week} - Acumulación",
+                'week_number': week,
+                'load_percentage': load_percentage,
+                'volume_multiplier': block_data.volume_multiplier or 1.5,
+                'intensity_focus': "volume",
+                'description': f"Fase de acumulación. Volumen alto con {load_percentage}% de carga."
+            })
         
         # Phase 2: Intensification
         for week in range(weeks_per_phase + 1, weeks_per_phase * 2 + 1):
             load_percentage = 80 + (week - weeks_per_phase - 1) * 3  # 80% to 89%
-            stage = BlockStage(
-                block_id=block.id,
-                name=f"Semana {week} - Intensificación",
-                week_number=week,
-                load_percentage=load_percentage,
-                volume_multiplier=1.0,
-                intensity_focus="intensity",
-                description=f"Fase de intensificación. Carga alta con {load_percentage}% de intensidad."
-            )
-            db.add(stage)
+            rows.append({
+                'name': f"Semana {week} - Intensificación",
+                'week_number': week,
+                'load_percentage': load_percentage,
+                'volume_multiplier': 1.0,
+                'intensity_focus': "intensity",
+                'description': f"Fase de intensificación. Carga alta con {load_percentage}% de intensidad."
+            })
         
         # Phase 3: Realization
         for week in range(weeks_per_phase * 2 + 1, total_weeks + 1):
             load_percentage = 90 + (week - weeks_per_phase * 2 - 1) * 2  # 90% to 96%
-            stage = BlockStage(
-                block_id=block.id,
-                name=f"Semana {week} - Realización",
-                week_number=week,
-                load_percentage=load_percentage,
-                volume_multiplier=0.8,
-                intensity_focus="peak",
-                description=f"Fase de realización. Pico de rendimiento con {load_percentage}% de carga."
-            )
-            db.add(stage)
+            rows.append({
+                'name': f"Semana {week} - Realización",
+                'week_number': week,
+                'load_percentage': load_percentage,
+                'volume_multiplier': 0.8,
+                'intensity_focus': "peak",
+                'description': f"Fase de realización. Pico de rendimiento con {load_percentage}% de carga."
+            })
+        
+        return rows
 
     @staticmethod
-    def _generate_dup_stages(db: Session, block: TrainingBlock, block_data: TrainingBlockCreate):
-        """Generate stages for DUP (Daily Undulating Periodization) strategy"""
+    def _build_dup_stage_rows(block_data: TrainingBlockCreate) -> List[Dict[str, Any]]:
+        """Build stages for DUP (Daily Undulating Periodization) strategy"""
+        rows = []
         
         for week in range(1, block_data.duration + 1):
             # DUP varies daily, so each week has a base load that varies by day
             base_load = 75 + (week - 1) * 2  # Progressive base load
             
-            stage = BlockStage(
-                block_id=block.id,
-                name=f"Semana {week} - DUP",
-                week_number=week,
-                load_percentage=base_load,
-                volume_multiplier=1.0,
-                intensity_focus="undulating",
-                description=f"DUP semana {week}. Carga base {base_load}% con variación diaria de intensidad y volumen."
-            )
-            db.add(stage)
+            rows.append({
+                'name': f"Semana {week} - DUP",
+                'week_number': week,
+                'load_percentage': base_load,
+                'volume_multiplier': 1.0,
+                'intensity_focus': "undulating",
+                'description': f"DUP semana {week}. Carga base {base_load}% con variación diaria de intensidad y volumen."
+            })
+        
+        return rows
 
     @staticmethod
-    def _generate_conjugate_stages(db: Session, block: TrainingBlock, block_data: TrainingBlockCreate):
-        """Generate stages for conjugate method strategy"""
+    def _build_conjugate_stage_rows(block_data: TrainingBlockCreate) -> List[Dict[str, Any]]:
+        """Build stages for conjugate method strategy"""
+        rows = []
         
         for week in range(1, block_data.duration + 1):
             # Conjugate method maintains high intensity throughout
             load_percentage = 90 + (week - 1) * 1  # 90% to 95%
             
-            stage = BlockStage(
-                block_id=block.id,
-                name=f"Semana {week} - Conjugado",
-                week_number=week,
-                load_percentage=load_percentage,
-                volume_multiplier=1.0,
-                intensity_focus="max_strength",
-                description=f"Método conjugado semana {week}. Esfuerzo máximo, dinámico y por repeticiones con {load_percentage}% de carga."
-            )
-            db.add(stage)
+            rows.append({
+                'name': f"Semana {week} - Conjugado",
+                'week_number': week,
+                'load_percentage': load_percentage,
+                'volume_multiplier': 1.0,
+                'intensity_focus': "max_strength",
+                'description': f"Método conjugado semana {week}. Esfuerzo máximo, dinámico y por repeticiones con {load_percentage}% de carga."
+            })
+        
+        return rows
 
     @staticmethod
-    def _generate_wave_loading_stages(db: Session, block: TrainingBlock, block_data: TrainingBlockCreate):
-        """Generate stages for wave loading strategy"""
+    def _build_wave_loading_stage_rows(block_data: TrainingBlockCreate) -> List[Dict[str, Any]]:
+        """Build stages for wave loading strategy"""
+        rows = []
         
         wave_pattern = getattr(block_data, 'wave_pattern', 'ascending')
         wave_amplitude = getattr(block_data, 'wave_amplitude', 10)
@@ -423,31 +454,57 @@ class TrainingBlockService:
             # Ensure load percentage is within reasonable bounds
             load_percentage = max(60, min(95, load_percentage))
             
-            stage = BlockStage(
-                block_id=block.id,
-                name=f"Semana {week} - Ondas",
-                week_number=week,
-                load_percentage=load_percentage,
-                volume_multiplier=1.0,
-                intensity_focus="wave",
-                description=f"Carga en ondas semana {week}. Patrón {wave_pattern} con {load_percentage}% de carga."
-            )
-            db.add(stage)
+            rows.append({
+                'name': f"Semana {week} - Ondas",
+                'week_number': week,
+                'load_percentage': load_percentage,
+                'volume_multiplier': 1.0,
+                'intensity_focus': "wave",
+                'description': f"Carga en ondas semana {week}. Patrón {wave_pattern} con {load_percentage}% de carga."
+            })
+        
+        return rows
 
     @staticmethod
-    def _generate_default_stages(db: Session, block: TrainingBlock, block_data: TrainingBlockCreate):
-        """Generate default stages for unknown strategies"""
+    def _build_default_stage_rows(block_data: TrainingBlockCreate) -> List[Dict[str, Any]]:
+        """Build default stages for unknown strategies"""
+        rows = []
         
         for week in range(1, block_data.duration + 1):
             load_percentage = 70 + (week / block_data.duration) * 25  # 70% to 95%
             
-            stage = BlockStage(
-                block_id=block.id,
-                name=f"Semana {week}",
-                week_number=week,
-                load_percentage=load_percentage,
-                volume_multiplier=1.0,
-                intensity_focus="general",
-                description=f"Entrenamiento general semana {week} con {load_percentage}% de carga."
-            )
-            db.add(stage) 
\ No newline at end of file
+            rows.append({
+                'name': f"Semana {week}",
+                'week_number': week,
+                'load_percentage': load_percentage,
+                'volume_multiplier': 1.0,
+                'intensity_focus': "general",
+                'description': f"Entrenamiento general semana {week} con {load_percentage}% de carga."
+            })
+        
+        return rows
+
+
+class AsyncTrainingBlockService:
+    """Read-only block overview on an AsyncSession (for async routes); stages are loaded eagerly"""
+    
+    @staticmethod
+    async def get_training_blocks(db: AsyncSession, user_id: int) -> List[TrainingBlock]:
+        """Async TrainingBlockService.get_training_blocks"""
+        result = await db.execute(
+            select(TrainingBlock)
+            .filter(TrainingBlock.user_id == user_id)
+            .options(selectinload(TrainingBlock.stages))
+        )
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def get_current_active_block(db: AsyncSession, user_id: int) -> Optional[TrainingBlock]:
+        """Async TrainingBlockService.get_current_active_block"""
+        result = await db.execute(
+            select(TrainingBlock)
+            .filter(and_(TrainingBlock.user_id == user_id, TrainingBlock.is_active == True))
+            .options(selectinload(TrainingBlock.stages))
+            .limit(1)
+        )
+        return result.scalars().first()
@@ -5,8 +5,39 @@ This service calculates training loads, reps, and RPE based on 1RM values
 and training methodology.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 import math
+import numpy as np
+
+from app.services.projection_engine import ProjectionEngine
+
+
+# RPE table layout: rows are RPE 6-10, columns are rep counts
+RPE_LEVELS = (6, 7, 8, 9, 10)
+RPE_TABLE_REPS = (1, 3, 5, 8, 10, 12, 15)
+
+
+def _build_rpe_divisors() -> np.ndarray:
+    """Brzycki divisor of 1RM for every rep count of the RPE table"""
+    reps = np.array(RPE_TABLE_REPS, dtype=float)
+    # Brzycki formula: weight = 1RM / (1 + reps/30); 1 rep is the 1RM itself
+    return np.where(reps <= 1, 1.0, 1 + reps / 30)
+
+
+def _build_rpe_factors() -> np.ndarray:
+    """Percentage (single rep) or RPE adjustment (multiple reps) per (RPE, reps) cell"""
+    rpe = np.array(RPE_LEVELS, dtype=float)[:, None]
+    reps = np.array(RPE_TABLE_REPS, dtype=float)[None, :]
+    # For 1 rep, RPE 10 = 100% 1RM, RPE 9 = 95%, etc.
+    # For multiple reps, adjust 2% per RPE level
+    return np.where(reps == 1, 100 - (10 - rpe) * 5, 1 - (10 - rpe) * 0.02)
+
+
+# Built once at import; any lift's table is these matrices scaled by its 1RM
+_RPE_REP_DIVISORS = _build_rpe_divisors()
+_RPE_FACTORS = _build_rpe_factors()
+_RPE_SINGLE_REP = np.array(RPE_TABLE_REPS) == 1
+_RPE_KEYS = [f"RPE_{rpe}" for rpe in RPE_LEVELS]
 
 
 class TrainingCalculatorService:
@@ -52,27 +83,23 @@ class TrainingCalculatorService:
     @staticmethod
     def get_rpe_table(one_rm: float) -> Dict[str, List[float]]:
         """Generate RPE table for an exercise"""
-        rpe_table = {}
+        return TrainingCalculatorService.get_rpe_tables([one_rm])[0]
+    
+    @staticmethod
+    def get_rpe_tables(one_rms: Sequence[float]) -> List[Dict[str, List[float]]]:
+        """Generate RPE tables for many exercises in a single scale operation"""
+        if len(one_rms) == 0:
+            return []
         
-        for rpe in range(6, 11):  # RPE 6-10
-            rpe_key = f"RPE_{rpe}"
-            rpe_table[rpe_key] = []
-            
-            # Calculate weights for different rep ranges
-            for reps in [1, 3, 5, 8, 10, 12, 15]:
-                if reps == 1:
-                    # For 1 rep, RPE 10 = 100% 1RM, RPE 9 = 95%, etc.
-                    percentage = 100 - (10 - rpe) * 5
-                else:
-                    # For multiple reps, adjust based on RPE
-                    base_weight = TrainingCalculatorService.calculate_weight_for_reps(one_rm, reps)
-                    rpe_adjustment = (10 - rpe) * 0.02  # 2% per RPE level
-                    percentage = (base_weight / one_rm) * (1 - rpe_adjustment) * 100
-                
-                weight = TrainingCalculatorService.calculate_working_weight(one_rm, percentage)
-                rpe_table[rpe_key].append(round(weight, 1))
+        # Same operation order as the scalar formulas so results match them exactly
+        rms = np.asarray(one_rms, dtype=float)[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rep_weights = ProjectionEngine._round(rms / _RPE_REP_DIVISORS, 1)
+            adjusted = (rep_weights / rms)[:, None, :] * _RPE_FACTORS * 100
+        percentages = np.where(_RPE_SINGLE_REP, _RPE_FACTORS, adjusted)
+        weights = ProjectionEngine._round(rms[:, :, None] * (percentages / 100), 1).tolist()
         
-        return rpe_table
+        return [dict(zip(_RPE_KEYS, table)) for table in weights]
     
     @staticmethod
     def calculate_weekly_progression(
@@ -1,18 +1,26 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, desc, select, update
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 import json
 import math
 from collections import defaultdict
 
+from app.core.pagination import apply_keyset
+from app.core.config import settings
 from app.models.user_profile import (
     UserProfile, UserInteraction, DashboardConfiguration, 
     UserExperienceLevel
 )
 from app.models.user import User
 from app.models.workout import Workout
+from app.services.dashboard_config import dashboard_configurations, ensure_dashboard_configurations
+from app.services.interaction_rollups import (
+    activity_summary, apply_rollups, rollup_counters, rollup_counters_async, usage_counters
+)
 from app.schemas.user_profile import (
+    DashboardConfiguration as DashboardConfigurationSchema,
     UserProfileCreate, UserProfileUpdate, UserInteractionCreate,
     AdaptiveDashboardResponse, UserAnalytics, LevelTransition,
     DashboardWidget, InteractionType
@@ -58,7 +66,7 @@ class UserAdaptationService:
             self.db.refresh(profile)
             
             # Initialize default dashboard configurations if not exist
-            self._ensure_dashboard_configurations_exist()
+            dashboard_configurations.ensure_loaded(self.db)
         
         return profile
     
@@ -84,17 +92,66 @@ class UserAdaptationService:
         )
         
         self.db.add(interaction)
+        apply_rollups(self.db, [{
+            "user_id": user_id,
+            "interaction_type": interaction_type,
+            "interaction_data": interaction_data,
+            "duration_seconds": duration_seconds
+        }])
         self.db.commit()
         
         # Update profile metrics based on interaction
+        # (level recalculation runs in the background, see level_recalculation)
         self._update_profile_from_interaction(profile, interaction)
         
-        # Check if level recalculation is needed
-        if self._should_recalculate_level(profile):
-            self._recalculate_user_level(profile)
-        
         return interaction
     
+    def enqueue_user_interaction(
+        self, 
+        user_id: int, 
+        interaction_type: InteractionType,
+        interaction_data: Dict[str, Any] = None,
+        duration_seconds: Optional[float] = None,
+        session_id: Optional[str] = None
+    ) -> bool:
+        """
+        Track an interaction through the buffered ingestion queue.
+        
+        Used for telemetry recorded by read endpoints. Falls back to a direct
+        write when the queue is disabled or full. Returns True if queued.
+        """
+        from app.services.interaction_ingestion import interaction_queue
+        
+        if settings.interaction_ingestion_enabled and interaction_queue.submit(
+            user_id, interaction_type, interaction_data, duration_seconds, session_id
+        ):
+            return True
+        
+        self.track_user_interaction(
+            user_id, interaction_type, interaction_data, duration_seconds, session_id
+        )
+        return False
+    
+    def get_user_interactions(
+        self,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        interaction_type: Optional[str] = None
+    ) -> List[UserInteraction]:
+        """
+        Get a page of the user's interaction history, newest first.
+        
+        Interactions are append-only and stamped by the database on insert,
+        so the id order is the created_at order and the cursor only needs the id.
+        """
+        
+        query = self.db.query(UserInteraction).filter(UserInteraction.user_id == user_id)
+        if interaction_type:
+            query = query.filter(UserInteraction.interaction_type == interaction_type)
+        
+        return apply_keyset(query, UserInteraction.id, cursor).limit(limit).all()
+    
     def get_adaptive_dashboard(self, user_id: int) -> AdaptiveDashboardResponse:
         """
         Get personalized dashboard configuration with anti-bias safeguards.
@@ -114,11 +171,23 @@ class UserAdaptationService:
         # Get base configuration for level
         config = self._get_dashboard_configuration(effective_level)
         
+        counters = rollup_counters(self.db, [user_id])[user_id]
+        return self._build_dashboard(profile, effective_level, config, counters)
+    
+    def _build_dashboard(
+        self,
+        profile: UserProfile,
+        effective_level: UserExperienceLevel,
+        config: DashboardConfigurationSchema,
+        counters: Dict[str, Dict[str, int]]
+    ) -> AdaptiveDashboardResponse:
+        """Assemble the dashboard from a loaded profile, its level's configuration and rollup counters (no queries)"""
+        
         # Generate adaptive widgets
-        widgets = self._generate_adaptive_widgets(profile, effective_level)
+        widgets = self._generate_adaptive_widgets(profile, effective_level, config)
         
         # Generate discovery hints to prevent user encasement
-        discovery_hints = self._generate_discovery_hints(profile, effective_level)
+        discovery_hints = self._generate_discovery_hints(profile, effective_level, counters)
         
         # Generate suggested actions
         suggested_actions = self._generate_suggested_actions(profile, effective_level)
@@ -173,24 +242,24 @@ class UserAdaptationService:
             UserInteraction.user_id == user_id
         ).order_by(desc(UserInteraction.created_at)).limit(20).all()
         
-        # Calculate breakdown scores
-        technical_breakdown = self._calculate_technical_experience_breakdown(profile)
-        commitment_breakdown = self._calculate_commitment_breakdown(profile)
-        sophistication_breakdown = self._calculate_sophistication_breakdown(profile)
+        # Calculate breakdown scores (page/feature counts from the rollups)
+        counters = rollup_counters(self.db, [user_id])
+        breakdown = self._calculate_score_breakdown(profile, counters)
         
         # Get level progression timeline
         progression_timeline = self._get_level_progression_timeline(user_id)
         
         # Generate recommendations
-        recommendations = self._generate_recommendations(profile)
+        recommendations = self._generate_recommendations(profile, counters[user_id])
         
         return UserAnalytics(
-            technical_experience_breakdown=technical_breakdown,
-            commitment_indicators=commitment_breakdown,
-            sophistication_metrics=sophistication_breakdown,
+            technical_experience_breakdown=breakdown["technical_experience"],
+            commitment_indicators=breakdown["training_commitment"],
+            sophistication_metrics=breakdown["needs_sophistication"],
             recent_interactions=recent_interactions,
             level_progression_timeline=progression_timeline,
-            recommendations=recommendations
+            recommendations=recommendations,
+            activity_summary=activity_summary(self.db, user_id)
         )
     
     def _recalculate_user_level(self, profile: UserProfile) -> bool:
@@ -209,11 +278,12 @@ class UserAdaptationService:
             return False
         
         old_level = profile.experience_level
+        counters = rollup_counters(self.db, [profile.user_id])[profile.user_id]
         
         # Calculate component scores
-        technical_score = self._calculate_technical_experience_score(profile)
+        technical_score = self._calculate_technical_experience_score(profile, counters)
         commitment_score = self._calculate_training_commitment_score(profile)
-        sophistication_score = self._calculate_needs_sophistication_score(profile)
+        sophistication_score = self._calculate_needs_sophistication_score(profile, counters)
         
         # Update individual scores
         profile.technical_experience_score = technical_score
@@ -232,7 +302,7 @@ class UserAdaptationService:
         
         # Apply degradation protection: don't downgrade too quickly
         if self._is_downgrade(old_level, new_level):
-            if not self._should_allow_downgrade(profile, old_level, new_level):
+            if not self._should_allow_downgrade(profile, old_level, new_level, counters):
                 new_level = old_level
         
         # Update profile
@@ -247,9 +317,15 @@ class UserAdaptationService:
         self.db.commit()
         return old_level != new_level
     
-    def _calculate_technical_experience_score(self, profile: UserProfile) -> float:
+    def _calculate_technical_experience_score(
+        self,
+        profile: UserProfile,
+        counters: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> float:
         """Calculate technical experience based on terminology, manual overrides, etc."""
         
+        _, feature_usage = self._usage_counters(profile, counters)
+        
         score = 0.0
         
         # Terminology usage (0-25 points)
@@ -261,7 +337,7 @@ class UserAdaptationService:
         score += adjustments * 1.25
         
         # Feature usage diversity (0-25 points)
-        features_used = len(profile.feature_usage_frequency)
+        features_used = len(feature_usage)
         score += min(25, features_used * 1.67)
         
         # Help requests inverse scoring (0-25 points)
@@ -294,24 +370,30 @@ class UserAdaptationService:
         
         return min(100, score)
     
-    def _calculate_needs_sophistication_score(self, profile: UserProfile) -> float:
+    def _calculate_needs_sophistication_score(
+        self,
+        profile: UserProfile,
+        counters: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> float:
         """Calculate sophistication of user needs based on what they seek and use"""
         
+        navigation_patterns, feature_usage = self._usage_counters(profile, counters)
+        
         score = 0.0
         
         # Advanced navigation patterns (0-30 points)
         advanced_sections = ["analytics", "projections", "advanced_stats", "export"]
-        advanced_usage = sum(profile.navigation_patterns.get(section, 0) for section in advanced_sections)
+        advanced_usage = sum(navigation_patterns.get(section, 0) for section in advanced_sections)
         score += min(30, advanced_usage * 2)
         
         # Complex feature usage (0-35 points)
         complex_features = ["manual_programming", "advanced_analytics", "data_export", "custom_formulas"]
-        complex_usage = sum(profile.feature_usage_frequency.get(feature, 0) for feature in complex_features)
+        complex_usage = sum(feature_usage.get(feature, 0) for feature in complex_features)
         score += min(35, complex_usage * 3.5)
         
         # Analysis depth (0-35 points)
         # Based on time spent in analysis sections
-        analysis_time = profile.navigation_patterns.get("detailed_analysis_time", 0)
+        analysis_time = navigation_patterns.get("detailed_analysis_time", 0)
         score += min(35, analysis_time / 60 * 0.58)  # 1 hour = 35 points
         
         return min(100, score)
@@ -329,7 +411,8 @@ class UserAdaptationService:
     def _generate_discovery_hints(
         self, 
         profile: UserProfile, 
-        current_level: UserExperienceLevel
+        current_level: UserExperienceLevel,
+        counters: Optional[Dict[str, Dict[str, int]]] = None
     ) -> List[str]:
         """
         Generate hints to help users discover features they might not know about.
@@ -372,7 +455,7 @@ class UserAdaptationService:
             ])
         
         # Add hints based on unused features
-        unused_features = self._identify_unused_features(profile)
+        unused_features = self._identify_unused_features(profile, counters)
         if unused_features:
             hints.append(f"🚀 New to explore: {', '.join(unused_features[:2])}")
         
@@ -381,11 +464,11 @@ class UserAdaptationService:
     def _generate_adaptive_widgets(
         self, 
         profile: UserProfile, 
-        level: UserExperienceLevel
+        level: UserExperienceLevel,
+        base_config: DashboardConfigurationSchema
     ) -> List[DashboardWidget]:
         """Generate widgets based on user level and preferences"""
         
-        base_config = self._get_dashboard_configuration(level)
         widgets = []
         
         # Core widgets that adapt based on level
@@ -438,134 +521,105 @@ class UserAdaptationService:
     def _ensure_dashboard_configurations_exist(self):
         """Ensure default dashboard configurations exist for all levels"""
         
-        default_configs = {
-            UserExperienceLevel.ABSOLUTE_BEGINNER: {
-                "visible_widgets": ["quick_start", "progress_summary"],
-                "widget_order": ["quick_start", "progress_summary"],
-                "visible_nav_items": ["dashboard", "workouts", "progress"],
-                "featured_actions": ["log_workout"],
-                "show_advanced_metrics": False,
-                "show_projections": False,
-                "show_analytics": False,
-                "enable_manual_overrides": False,
-                "suggested_features": ["track_rpe", "view_progress"],
-                "onboarding_flow": ["welcome", "first_workout", "track_progress"]
-            },
-            UserExperienceLevel.COMMITTED_BEGINNER: {
-                "visible_widgets": ["quick_start", "progress_summary", "recent_workouts"],
-                "widget_order": ["quick_start", "progress_summary", "recent_workouts"],
-                "visible_nav_items": ["dashboard", "workouts", "progress", "routines"],
-                "featured_actions": ["log_workout", "view_progress"],
-                "show_advanced_metrics": False,
-                "show_projections": True,
-                "show_analytics": False,
-                "enable_manual_overrides": False,
-                "suggested_features": ["create_routine", "set_goals"],
-                "onboarding_flow": ["routine_intro", "goal_setting"]
-            },
-            UserExperienceLevel.INTERMEDIATE: {
-                "visible_widgets": ["quick_start", "progress_summary", "recent_workouts", "projections"],
-                "widget_order": ["quick_start", "progress_summary", "projections", "recent_workouts"],
-                "visible_nav_items": ["dashboard", "workouts", "progress", "routines", "analytics"],
-                "featured_actions": ["log_workout", "view_analytics", "plan_block"],
-                "show_advanced_metrics": True,
-                "show_projections": True,
-                "show_analytics": True,
-                "enable_manual_overrides": False,
-                "suggested_features": ["training_blocks", "load_management"],
-                "onboarding_flow": ["blocks_intro", "analytics_tour"]
-            },
-            UserExperienceLevel.ADVANCED: {
-                "visible_widgets": ["quick_start", "progress_summary", "projections", "analytics", "recent_workouts"],
-                "widget_order": ["quick_start", "analytics", "projections", "progress_summary", "recent_workouts"],
-                "visible_nav_items": ["dashboard", "workouts", "progress", "routines", "analytics", "settings"],
-                "featured_actions": ["log_workout", "analyze_data", "adjust_program"],
-                "show_advanced_metrics": True,
-                "show_projections": True,
-                "show_analytics": True,
-                "enable_manual_overrides": True,
-                "suggested_features": ["auto_regulation", "advanced_programming"],
-                "onboarding_flow": ["advanced_features_tour"]
-            },
-            UserExperienceLevel.ELITE_ATHLETE: {
-                "visible_widgets": ["analytics", "projections", "progress_summary", "quick_start", "recent_workouts"],
-                "widget_order": ["analytics", "projections", "progress_summary", "quick_start", "recent_workouts"],
-                "visible_nav_items": ["dashboard", "workouts", "progress", "routines", "analytics", "settings", "export"],
-                "featured_actions": ["analyze_data", "export_data", "customize_program"],
-                "show_advanced_metrics": True,
-                "show_projections": True,
-                "show_analytics": True,
-                "enable_manual_overrides": True,
-                "suggested_features": ["api_access", "custom_formulas"],
-                "onboarding_flow": ["elite_features_tour"]
-            }
-        }
-        
-        for level, config_data in default_configs.items():
-            existing = self.db.query(DashboardConfiguration).filter(
-                DashboardConfiguration.experience_level == level
-            ).first()
-            
-            if not existing:
-                config = DashboardConfiguration(
-                    experience_level=level,
-                    **config_data
-                )
-                self.db.add(config)
-        
-        self.db.commit()
+        if ensure_dashboard_configurations(self.db):
+            dashboard_configurations.invalidate()
     
-    def _get_dashboard_configuration(self, level: UserExperienceLevel) -> DashboardConfiguration:
-        """Get dashboard configuration for experience level"""
-        
-        config = self.db.query(DashboardConfiguration).filter(
-            DashboardConfiguration.experience_level == level
-        ).first()
-        
-        if not config:
-            self._ensure_dashboard_configurations_exist()
-            config = self.db.query(DashboardConfiguration).filter(
-                DashboardConfiguration.experience_level == level
-            ).first()
+    def _get_dashboard_configuration(self, level: UserExperienceLevel) -> DashboardConfigurationSchema:
+        """Get dashboard configuration for experience level (from the shared snapshot)"""
         
-        return config
+        return dashboard_configurations.get(self.db, level)
     
     # Additional helper methods...
     def _update_profile_from_interaction(self, profile: UserProfile, interaction: UserInteraction):
         """Update profile metrics based on new interaction"""
         
-        # Update navigation patterns
-        if interaction.interaction_type == InteractionType.PAGE_VISIT:
-            page = interaction.interaction_data.get("page", "unknown")
-            profile.navigation_patterns[page] = profile.navigation_patterns.get(page, 0) + 1
+        # Re-read the counters under the row lock so concurrent writers don't lose increments
+        self.lock_profiles(self.db, [profile.user_id])
+        self.db.refresh(profile)
+        counters = self._profile_counters(profile)
+        self._apply_interaction_counters(
+            counters,
+            interaction.interaction_type,
+            interaction.interaction_data or {},
+            interaction.duration_seconds
+        )
+        
+        # Assign new values so JSON column changes are detected
+        for field, value in counters.items():
+            setattr(profile, field, value)
+        
+        profile.updated_at = datetime.utcnow()
+        self.db.commit()
+    
+    @staticmethod
+    def lock_profiles(db: Session, user_ids) -> None:
+        """
+        Lock the profile rows of user_ids until the transaction ends.
+        
+        The counters are read-modify-write (JSON maps, moving average), so
+        every writer takes the lock before reading them. A no-op UPDATE
+        locks the rows on PostgreSQL and takes the write lock on SQLite,
+        where SELECT ... FOR UPDATE does nothing.
+        """
+        db.execute(
+            update(UserProfile).where(UserProfile.user_id.in_(sorted(user_ids)))
+            .values(user_id=UserProfile.user_id)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def _profile_counters(profile: UserProfile) -> Dict[str, Any]:
+        """Copy of the interaction-driven counters of a profile"""
+        return {
+            "session_duration_avg": profile.session_duration_avg or 0.0,
+            "manual_adjustments_count": profile.manual_adjustments_count or 0,
+            "terminology_usage": dict(profile.terminology_usage or {}),
+        }
+    
+    @staticmethod
+    def _apply_interaction_counters(
+        counters: Dict[str, Any],
+        interaction_type: str,
+        interaction_data: Dict[str, Any],
+        duration_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Fold one interaction into a counters dict from _profile_counters.
         
-        # Update feature usage frequency
-        if interaction.interaction_type == InteractionType.FEATURE_USE:
-            feature = interaction.interaction_data.get("feature", "unknown")
-            profile.feature_usage_frequency[feature] = profile.feature_usage_frequency.get(feature, 0) + 1
+        Page visits and feature uses are counted by the rollups
+        (apply_rollups), not on the profile.
+        """
         
         # Update session duration
-        if interaction.duration_seconds:
-            current_avg = profile.session_duration_avg
+        if duration_seconds:
             # Simple moving average update
-            profile.session_duration_avg = (current_avg * 0.9) + (interaction.duration_seconds * 0.1)
+            counters["session_duration_avg"] = (counters["session_duration_avg"] * 0.9) + (duration_seconds * 0.1)
         
         # Track manual overrides
-        if interaction.interaction_type == InteractionType.MANUAL_OVERRIDE:
-            profile.manual_adjustments_count += 1
+        if interaction_type == InteractionType.MANUAL_OVERRIDE:
+            counters["manual_adjustments_count"] += 1
         
         # Update terminology usage
-        if "terminology" in interaction.interaction_data:
-            terms = interaction.interaction_data["terminology"]
-            for term in terms:
-                profile.terminology_usage[term] = profile.terminology_usage.get(term, 0) + 1
-        
-        profile.updated_at = datetime.utcnow()
-        self.db.commit()
+        if "terminology" in interaction_data:
+            for term in interaction_data["terminology"]:
+                counters["terminology_usage"][term] = counters["terminology_usage"].get(term, 0) + 1
+    
+    def _usage_counters(
+        self,
+        profile: UserProfile,
+        counters: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Page visit and feature use counts of a profile (counters: its rollup_counters entry, queried if omitted)"""
+        if counters is None:
+            counters = rollup_counters(self.db, [profile.user_id])[profile.user_id]
+        return usage_counters(profile, counters)
     
     def _should_recalculate_level(self, profile: UserProfile) -> bool:
         """Determine if level should be recalculated"""
         
+        if not profile.last_level_calculation:
+            return True
+        
         # Recalculate every 7 days
         days_since_last = (datetime.utcnow() - profile.last_level_calculation).days
         return days_since_last >= 7
@@ -587,7 +641,8 @@ class UserAdaptationService:
         self, 
         profile: UserProfile, 
         old_level: UserExperienceLevel, 
-        new_level: UserExperienceLevel
+        new_level: UserExperienceLevel,
+        counters: Optional[Dict[str, Dict[str, int]]] = None
     ) -> bool:
         """Determine if downgrade should be allowed (anti-bias protection)"""
         
@@ -597,8 +652,9 @@ class UserAdaptationService:
             return False
         
         # Don't downgrade if user has used advanced features recently
+        _, feature_usage = self._usage_counters(profile, counters)
         recent_advanced_usage = any(
-            count > 0 for feature, count in profile.feature_usage_frequency.items()
+            count > 0 for feature, count in feature_usage.items()
             if feature in ["manual_programming", "advanced_analytics", "custom_formulas"]
         )
         
@@ -607,7 +663,11 @@ class UserAdaptationService:
         
         return True
     
-    def _identify_unused_features(self, profile: UserProfile) -> List[str]:
+    def _identify_unused_features(
+        self,
+        profile: UserProfile,
+        counters: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> List[str]:
         """Identify features the user hasn't tried yet"""
         
         all_features = [
@@ -615,7 +675,7 @@ class UserAdaptationService:
             "data_export", "manual_programming", "auto_regulation"
         ]
         
-        used_features = set(profile.feature_usage_frequency.keys())
+        used_features = set(self._usage_counters(profile, counters)[1])
         return [f for f in all_features if f not in used_features]
     
     def _generate_suggested_actions(
@@ -691,37 +751,15 @@ class UserAdaptationService:
         
         return areas
     
-    def _calculate_technical_experience_breakdown(self, profile: UserProfile) -> Dict[str, float]:
-        """Detailed breakdown of technical experience components"""
-        
-        return {
-            "terminology_usage": min(25, len(profile.terminology_usage) * 2.5),
-            "manual_adjustments": min(25, profile.manual_adjustments_count * 1.25),
-            "feature_diversity": min(25, len(profile.feature_usage_frequency) * 1.67),
-            "help_independence": max(0, 25 - profile.help_requests.get("basic_concepts", 0) * 2.5)
-        }
-    
-    def _calculate_commitment_breakdown(self, profile: UserProfile) -> Dict[str, float]:
-        """Detailed breakdown of training commitment components"""
-        
-        return {
-            "weekly_frequency": min(30, profile.workout_frequency_7d * 4.29),
-            "monthly_consistency": min(25, profile.workout_frequency_30d * 0.83),
-            "data_quality": profile.data_quality_score * 25,
-            "session_engagement": min(20, (profile.session_duration_avg / 60) * 0.67)
-        }
-    
-    def _calculate_sophistication_breakdown(self, profile: UserProfile) -> Dict[str, float]:
-        """Detailed breakdown of needs sophistication components"""
+    def _calculate_score_breakdown(
+        self,
+        profile: UserProfile,
+        counters: Optional[Dict[int, Dict[str, Dict[str, int]]]] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Per-term breakdown of the three component scores (from the batch scorer)"""
+        from app.services.level_scoring import score_profile_breakdowns
         
-        advanced_sections = ["analytics", "projections", "advanced_stats", "export"]
-        complex_features = ["manual_programming", "advanced_analytics", "data_export", "custom_formulas"]
-        
-        return {
-            "advanced_navigation": min(30, sum(profile.navigation_patterns.get(s, 0) for s in advanced_sections) * 2),
-            "complex_features": min(35, sum(profile.feature_usage_frequency.get(f, 0) for f in complex_features) * 3.5),
-            "analysis_depth": min(35, profile.navigation_patterns.get("detailed_analysis_time", 0) / 60 * 0.58)
-        }
+        return score_profile_breakdowns([profile], counters)[0]["breakdown"]
     
     def _get_level_progression_timeline(self, user_id: int) -> List[Dict[str, Any]]:
         """Get timeline of user's level progressions"""
@@ -746,7 +784,11 @@ class UserAdaptationService:
         
         return timeline
     
-    def _generate_recommendations(self, profile: UserProfile) -> List[str]:
+    def _generate_recommendations(
+        self,
+        profile: UserProfile,
+        counters: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> List[str]:
         """Generate personalized recommendations for user improvement"""
         
         recommendations = []
@@ -762,7 +804,7 @@ class UserAdaptationService:
             recommendations.append("Explore the analytics section to understand your progress patterns")
         
         # Based on usage patterns
-        unused_features = self._identify_unused_features(profile)
+        unused_features = self._identify_unused_features(profile, counters)
         if unused_features:
             recommendations.append(f"Try exploring: {unused_features[0]}")
         
@@ -777,7 +819,7 @@ class UserAdaptationService:
     ):
         """Track level transitions for analytics"""
         
-        self.track_user_interaction(
+        self.enqueue_user_interaction(
             user_id=user_id,
             interaction_type=InteractionType.MANUAL_OVERRIDE,  # Reusing this type for system transitions
             interaction_data={
@@ -787,3 +829,49 @@ class UserAdaptationService:
                 "trigger": "automatic_calculation"
             }
         )
+
+
+class AsyncUserAdaptationService:
+    """
+    Adaptive dashboard on an AsyncSession (for async routes).
+    
+    The dashboard's reads are awaited selects; the dashboard itself is
+    assembled by UserAdaptationService._build_dashboard, which does no
+    queries. Writes (first-visit profile creation, interaction tracking)
+    reuse the sync service through AsyncSession.run_sync.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_adaptive_dashboard(self, user_id: int) -> AdaptiveDashboardResponse:
+        """Async UserAdaptationService.get_adaptive_dashboard"""
+        result = await self.db.execute(select(UserProfile).where(UserProfile.user_id == user_id))
+        profile = result.scalar_one_or_none()
+        if profile is None:
+            profile = await self.db.run_sync(
+                lambda session: UserAdaptationService(session).get_or_create_user_profile(user_id)
+            )
+        
+        effective_level = profile.manual_override_level or profile.experience_level
+        configs = await dashboard_configurations.configs_async(self.db)
+        config = configs.get(getattr(effective_level, "value", effective_level))
+        counters = (await rollup_counters_async(self.db, [user_id]))[user_id]
+        
+        # The builder never touches the session, so the sync view of it is safe here
+        return UserAdaptationService(self.db.sync_session)._build_dashboard(profile, effective_level, config, counters)
+    
+    async def enqueue_user_interaction(
+        self, 
+        user_id: int, 
+        interaction_type: InteractionType,
+        interaction_data: Dict[str, Any] = None,
+        duration_seconds: Optional[float] = None,
+        session_id: Optional[str] = None
+    ) -> bool:
+        """Async UserAdaptationService.enqueue_user_interaction (the direct-write fallback included)"""
+        return await self.db.run_sync(
+            lambda session: UserAdaptationService(session).enqueue_user_interaction(
+                user_id, interaction_type, interaction_data, duration_seconds, session_id
+            )
+        )
@@ -1,11 +1,26 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date, datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, desc, func, case, select, update
+from app.core.pagination import apply_keyset
 from app.models.workout import Workout, Exercise
 from app.models.user import User
-from app.schemas.workout import WorkoutCreate, WorkoutUpdate, ExerciseCreate, WorkoutProgress
-from app.services.rm_calculator import calculate_estimated_one_rm
+from app.schemas.workout import WorkoutCreate, WorkoutUpdate, ExerciseCreate, WorkoutProgress, WorkoutSetUpsert
+from app.services.e1rm_index import refresh_e1rm_index, workout_index_keys
+from app.services.workout_stats import exercise_totals, refresh_exercise_stats
+
+# Exercise columns written by a progress save
+SET_FIELDS = {"name", "weight", "reps", "rpe", "notes", "completed"}
+
+
+class WorkoutVersionConflict(Exception):
+    """Raised when a progress save expects an older workout version"""
+    
+    def __init__(self, current_version: int):
+        super().__init__(f"Workout was modified (current version {current_version})")
+        self.current_version = current_version
 
 
 class WorkoutService:
@@ -57,10 +72,72 @@ class WorkoutService:
         limit: int = 100,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-        day_type: Optional[str] = None
+        day_type: Optional[str] = None,
+        eager: bool = False,
+        cursor: Optional[str] = None
     ) -> List[Workout]:
-        """Get workouts for a user with optional filters"""
-        query = self.db.query(Workout).filter(Workout.user_id == user_id)
+        """Get workouts for a user with optional filters (eager loads exercises in one extra query)"""
+        query = self._filter_user_workouts(
+            self.db.query(Workout), user_id, start_date, end_date, day_type
+        )
+        
+        if eager:
+            query = query.options(selectinload(Workout.exercises))
+        
+        return self._page(query, skip, limit, cursor).all()
+    
+    def get_user_workout_summaries(
+        self, 
+        user_id: int, 
+        skip: int = 0, 
+        limit: int = 100,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        day_type: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> list:
+        """Get workout summaries with exercise and completed-set counts from a single aggregate query"""
+        query = self._summary_query(self.db.query(*self.SUMMARY_COLUMNS))
+        query = self._filter_user_workouts(query, user_id, start_date, end_date, day_type)
+        
+        return self._page(query.group_by(Workout.id), skip, limit, cursor).all()
+    
+    # Columns of a workout summary row (counts aggregated over the exercises)
+    SUMMARY_COLUMNS = (
+        Workout.id,
+        Workout.date,
+        Workout.day_type,
+        Workout.success,
+        Workout.completed,
+        func.count(Exercise.id).label("exercise_count"),
+        func.coalesce(
+            func.sum(case((Exercise.completed == True, 1), else_=0)), 0
+        ).label("total_sets")
+    )
+    
+    @staticmethod
+    def _summary_query(query):
+        """Join the exercises aggregated by SUMMARY_COLUMNS (Query or select())"""
+        return query.outerjoin(Exercise, Exercise.workout_id == Workout.id)
+    
+    @staticmethod
+    def _page(query, skip: int, limit: int, cursor: Optional[str] = None):
+        """Order by (date, id) newest first; a cursor replaces the offset"""
+        query = apply_keyset(query, Workout.id, cursor, sort_column=Workout.date)
+        if not cursor:
+            query = query.offset(skip)
+        return query.limit(limit)
+    
+    @staticmethod
+    def _filter_user_workouts(
+        query,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        day_type: Optional[str] = None
+    ):
+        """Apply the user/date/day type filters shared by the workout listings"""
+        query = query.filter(Workout.user_id == user_id)
         
         if start_date:
             query = query.filter(Workout.date >= start_date)
@@ -69,7 +146,7 @@ class WorkoutService:
         if day_type:
             query = query.filter(Workout.day_type == day_type)
         
-        return query.order_by(desc(Workout.date)).offset(skip).limit(limit).all()
+        return query
     
     def update_workout(self, workout_id: int, user_id: int, workout_data: WorkoutUpdate) -> Optional[Workout]:
         """Update a workout"""
@@ -77,107 +154,260 @@ class WorkoutService:
         if not db_workout:
             return None
         
+        # Completed sets move between e1RM/stats buckets when the date or completion changes
+        keys = workout_index_keys(db_workout) if db_workout.completed else set()
         update_data = workout_data.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_workout, field, value)
         
+        if {"date", "completed"} & update_data.keys():
+            self._refresh_set_indexes(db_workout, keys | (workout_index_keys(db_workout) if db_workout.completed else set()))
         db_workout.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(db_workout)
         return db_workout
     
-    def delete_workout(self, workout_id: int, user_id: int) -> bool:
+    def delete_workout(self, workout_id: int, user_id: int, commit: bool = True) -> bool:
         """Delete a workout"""
         db_workout = self.get_workout(workout_id, user_id)
         if not db_workout:
             return False
         
+        keys = workout_index_keys(db_workout) if db_workout.completed else set()
         self.db.delete(db_workout)
-        self.db.commit()
+        self._refresh_set_indexes(db_workout, keys)
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         return True
     
-    def get_pending_workouts(self, user_id: int) -> List[Workout]:
+    def get_pending_workouts(self, user_id: int, eager: bool = False) -> List[Workout]:
         """Get workouts that are in progress"""
-        return self.db.query(Workout).filter(
+        query = self.db.query(Workout).filter(
             and_(Workout.user_id == user_id, Workout.in_progress == True)
-        ).order_by(desc(Workout.date)).all()
+        )
+        
+        if eager:
+            query = query.options(selectinload(Workout.exercises))
+        
+        return query.order_by(desc(Workout.date)).all()
+    
+    def save_workout_progress(self, progress_data: WorkoutProgress, user_id: int, commit: bool = True) -> Workout:
+        """
+        Save workout progress as a diff of its sets in one transaction.
+        
+        Only new, changed and removed sets are written, and the workout version
+        is bumped when anything changed (optimistic concurrency through
+        expected_version). With commit=False the changes are left in the
+        caller's transaction, which also handles the rollback on errors.
+        """
+        try:
+            db_workout = self._apply_progress(progress_data, user_id)
+        except (ValueError, WorkoutVersionConflict):
+            if commit:
+                self.db.rollback()
+            raise
+        
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_workout)
+        return db_workout
+    
+    def get_workout_by_client_id(self, client_id: str, user_id: int) -> Optional[Workout]:
+        """Get a workout by the id the client assigned to it offline"""
+        return self.db.query(Workout).filter(
+            and_(Workout.client_id == client_id, Workout.user_id == user_id)
+        ).first()
     
-    def save_workout_progress(self, progress_data: WorkoutProgress, user_id: int) -> Workout:
-        """Save or update workout progress"""
+    def _apply_progress(self, progress_data: WorkoutProgress, user_id: int) -> Workout:
+        """Stage a progress save (see save_workout_progress)"""
+        db_workout = None
         if progress_data.workout_id:
-            # Update existing workout
             db_workout = self.get_workout(progress_data.workout_id, user_id)
             if not db_workout:
                 raise ValueError("Workout not found")
+        elif progress_data.client_workout_id:
+            # Replayed offline creates resolve to the workout created the first time
+            db_workout = self.get_workout_by_client_id(progress_data.client_workout_id, user_id)
+        
+        if db_workout is not None:
+            if progress_data.expected_version is not None and db_workout.version != progress_data.expected_version:
+                raise WorkoutVersionConflict(db_workout.version)
+            existing = self.db.query(Exercise).filter(Exercise.workout_id == db_workout.id).all()
         else:
-            # Create new workout
             db_workout = Workout(
                 user_id=user_id,
+                client_id=progress_data.client_workout_id,
                 date=progress_data.date,
                 day_type=progress_data.day_type,
                 in_progress=progress_data.in_progress,
-                completed=progress_data.completed
+                completed=progress_data.completed,
+                version=1
             )
             self.db.add(db_workout)
-            self.db.commit()
-            self.db.refresh(db_workout)
-        
-        # Clear existing exercises and add new ones
-        self.db.query(Exercise).filter(Exercise.workout_id == db_workout.id).delete()
+            self.db.flush()
+            existing = None
         
-        for i, exercise_data in enumerate(progress_data.exercises, 1):
-            db_exercise = Exercise(
-                workout_id=db_workout.id,
-                name=exercise_data.name,
-                weight=exercise_data.weight,
-                reps=exercise_data.reps,
-                rpe=exercise_data.rpe,
-                notes=exercise_data.notes,
-                completed=exercise_data.completed,
-                set_number=i
-            )
-            self.db.add(db_exercise)
+        names = {row.name for row in existing or []}
+        changes = self._apply_set_changes(db_workout.id, existing or [], progress_data)
         
-        self.db.commit()
-        self.db.refresh(db_workout)
+        if existing is not None and changes:
+            self._bump_version(db_workout, progress_data.expected_version)
+        if db_workout.completed and changes:
+            names |= {exercise.name for exercise in progress_data.exercises or []}
+            names |= {set_data.name for set_data in progress_data.sets if set_data.name}
+            self._refresh_set_indexes(db_workout, workout_index_keys(db_workout, names))
         return db_workout
     
-    def complete_workout(self, workout_id: int, user_id: int) -> Optional[Workout]:
-        """Mark a workout as completed"""
+    def _refresh_set_indexes(self, db_workout: Workout, keys: set) -> None:
+        """Flush and recompute the e1RM index and weekly stats buckets touched by a write to db_workout"""
+        if keys:
+            self.db.flush()
+            refresh_e1rm_index(self.db, db_workout.user_id, keys)
+            refresh_exercise_stats(self.db, db_workout.user_id, keys)
+    
+    def _bump_version(self, db_workout: Workout, expected_version: Optional[int] = None) -> None:
+        """
+        Increment the workout version in the database.
+        
+        With expected_version the UPDATE is conditional, so a concurrent save
+        since our read raises WorkoutVersionConflict.
+        """
+        bump = update(Workout).where(Workout.id == db_workout.id)
+        if expected_version is not None:
+            bump = bump.where(Workout.version == expected_version)
+        bumped = self.db.execute(
+            bump.values(version=Workout.version + 1, updated_at=datetime.utcnow()),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        if not bumped:
+            current_version = self.db.query(Workout.version).filter(Workout.id == db_workout.id).scalar()
+            raise WorkoutVersionConflict(current_version)
+        # Keep the loaded object in step without another SELECT
+        set_committed_value(db_workout, "version", db_workout.version + 1)
+    
+    def _apply_set_changes(self, workout_id: int, existing: List[Exercise], progress_data: WorkoutProgress) -> int:
+        """Stage the inserts/updates/deletes turning existing into the saved sets; returns how many rows change"""
+        by_number = {row.set_number: row for row in existing}
+        by_client_id = {row.client_set_id: row for row in existing if row.client_set_id}
+        changes = 0
+        
+        if progress_data.exercises is not None:
+            # Full set list: position i is set i, sets past the end are removed
+            for number, exercise_data in enumerate(progress_data.exercises, 1):
+                row, written = self._upsert_set(workout_id, by_number.get(number), exercise_data.dict(include=SET_FIELDS), number)
+                by_number[number] = row
+                changes += written
+            for number, row in list(by_number.items()):
+                if number > len(progress_data.exercises):
+                    self._delete_set(row, by_number, by_client_id)
+                    changes += 1
+        
+        for set_data in progress_data.sets:
+            row = self._match_set(set_data, by_number, by_client_id)
+            if set_data.deleted:
+                if row is not None:
+                    self._delete_set(row, by_number, by_client_id)
+                    changes += 1
+                continue
+            values = set_data.dict(exclude_unset=True, include=SET_FIELDS)
+            if row is None and not {"name", "weight", "reps"} <= values.keys():
+                raise ValueError(f"New set {set_data.set_number} needs name, weight and reps")
+            if row is not None and row.set_number != set_data.set_number:
+                by_number.pop(row.set_number, None)
+            row, written = self._upsert_set(workout_id, row, values, set_data.set_number, set_data.client_set_id)
+            by_number[row.set_number] = row
+            if row.client_set_id:
+                by_client_id[row.client_set_id] = row
+            changes += written
+        
+        return changes
+    
+    def _delete_set(self, row: Exercise, by_number: dict, by_client_id: dict) -> None:
+        """Stage the deletion of a stored set and drop it from the lookups"""
+        self.db.delete(row)
+        by_number.pop(row.set_number, None)
+        by_client_id.pop(row.client_set_id, None)
+    
+    @staticmethod
+    def _match_set(set_data: WorkoutSetUpsert, by_number: dict, by_client_id: dict) -> Optional[Exercise]:
+        """Stored set for an upsert: by client_set_id, else the set at set_number unless it belongs to another client id"""
+        if set_data.client_set_id and set_data.client_set_id in by_client_id:
+            return by_client_id[set_data.client_set_id]
+        row = by_number.get(set_data.set_number)
+        if row is not None and row.client_set_id and row.client_set_id != set_data.client_set_id:
+            return None
+        return row
+    
+    def _upsert_set(
+        self,
+        workout_id: int,
+        row: Optional[Exercise],
+        values: dict,
+        set_number: int,
+        client_set_id: Optional[str] = None
+    ) -> Tuple[Exercise, int]:
+        """Insert the set or update only its changed columns; returns the row and 1 when it is written"""
+        values["set_number"] = set_number
+        if client_set_id:
+            values["client_set_id"] = client_set_id
+        
+        if row is None:
+            row = Exercise(workout_id=workout_id, **values)
+            self.db.add(row)
+            return row, 1
+        
+        changed = False
+        for field, value in values.items():
+            if getattr(row, field) != value:
+                setattr(row, field, value)
+                changed = True
+        return row, int(changed)
+    
+    def complete_workout(
+        self,
+        workout_id: int,
+        user_id: int,
+        expected_version: Optional[int] = None,
+        commit: bool = True
+    ) -> Optional[Workout]:
+        """Mark a workout as completed (bumps its version)"""
         db_workout = self.get_workout(workout_id, user_id)
         if not db_workout:
             return None
         
-        db_workout.completed = True
-        db_workout.in_progress = False
-        db_workout.updated_at = datetime.utcnow()
+        if expected_version is not None and db_workout.version != expected_version:
+            raise WorkoutVersionConflict(db_workout.version)
+        if not db_workout.completed or db_workout.in_progress:
+            newly_completed = not db_workout.completed
+            db_workout.completed = True
+            db_workout.in_progress = False
+            self._bump_version(db_workout, expected_version)
+            if newly_completed:
+                self._refresh_set_indexes(db_workout, workout_index_keys(db_workout))
         
-        self.db.commit()
-        self.db.refresh(db_workout)
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_workout)
+        else:
+            self.db.flush()
         return db_workout
     
     def get_workout_stats(self, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None) -> dict:
-        """Get workout statistics for a user"""
-        query = self.db.query(Workout).filter(Workout.user_id == user_id)
+        """Get workout statistics for a user (exercise totals come from the weekly stats buckets)"""
+        query = select(
+            func.count(Workout.id),
+            func.coalesce(func.sum(case((Workout.completed == True, 1), else_=0)), 0)
+        ).where(Workout.user_id == user_id)
         
         if start_date:
-            query = query.filter(Workout.date >= start_date)
+            query = query.where(Workout.date >= start_date)
         if end_date:
-            query = query.filter(Workout.date <= end_date)
+            query = query.where(Workout.date <= end_date)
         
-        total_workouts = query.count()
-        completed_workouts = query.filter(Workout.completed == True).count()
-        
-        # Get exercise statistics
-        exercise_stats = self.db.query(
-            Exercise.name,
-            self.db.func.avg(Exercise.weight).label('avg_weight'),
-            self.db.func.max(Exercise.weight).label('max_weight'),
-            self.db.func.avg(Exercise.reps).label('avg_reps'),
-            self.db.func.count(Exercise.id).label('total_sets')
-        ).join(Workout).filter(
-            and_(Workout.user_id == user_id, Workout.completed == True)
-        ).group_by(Exercise.name).all()
+        total_workouts, completed_workouts = self.db.execute(query).one()
+        exercise_stats = exercise_totals(self.db, user_id, start_date, end_date)
         
         return {
             "total_workouts": total_workouts,
@@ -185,12 +415,39 @@ class WorkoutService:
             "completion_rate": (completed_workouts / total_workouts * 100) if total_workouts > 0 else 0,
             "exercise_stats": [
                 {
-                    "name": stat.name,
-                    "avg_weight": float(stat.avg_weight) if stat.avg_weight else 0,
-                    "max_weight": float(stat.max_weight) if stat.max_weight else 0,
-                    "avg_reps": float(stat.avg_reps) if stat.avg_reps else 0,
-                    "total_sets": stat.total_sets
+                    "name": name,
+                    "avg_weight": float(weight / sets) if sets else 0,
+                    "max_weight": float(max_weight) if max_weight else 0,
+                    "avg_reps": float(reps / sets) if sets else 0,
+                    "avg_rpe": float(rpe_total / rpe_sets) if rpe_sets else None,
+                    "total_sets": sets,
+                    "total_reps": reps,
+                    "total_volume": float(volume)
                 }
-                for stat in exercise_stats
+                for name, (sets, reps, weight, volume, max_weight, rpe_total, rpe_sets) in sorted(exercise_stats.items())
             ]
-        } 
\ No newline at end of file
+        }
+
+
+class AsyncWorkoutService:
+    """Read-only workout listings on an AsyncSession (for async routes)"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_user_workout_summaries(
+        self, 
+        user_id: int, 
+        skip: int = 0, 
+        limit: int = 100,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        day_type: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> list:
+        """Async WorkoutService.get_user_workout_summaries"""
+        query = WorkoutService._summary_query(select(*WorkoutService.SUMMARY_COLUMNS))
+        query = WorkoutService._filter_user_workouts(query, user_id, start_date, end_date, day_type)
+        
+        result = await self.db.execute(WorkoutService._page(query.group_by(Workout.id), skip, limit, cursor))
+        return result.all()
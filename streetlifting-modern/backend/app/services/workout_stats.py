@@ -0,0 +1,204 @@
+"""
+Materialized workout statistics
+
+Completed sets are pre-aggregated per (user, exercise, week) into
+exercise_weekly_stats (sets, reps, weight, volume, max weight, RPE), so the
+stats endpoints add up a few rows per exercise and week instead of grouping
+every set the user has ever logged. Date ranges are exact: the whole weeks
+inside the range come from the buckets and the partial weeks at its edges
+(at most six days each) from the raw sets.
+
+WorkoutService refreshes the (exercise, week) buckets a write touches, in
+the caller's transaction, by recomputing them from their sets (so edits and
+deletions are handled). backfill_exercise_stats() rebuilds the table.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, timedelta
+
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.workout import Exercise, ExerciseWeeklyStats, Workout
+
+# (exercise name, workout date), the same keys as the e1RM index
+StatsKey = Tuple[str, date]
+
+# Per bucket: sets, total reps, total weight, volume, max weight, RPE total, sets with RPE
+Totals = List[float]
+
+SET_COLUMNS = (
+    Workout.user_id,
+    Exercise.name,
+    Workout.date,
+    Exercise.weight,
+    Exercise.reps,
+    Exercise.rpe
+)
+
+
+def week_start(day: date) -> date:
+    """Monday of the week of day"""
+    return day - timedelta(days=day.weekday())
+
+
+def refresh_exercise_stats(db: Session, user_id: int, keys: Iterable[StatsKey]) -> None:
+    """
+    Recompute the weekly buckets of a user that contain the given
+    (exercise, day) keys. Pending changes must be flushed first; nothing is
+    committed.
+    """
+    buckets = {(name, week_start(day)) for name, day in keys if name and day}
+    if not buckets:
+        return
+    names = {name for name, _ in buckets}
+    weeks = {week for _, week in buckets}
+
+    rows = db.execute(
+        select(*SET_COLUMNS).join(Workout, Exercise.workout_id == Workout.id).where(
+            Workout.user_id == user_id,
+            Workout.completed == True,
+            Exercise.name.in_(names),
+            or_(*(Workout.date.between(week, week + timedelta(days=6)) for week in weeks))
+        )
+    ).all()
+    weekly = {key: totals for key, totals in _fold_weeks(rows).items() if key[1:] in buckets}
+
+    db.execute(
+        delete(ExerciseWeeklyStats).where(
+            ExerciseWeeklyStats.user_id == user_id,
+            or_(*(
+                and_(ExerciseWeeklyStats.exercise == name, ExerciseWeeklyStats.week_start == week)
+                for name, week in buckets
+            ))
+        ).execution_options(synchronize_session=False)
+    )
+    if weekly:
+        db.execute(insert(ExerciseWeeklyStats), _week_rows(weekly))
+
+
+def _fold_weeks(rows: Iterable, into: Optional[Dict] = None) -> Dict[Tuple[int, str, date], Totals]:
+    """Fold set rows (SET_COLUMNS) into {(user, exercise, week_start): totals}"""
+    into = {} if into is None else into
+    for user_id, name, day, weight, reps, rpe in rows:
+        key = (user_id, name, week_start(day))
+        totals = into.get(key)
+        if totals is None:
+            totals = into[key] = [0, 0, 0.0, 0.0, 0.0, 0.0, 0]
+        totals[0] += 1
+        totals[1] += reps
+        totals[2] += weight
+        totals[3] += weight * reps
+        totals[4] = max(totals[4], weight)
+        if rpe is not None:
+            totals[5] += rpe
+            totals[6] += 1
+    return into
+
+
+def _week_rows(weekly: Dict[Tuple[int, str, date], Totals]) -> List[dict]:
+    """exercise_weekly_stats rows for the folded buckets"""
+    return [
+        {
+            "user_id": user_id, "exercise": name, "week_start": week,
+            "sets": sets, "total_reps": reps, "total_weight": weight, "volume": volume,
+            "max_weight": max_weight, "rpe_total": rpe_total, "rpe_sets": rpe_sets
+        }
+        for (user_id, name, week), (sets, reps, weight, volume, max_weight, rpe_total, rpe_sets) in weekly.items()
+    ]
+
+
+def exercise_totals(
+    db: Session,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Dict[str, Totals]:
+    """Totals per exercise of the completed sets between start_date and end_date (inclusive)"""
+    # Whole weeks in the range: [first_week, end_week) by week_start
+    first_week = None if start_date is None else week_start(start_date + timedelta(days=6))
+    end_week = None if end_date is None else week_start(end_date + timedelta(days=1))
+    if first_week is not None and end_week is not None and first_week >= end_week:
+        return _raw_totals(db, user_id, start_date, end_date)
+
+    totals = _bucket_totals(db, user_id, first_week, end_week)
+    if start_date is not None and start_date < first_week:
+        _merge(totals, _raw_totals(db, user_id, start_date, first_week - timedelta(days=1)))
+    if end_date is not None and end_week <= end_date:
+        _merge(totals, _raw_totals(db, user_id, end_week, end_date))
+    return totals
+
+
+def _bucket_totals(db: Session, user_id: int, first_week: Optional[date], end_week: Optional[date]) -> Dict[str, Totals]:
+    """Sum of the weekly buckets with first_week <= week_start < end_week"""
+    query = select(
+        ExerciseWeeklyStats.exercise,
+        func.sum(ExerciseWeeklyStats.sets),
+        func.sum(ExerciseWeeklyStats.total_reps),
+        func.sum(ExerciseWeeklyStats.total_weight),
+        func.sum(ExerciseWeeklyStats.volume),
+        func.max(ExerciseWeeklyStats.max_weight),
+        func.sum(ExerciseWeeklyStats.rpe_total),
+        func.sum(ExerciseWeeklyStats.rpe_sets)
+    ).where(ExerciseWeeklyStats.user_id == user_id)
+    if first_week is not None:
+        query = query.where(ExerciseWeeklyStats.week_start >= first_week)
+    if end_week is not None:
+        query = query.where(ExerciseWeeklyStats.week_start < end_week)
+    return {row[0]: list(row[1:]) for row in db.execute(query.group_by(ExerciseWeeklyStats.exercise))}
+
+
+def _raw_totals(db: Session, user_id: int, start_date: Optional[date], end_date: Optional[date]) -> Dict[str, Totals]:
+    """Totals straight from the completed sets of a (short) date range"""
+    query = select(
+        Exercise.name,
+        func.count(Exercise.id),
+        func.sum(Exercise.reps),
+        func.sum(Exercise.weight),
+        func.sum(Exercise.weight * Exercise.reps),
+        func.max(Exercise.weight),
+        func.coalesce(func.sum(Exercise.rpe), 0),
+        func.count(Exercise.rpe)
+    ).join(Workout, Exercise.workout_id == Workout.id).where(
+        Workout.user_id == user_id,
+        Workout.completed == True
+    )
+    if start_date is not None:
+        query = query.where(Workout.date >= start_date)
+    if end_date is not None:
+        query = query.where(Workout.date <= end_date)
+    return {row[0]: list(row[1:]) for row in db.execute(query.group_by(Exercise.name))}
+
+
+def _merge(into: Dict[str, Totals], other: Dict[str, Totals]) -> None:
+    """Add the totals of other into into (max weight is maxed)"""
+    for name, totals in other.items():
+        current = into.get(name)
+        if current is None:
+            into[name] = totals
+            continue
+        for i, value in enumerate(totals):
+            current[i] = max(current[i], value) if i == 4 else current[i] + value
+
+
+def backfill_exercise_stats(db: Session, chunk_size: int = 10000) -> int:
+    """Rebuild every weekly bucket from completed workouts and commit; returns the sets read"""
+    db.execute(delete(ExerciseWeeklyStats))
+
+    weekly: Dict[Tuple[int, str, date], Totals] = {}
+    read = 0
+    result = db.execute(
+        select(*SET_COLUMNS).join(Workout, Exercise.workout_id == Workout.id)
+        .where(Workout.completed == True)
+        .execution_options(yield_per=chunk_size)
+    )
+    for chunk in result.partitions(chunk_size):
+        _fold_weeks(chunk, into=weekly)
+        read += len(chunk)
+
+    rows = _week_rows(weekly)
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(ExerciseWeeklyStats), rows[start:start + chunk_size])
+
+    db.commit()
+    return read
@@ -0,0 +1,186 @@
+"""
+Offline sync of queued workout mutations
+
+The PWA queues create/upsert/complete/delete calls while offline and sends
+them as one ordered batch when it reconnects. The batch is applied in a
+single transaction: each operation runs in its own SAVEPOINT, so a failed
+one (stale version, unknown workout) is rolled back and reported without
+discarding the others. Applied operations are recorded under their
+idempotency key, and a replayed key returns the recorded result instead of
+being applied twice.
+"""
+
+from typing import Any, Dict, Optional
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.workout import Workout, WorkoutSyncMutation
+from app.schemas.workout import WorkoutProgress, WorkoutSyncOperation, WorkoutSyncRequest
+from app.services.workout import WorkoutService, WorkoutVersionConflict
+
+
+class WorkoutSyncService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.workouts = WorkoutService(db)
+
+    def apply_batch(self, batch: WorkoutSyncRequest, user_id: int) -> Dict[str, Any]:
+        """Apply the operations in order and commit once; returns the per-operation results"""
+        keys = [operation.idempotency_key for operation in batch.operations]
+        recorded = {
+            row.idempotency_key: row.result
+            for row in self.db.execute(
+                select(WorkoutSyncMutation.idempotency_key, WorkoutSyncMutation.result).where(
+                    WorkoutSyncMutation.user_id == user_id,
+                    WorkoutSyncMutation.idempotency_key.in_(keys)
+                )
+            )
+        } if keys else {}
+
+        results = []
+        for operation in batch.operations:
+            if operation.idempotency_key in recorded:
+                results.append({**recorded[operation.idempotency_key], "status": "duplicate"})
+                continue
+            result = self._apply_operation(operation, user_id)
+            if result["status"] == "applied":
+                recorded[operation.idempotency_key] = result
+            results.append(result)
+
+        self.db.commit()
+        return {
+            "results": results,
+            "applied": sum(1 for result in results if result["status"] == "applied"),
+            "duplicates": sum(1 for result in results if result["status"] == "duplicate"),
+            "failed": sum(1 for result in results if result["status"] not in ("applied", "duplicate"))
+        }
+
+    def _apply_operation(self, operation: WorkoutSyncOperation, user_id: int) -> Dict[str, Any]:
+        """Run one operation and record its key inside a SAVEPOINT"""
+        result = {
+            "idempotency_key": operation.idempotency_key,
+            "op": operation.op,
+            "workout_id": operation.workout_id,
+            "client_workout_id": operation.client_workout_id
+        }
+        try:
+            with self.db.begin_nested():
+                # Identify the target up front so failed results carry both ids
+                workout = self._find(operation, user_id)
+                if workout is not None:
+                    result.update(workout_id=workout.id, client_workout_id=workout.client_id)
+                elif operation.op != "create_workout":
+                    raise LookupError("Workout not found")
+
+                result.update(self._run(operation, user_id, workout))
+                self.db.add(WorkoutSyncMutation(
+                    user_id=user_id,
+                    idempotency_key=operation.idempotency_key,
+                    op=operation.op,
+                    result={**result, "status": "applied"}
+                ))
+                self.db.flush()
+        except WorkoutVersionConflict as e:
+            return {**result, "status": "conflict", "version": e.current_version, "detail": str(e)}
+        except LookupError as e:
+            return {**result, "status": "not_found", "detail": str(e)}
+        except ValueError as e:
+            return {**result, "status": "invalid", "detail": str(e)}
+        except IntegrityError as e:
+            constraint = _violated_constraint(e)
+            if "uq_workout_sync_mutations_key" in constraint or "workout_sync_mutations.idempotency_key" in constraint:
+                # Same key applied by a concurrent sync request: report what it recorded
+                recorded = self.db.execute(
+                    select(WorkoutSyncMutation.result).where(
+                        WorkoutSyncMutation.user_id == user_id,
+                        WorkoutSyncMutation.idempotency_key == operation.idempotency_key
+                    )
+                ).scalar()
+                return {**(recorded or result), "status": "duplicate"}
+            if "ix_workouts_user_client_id" in constraint or "workouts.client_id" in constraint:
+                # Same client id created by a concurrent sync request
+                return {**result, "status": "conflict", "detail": "client_workout_id is already used by another workout"}
+            return {**result, "status": "invalid", "detail": "Operation violates a database constraint"}
+        return {**result, "status": "applied"}
+
+    def _run(self, operation: WorkoutSyncOperation, user_id: int, workout: Optional[Workout]) -> Dict[str, Any]:
+        """Dispatch to the WorkoutService write for operation.op (uncommitted; workout is its resolved target)"""
+        if operation.op == "create_workout":
+            if operation.date is None or not operation.day_type:
+                raise ValueError("create_workout needs date and day_type")
+            workout = self.workouts.save_workout_progress(
+                WorkoutProgress(
+                    client_workout_id=operation.client_workout_id,
+                    expected_version=operation.expected_version,
+                    date=operation.date,
+                    day_type=operation.day_type,
+                    exercises=operation.exercises,
+                    sets=operation.sets
+                ),
+                user_id,
+                commit=False
+            )
+            if operation.notes is not None:
+                workout.notes = operation.notes
+            return self._describe(workout)
+
+        if operation.op == "upsert_sets":
+            workout = self.workouts.save_workout_progress(
+                WorkoutProgress(
+                    workout_id=workout.id,
+                    expected_version=operation.expected_version,
+                    date=workout.date,
+                    day_type=workout.day_type,
+                    exercises=operation.exercises,
+                    sets=operation.sets
+                ),
+                user_id,
+                commit=False
+            )
+        elif operation.op == "complete":
+            workout = self.workouts.complete_workout(
+                workout.id, user_id, expected_version=operation.expected_version, commit=False
+            )
+        else:
+            if operation.expected_version is not None and workout.version != operation.expected_version:
+                raise WorkoutVersionConflict(workout.version)
+            described = self._describe(workout)
+            self.workouts.delete_workout(workout.id, user_id, commit=False)
+            return {**described, "version": None}
+        return self._describe(workout)
+
+    def _find(self, operation: WorkoutSyncOperation, user_id: int) -> Optional[Workout]:
+        """Workout an operation targets, by server id or by client id (None if it doesn't exist yet)"""
+        if operation.workout_id:
+            return self.workouts.get_workout(operation.workout_id, user_id)
+        if operation.client_workout_id:
+            return self.workouts.get_workout_by_client_id(operation.client_workout_id, user_id)
+        return None
+
+    @staticmethod
+    def _describe(workout: Workout) -> Dict[str, Any]:
+        """Result fields identifying the workout after an operation"""
+        return {"workout_id": workout.id, "client_workout_id": workout.client_id, "version": workout.version}
+
+
+def _violated_constraint(error: IntegrityError) -> str:
+    """Name of the constraint behind an IntegrityError (PostgreSQL), else the driver message (SQLite names the columns)"""
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) or str(error.orig)
+
+
+def prune_sync_mutations(db: Session, now: Optional[datetime] = None) -> int:
+    """Forget idempotency keys older than workout_sync_key_retention_days and commit; returns rows deleted"""
+    if settings.workout_sync_key_retention_days <= 0:
+        return 0
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.workout_sync_key_retention_days)
+    result = db.execute(
+        delete(WorkoutSyncMutation).where(WorkoutSyncMutation.created_at < cutoff)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
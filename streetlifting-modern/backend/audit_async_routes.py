@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Audit of blocking work in async routes.
+
+FastAPI runs `def` routes on its threadpool but `async def` routes on the
+event loop, so a synchronous SQLAlchemy session used from an async route
+blocks every other request. This lists every async route whose body
+receives a database session and exits with status 1 unless the route is
+known to offload its session work itself.
+
+Usage:
+    python audit_async_routes.py
+"""
+
+import inspect
+import sys
+
+from fastapi.routing import APIRoute
+
+from main import app
+from app.core.database import get_db
+
+# Async routes that run their session calls through run_in_threadpool and
+# bcrypt on the password hashing pool (app/api/v1/auth.py)
+OFFLOADED_ROUTES = {
+    "/api/v1/auth/register",
+    "/api/v1/auth/login",
+}
+
+
+def uses_session(dependant) -> bool:
+    """
+    Whether the endpoint itself receives a session from get_db.
+
+    Sync dependencies (e.g. get_current_user) already run on the threadpool,
+    so only a session handed to the async endpoint body counts.
+    """
+    return any(dependency.call is get_db for dependency in dependant.dependencies)
+
+
+def main():
+    print("🔍 Auditing async routes for blocking database sessions")
+    print("=" * 60)
+
+    blocking = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not inspect.iscoroutinefunction(route.endpoint):
+            continue
+        if not uses_session(route.dependant):
+            print(f"✅ {route.path} (no session)")
+        elif route.path in OFFLOADED_ROUTES:
+            print(f"✅ {route.path} (offloads session work)")
+        else:
+            print(f"❌ {route.path} uses a blocking session on the event loop")
+            blocking.append(route.path)
+
+    print("=" * 60)
+    if blocking:
+        print(f"❌ {len(blocking)} async routes block the event loop: make them `def` or offload the calls")
+        return 1
+
+    print("✅ No async route blocks the event loop on the database")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Load benchmark of the hot read paths: sync services vs their async variants.
+
+Seeds a throwaway database (or uses --database-url), mounts each read path
+twice on a bare FastAPI app - a `def` route on a sync Session (run on the
+threadpool) and an `async def` route on an AsyncSession - and drives both
+with the same number of concurrent in-process clients. Authentication is
+left out so only the data access differs.
+
+Usage:
+    python benchmark_async_reads.py                        # throwaway SQLite DB
+    python benchmark_async_reads.py --clients 100 --requests 4000
+    python benchmark_async_reads.py --database-url postgresql://user:pw@localhost/bench
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.base import Base
+from app.core.database import create_async_database_engine
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.models.training import TrainingBlock, BlockStage, OneRepMax
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.workout import Workout, Exercise
+from app.schemas.training import OneRepMax as OneRepMaxSchema
+from app.schemas.training_block import TrainingBlock as TrainingBlockSchema
+from app.schemas.user_profile import AdaptiveDashboardResponse
+from app.schemas.workout import WorkoutSummary
+from app.services.training import TrainingService, AsyncTrainingService
+from app.services.training_block import TrainingBlockService, AsyncTrainingBlockService
+from app.services.user_adaptation import UserAdaptationService, AsyncUserAdaptationService
+from app.services.workout import WorkoutService, AsyncWorkoutService
+
+PATHS = ["workouts", "one-rep-maxes", "blocks", "dashboard"]
+
+
+def seed(engine, users: int, workouts_per_user: int) -> None:
+    """Users with workouts (3 sets each), 1RMs, one active block and a profile"""
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    start = date(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": user_id, "username": f"bench{user_id}", "email": f"bench{user_id}@example.com", "hashed_password": "x"}
+            for user_id in range(1, users + 1)
+        ])
+        conn.execute(insert(UserProfile), [
+            {"user_id": user_id, "experience_level": "absolute_beginner"} for user_id in range(1, users + 1)
+        ])
+        conn.execute(insert(Workout), [
+            {
+                "id": (user_id - 1) * workouts_per_user + index + 1,
+                "user_id": user_id,
+                "date": start + timedelta(days=index),
+                "day_type": rng.choice(["pull", "push", "legs"]),
+                "completed": True
+            }
+            for user_id in range(1, users + 1) for index in range(workouts_per_user)
+        ])
+        conn.execute(insert(Exercise), [
+            {"workout_id": workout_id, "name": "pullups", "weight": 20.0, "reps": 5, "completed": True, "set_number": set_number}
+            for workout_id in range(1, users * workouts_per_user + 1) for set_number in range(1, 4)
+        ])
+        conn.execute(insert(OneRepMax), [
+            {"user_id": user_id, "exercise": exercise, "one_rm": 40.0 + index, "date_achieved": start + timedelta(days=index * 7)}
+            for user_id in range(1, users + 1)
+            for exercise in ["pullups", "dips", "muscleups", "squats"]
+            for index in range(10)
+        ])
+        conn.execute(insert(TrainingBlock), [
+            {
+                "id": user_id, "user_id": user_id, "name": "Bench block", "duration": 12, "total_weeks": 12,
+                "current_stage": "strength", "start_date": start, "end_date": start + timedelta(weeks=12),
+                "current_week": 1, "rm_pullups": 40.0, "rm_dips": 50.0, "rm_muscleups": 10.0, "rm_squats": 100.0,
+                "is_active": True
+            }
+            for user_id in range(1, users + 1)
+        ])
+        conn.execute(insert(BlockStage), [
+            {"block_id": user_id, "name": f"Week {week}", "week_number": week, "load_percentage": 70.0 + week * 5}
+            for user_id in range(1, users + 1) for week in range(1, 5)
+        ])
+
+
+def build_app(session_factory, async_session_factory) -> FastAPI:
+    """Each read path as /sync/... (def + Session) and /async/... (async def + AsyncSession)"""
+    bench = FastAPI()
+
+    def get_session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_session():
+        async with async_session_factory() as session:
+            yield session
+
+    @bench.get("/sync/workouts/{user_id}", response_model=List[WorkoutSummary])
+    def sync_workouts(user_id: int, db: Session = Depends(get_session)):
+        return WorkoutService(db).get_user_workout_summaries(user_id, limit=50)
+
+    @bench.get("/async/workouts/{user_id}", response_model=List[WorkoutSummary])
+    async def async_workouts(user_id: int, db: AsyncSession = Depends(get_async_session)):
+        return await AsyncWorkoutService(db).get_user_workout_summaries(user_id, limit=50)
+
+    @bench.get("/sync/one-rep-maxes/{user_id}", response_model=List[OneRepMaxSchema])
+    def sync_one_rep_maxes(user_id: int, db: Session = Depends(get_session)):
+        return TrainingService.get_one_rep_maxes(db, user_id)
+
+    @bench.get("/async/one-rep-maxes/{user_id}", response_model=List[OneRepMaxSchema])
+    async def async_one_rep_maxes(user_id: int, db: AsyncSession = Depends(get_async_session)):
+        return await AsyncTrainingService.get_one_rep_maxes(db, user_id)
+
+    @bench.get("/sync/blocks/{user_id}", response_model=List[TrainingBlockSchema])
+    def sync_blocks(user_id: int, db: Session = Depends(get_session)):
+        return TrainingBlockService.get_training_blocks(db, user_id)
+
+    @bench.get("/async/blocks/{user_id}", response_model=List[TrainingBlockSchema])
+    async def async_blocks(user_id: int, db: AsyncSession = Depends(get_async_session)):
+        return await AsyncTrainingBlockService.get_training_blocks(db, user_id)
+
+    @bench.get("/sync/dashboard/{user_id}", response_model=AdaptiveDashboardResponse)
+    def sync_dashboard(user_id: int, db: Session = Depends(get_session)):
+        return UserAdaptationService(db).get_adaptive_dashboard(user_id)
+
+    @bench.get("/async/dashboard/{user_id}", response_model=AdaptiveDashboardResponse)
+    async def async_dashboard(user_id: int, db: AsyncSession = Depends(get_async_session)):
+        return await AsyncUserAdaptationService(db).get_adaptive_dashboard(user_id)
+
+    return bench
+
+
+async def drive(bench: FastAPI, prefix: str, path: str, clients: int, requests: int, users: int):
+    """Send requests from clients concurrent workers; returns (req/s, p50 ms, p95 ms, errors)"""
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=bench), base_url="http://bench") as client:
+        async def worker():
+            nonlocal errors
+            for index in remaining:
+                started = time.perf_counter()
+                response = await client.get(f"/{prefix}/{path}/{index % users + 1}")
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return (
+        requests / elapsed,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        errors
+    )
+
+
+async def run(args, database_url: str) -> int:
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    async_engine = create_async_database_engine(database_url)
+    if args.seed:
+        seed(engine, args.users, args.workouts)
+
+    bench = build_app(
+        sessionmaker(autocommit=False, autoflush=False, bind=engine),
+        async_sessionmaker(async_engine, expire_on_commit=False)
+    )
+
+    print(f"🏋️  {args.requests} requests per path, {args.clients} concurrent clients")
+    print("=" * 72)
+    print(f"{'path':<16}{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}{'speedup':>10}")
+
+    failed = False
+    for path in PATHS:
+        results = {}
+        for prefix in ("sync", "async"):
+            # Warm up pools, caches and the dashboard configuration snapshot
+            await drive(bench, prefix, path, 4, 20, args.users)
+            results[prefix] = await drive(bench, prefix, path, args.clients, args.requests, args.users)
+        for prefix in ("sync", "async"):
+            rate, p50, p95, errors = results[prefix]
+            speedup = f"{rate / results['sync'][0]:.2f}x" if prefix == "async" else ""
+            print(f"{path:<16}{prefix:<8}{rate:>10.1f}{p50:>10.1f}{p95:>10.1f}{errors:>8}{speedup:>10}")
+            failed = failed or errors > 0
+
+    print("=" * 72)
+    await async_engine.dispose()
+    engine.dispose()
+
+    if failed:
+        print("❌ Some requests failed")
+        return 1
+    print("✅ Benchmark completed")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Existing database to read (seeded unless --no-seed)")
+    parser.add_argument("--no-seed", dest="seed", action="store_false", help="Do not seed --database-url")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per path and mode")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--workouts", type=int, default=200, help="Workouts per user")
+    args = parser.parse_args()
+
+    if args.database_url:
+        return asyncio.run(run(args, args.database_url))
+
+    with tempfile.TemporaryDirectory() as directory:
+        args.seed = True
+        return asyncio.run(run(args, f"sqlite:///{os.path.join(directory, 'bench.db')}"))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the vectorized level scorer against the per-profile scorers.
+
+Builds synthetic profiles in memory (no database), scores them with
+UserAdaptationService._calculate_*_score / _score_to_level one by one and
+with app.services.level_scoring in one batch, checks that both agree and
+prints the timings.
+
+Usage:
+    python benchmark_level_scoring.py                 # 100k profiles
+    python benchmark_level_scoring.py --profiles 20000 --seed 7
+"""
+
+import argparse
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from app.services.user_adaptation import UserAdaptationService
+from app.services.level_scoring import (
+    profile_feature_matrix, score_feature_matrix, scores_to_levels, score_profile_breakdowns
+)
+
+FEATURES = [
+    "manual_programming", "advanced_analytics", "data_export", "custom_formulas",
+    "projections", "analytics", "custom_routines", "training_blocks", "auto_regulation"
+]
+PAGES = ["dashboard", "workouts", "analytics", "projections", "advanced_stats", "export", "detailed_analysis_time"]
+TERMS = ["rpe", "e1rm", "deload", "amrap", "training_max", "periodization", "volume", "intensity"]
+
+
+def synthetic_profile(rng: random.Random) -> SimpleNamespace:
+    """A profile with random interaction counters"""
+    return SimpleNamespace(
+        terminology_usage={term: rng.randint(1, 5) for term in rng.sample(TERMS, rng.randint(0, len(TERMS)))},
+        manual_adjustments_count=rng.randint(0, 40),
+        feature_usage_frequency={feature: rng.randint(0, 20) for feature in rng.sample(FEATURES, rng.randint(0, len(FEATURES)))},
+        help_requests={"basic_concepts": rng.randint(0, 15)} if rng.random() < 0.5 else {},
+        workout_frequency_7d=rng.uniform(0, 10),
+        workout_frequency_30d=rng.uniform(0, 40),
+        data_quality_score=rng.random(),
+        session_duration_avg=rng.uniform(0, 5400),
+        navigation_patterns={page: rng.randint(0, 4000) for page in rng.sample(PAGES, rng.randint(0, len(PAGES)))}
+    )
+
+
+def score_one_by_one(service: UserAdaptationService, profiles):
+    """Baseline: the per-profile scorers"""
+    results = []
+    for profile in profiles:
+        # The synthetic counts live in the legacy profile maps, so there are no rollup counters
+        technical = service._calculate_technical_experience_score(profile, {})
+        commitment = service._calculate_training_commitment_score(profile)
+        sophistication = service._calculate_needs_sophistication_score(profile, {})
+        composite = (
+            technical * service.SCORING_WEIGHTS["technical_experience"] +
+            commitment * service.SCORING_WEIGHTS["training_commitment"] +
+            sophistication * service.SCORING_WEIGHTS["needs_sophistication"]
+        )
+        results.append((technical, commitment, sophistication, composite, service._score_to_level(composite)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=100_000, help="Number of synthetic profiles")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    profiles = [synthetic_profile(rng) for _ in range(args.profiles)]
+    service = UserAdaptationService(db=None)
+
+    print(f"🏋️  Scoring {len(profiles):,} synthetic profiles")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    baseline = score_one_by_one(service, profiles)
+    baseline_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matrix = profile_feature_matrix(profiles)
+    extract_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scores = score_feature_matrix(matrix)
+    levels = scores_to_levels(scores)
+    score_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    score_profile_breakdowns(profiles)
+    breakdown_s = time.perf_counter() - started
+
+    mismatches = sum(
+        1 for row, expected in enumerate(baseline)
+        if expected != (
+            scores["technical_experience_score"][row],
+            scores["training_commitment_score"][row],
+            scores["needs_sophistication_score"][row],
+            scores["composite_score"][row],
+            levels[row]
+        )
+    )
+
+    batch_s = extract_s + score_s
+    print(f"Per-profile scorers:        {baseline_s * 1000:10.1f} ms")
+    print(f"Batch: feature matrix       {extract_s * 1000:10.1f} ms")
+    print(f"Batch: scores + levels      {score_s * 1000:10.1f} ms")
+    print(f"Batch total                 {batch_s * 1000:10.1f} ms  ({baseline_s / batch_s:.1f}x)")
+    print(f"Batch incl. breakdowns      {breakdown_s * 1000:10.1f} ms")
+    print("=" * 60)
+
+    if mismatches:
+        print(f"❌ {mismatches} profiles scored differently by the batch scorer")
+        return 1
+
+    print("✅ Batch scores match the per-profile scorers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
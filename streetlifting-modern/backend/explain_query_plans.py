@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Query plan audit for the hot per-user service queries.
+
+Every lookup below is run through its service, the SQL it emits is captured
+and its plan is checked with EXPLAIN QUERY PLAN (SQLite) or EXPLAIN
+(PostgreSQL, with sequential scans disabled so a missing index shows up as
+a "Seq Scan" even on small tables). Exits with status 1 when any query
+falls back to a full table scan.
+
+Usage:
+    python explain_query_plans.py                      # throwaway SQLite DB built from the models
+    python explain_query_plans.py --database-url URL   # existing database (checks its migrations)
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from datetime import date, datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, Session
+
+from app.core.base import Base
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.models.training import PlannedWorkout, TrainingProgram  # noqa: F401
+from app.services.rm_calculator import RMCalculatorService
+from app.services.training import TrainingService
+from app.services.workout import WorkoutService
+from app.services.training_block import TrainingBlockService
+from app.services.auto_program_generator import AutoProgramGeneratorService
+from app.services.user_adaptation import UserAdaptationService
+from app.services.level_recalculation import due_profiles_query
+from app.services.interaction_rollups import activity_summary, rollup_counters
+from app.services.e1rm_index import refresh_e1rm_index
+from app.services.workout_stats import refresh_exercise_stats
+
+USER_ID = 1
+EXERCISE = "pullups"
+
+# (name, call) - read-only lookups that run on every screen of the app
+SERVICE_QUERIES: List[Tuple[str, Callable[[Session], object]]] = [
+    ("RMCalculatorService.get_latest_one_rm",
+     lambda db: RMCalculatorService(db).get_latest_one_rm(USER_ID, EXERCISE)),
+    ("RMCalculatorService.calculate_from_recent_workouts",
+     lambda db: RMCalculatorService(db).calculate_from_recent_workouts(USER_ID, EXERCISE)),
+    ("RMCalculatorService.get_best_estimated_one_rm",
+     lambda db: RMCalculatorService(db).get_best_estimated_one_rm(USER_ID, EXERCISE)),
+    ("RMCalculatorService.get_progress_data",
+     lambda db: RMCalculatorService(db).get_progress_data(USER_ID, EXERCISE)),
+    ("RMCalculatorService.get_exercise_history",
+     lambda db: RMCalculatorService(db).get_exercise_history(USER_ID, EXERCISE)),
+    ("TrainingService.get_one_rep_maxes",
+     lambda db: TrainingService.get_one_rep_maxes(db, USER_ID)),
+    ("WorkoutService.get_user_workouts",
+     lambda db: WorkoutService(db).get_user_workouts(USER_ID)),
+    ("WorkoutService.get_pending_workouts",
+     lambda db: WorkoutService(db).get_pending_workouts(USER_ID)),
+    ("WorkoutService.get_workout_stats",
+     lambda db: WorkoutService(db).get_workout_stats(USER_ID)),
+    ("WorkoutService.get_workout_stats (date range)",
+     lambda db: WorkoutService(db).get_workout_stats(USER_ID, date(2024, 1, 3), date(2024, 3, 20))),
+    ("TrainingBlockService.get_training_blocks",
+     lambda db: TrainingBlockService.get_training_blocks(db, USER_ID)),
+    ("TrainingBlockService.get_current_active_block",
+     lambda db: TrainingBlockService.get_current_active_block(db, USER_ID)),
+    ("AutoProgramGeneratorService.get_next_workout",
+     lambda db: AutoProgramGeneratorService.get_next_workout(db, 1)),
+    ("level_recalculation.due_profiles_query",
+     lambda db: due_profiles_query(db, datetime.utcnow()).limit(500).all()),
+    ("UserAdaptationService._get_level_progression_timeline",
+     lambda db: UserAdaptationService(db)._get_level_progression_timeline(USER_ID)),
+    ("interaction_rollups.rollup_counters",
+     lambda db: rollup_counters(db, [USER_ID])),
+    ("interaction_rollups.activity_summary",
+     lambda db: activity_summary(db, USER_ID)),
+    ("e1rm_index.refresh_e1rm_index",
+     lambda db: refresh_e1rm_index(db, USER_ID, {(EXERCISE, date.today())})),
+    ("workout_stats.refresh_exercise_stats",
+     lambda db: refresh_exercise_stats(db, USER_ID, {(EXERCISE, date.today())})),
+]
+
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)(?! USING (COVERING )?INDEX)")
+POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def capture_statements(engine, session_factory, call) -> List[Tuple[str, object]]:
+    """Run a service call and return the SELECT statements it executed"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    db = session_factory()
+    try:
+        call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        db.rollback()
+        db.close()
+
+    return statements
+
+
+def explain(engine, statement: str, parameters) -> Tuple[List[str], List[str]]:
+    """Return (plan lines, fully scanned tables) for a statement"""
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plan = [row[-1] for row in rows]
+            pattern = SQLITE_FULL_SCAN
+        else:
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+            plan = [row[0] for row in rows]
+            pattern = POSTGRES_FULL_SCAN
+
+    scans = [match.group(1) for line in plan for match in [pattern.search(line.strip())] if match]
+    return plan, scans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Audit an existing database instead of a throwaway SQLite file")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement and plan")
+    args = parser.parse_args()
+
+    temp_path = None
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        fd, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        engine = create_engine(f"sqlite:///{temp_path}")
+        Base.metadata.create_all(bind=engine)
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    failures = 0
+
+    print(f"🔍 Auditing query plans on {engine.dialect.name}")
+    print("=" * 60)
+
+    try:
+        for name, call in SERVICE_QUERIES:
+            statements = capture_statements(engine, session_factory, call)
+            scanned = []
+            for statement, parameters in statements:
+                plan, scans = explain(engine, statement, parameters)
+                scanned.extend(scans)
+                if args.verbose or scans:
+                    print(f"\n{name}:\n{statement.strip()}")
+                    for line in plan:
+                        print(f"    {line}")
+
+            if scanned:
+                failures += 1
+                print(f"❌ {name}: full scan on {', '.join(sorted(set(scanned)))}")
+            else:
+                print(f"✅ {name} ({len(statements)} queries)")
+    finally:
+        engine.dispose()
+        if temp_path:
+            os.remove(temp_path)
+
+    print("=" * 60)
+    if failures:
+        print(f"❌ {failures} service lookups fall back to a full table scan")
+        return 1
+
+    print("✅ Every service lookup uses an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,13 @@
+import time
+
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import engine
-from app.core.base import Base
-from app.core.init_admin import create_admin_user
-from app.core.init_routines import create_example_routines
+from app.core.database import engine, async_engine, database_stats
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.startup import prepare_schema, seed_database, startup_timings
 from app.api.v1.auth import router as auth_router
 from app.api.v1.workouts import router as workouts_router
 from app.api.v1.blocks import router as blocks_router
@@ -14,13 +17,11 @@ from app.api.v1.user_adaptation import router as user_adaptation_router
 from app.api.v1.setup import router as setup_router
 from app.api.v1.program_templates import router as program_templates_router
 from app.api.v1.user_profile import router as user_profile_router
-
-# Import all models to ensure tables are created
-from app.models import User, Workout, Exercise, TrainingBlock, BlockStage, OneRepMax, Routine, RoutineExercise, UserProfile, UserInteraction, DashboardConfiguration
-from app.models.training import TrainingProgram, PlannedWorkout, ExerciseTemplate
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
+from app.api.v1.export import router as export_router
+from app.services.interaction_ingestion import interaction_queue
+from app.services.dashboard_config import load_dashboard_configurations
+from app.services.level_recalculation import level_scheduler
+from app.services.auto_program_generator import shutdown_program_pool
 
 # Create FastAPI app
 app = FastAPI(
@@ -36,6 +37,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=[NEXT_CURSOR_HEADER],  # Keyset pagination token for list endpoints
 )
 
 # Include routers
@@ -48,12 +50,35 @@ app.include_router(user_adaptation_router, prefix="/api/v1/adaptation", tags=["u
 app.include_router(setup_router, prefix="/api/v1/setup", tags=["setup"])
 app.include_router(program_templates_router, prefix="/api/v1/programs", tags=["program-templates"])
 app.include_router(user_profile_router, prefix="/api/v1/user-profile", tags=["user-profile"])
+app.include_router(export_router, prefix="/api/v1/export", tags=["export"])
+
+startup_timings.record("imports", (time.perf_counter() - _import_started) * 1000)
 
 @app.on_event("startup")
 async def startup_event():
-    """Create admin user and example routines on startup"""
-    create_admin_user()
-    create_example_routines()
+    """Prepare the schema, load dashboard configurations and start background jobs (each phase timed)"""
+    with startup_timings.phase("schema"):
+        startup_timings.schema_status = prepare_schema(engine)
+    if settings.seed_on_startup:
+        with startup_timings.phase("seed"):
+            seed_database()
+    with startup_timings.phase("dashboard_config"):
+        load_dashboard_configurations()
+    if settings.level_recalculation_enabled:
+        with startup_timings.phase("scheduler"):
+            level_scheduler.start()
+    print(startup_timings.summary())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background jobs, flush buffered interaction telemetry and close pooled connections"""
+    level_scheduler.stop()
+    interaction_queue.close()
+    shutdown_program_pool()
+    # Pooled aiosqlite connections each hold a non-daemon thread that blocks interpreter exit
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
 
 @app.get("/")
 async def root():
@@ -63,6 +88,16 @@ async def root():
 async def health_check():
     return {"status": "healthy", "message": "API is running normally"}
 
+@app.get("/health/database")
+def database_health():
+    """Connection pool occupancy, checkout wait times and SQLite pragmas"""
+    return database_stats()
+
+@app.get("/health/startup")
+def startup_health():
+    """Per-phase timings of this worker's startup"""
+    return startup_timings.stats()
+
 @app.get("/test-one-rep-maxes")
 async def test_one_rep_maxes():
     """Test endpoint for one-rep-maxes without authentication"""
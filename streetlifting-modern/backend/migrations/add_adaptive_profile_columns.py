@@ -0,0 +1,53 @@
+"""
+Migration to add the adaptive experience columns to user_profiles
+
+Profiles created by create_user_profiles_table.py only have the setup
+columns; databases created from the models already have these, so only
+the missing ones are added.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_adaptive_profile_columns'
+down_revision = 'add_exercise_weekly_stats'
+branch_labels = None
+depends_on = None
+
+ADAPTIVE_COLUMNS = [
+    sa.Column('manual_override_level', sa.String(length=50), nullable=True),
+    sa.Column('technical_experience_score', sa.Float(), server_default='0', nullable=True),
+    sa.Column('training_commitment_score', sa.Float(), server_default='0', nullable=True),
+    sa.Column('needs_sophistication_score', sa.Float(), server_default='0', nullable=True),
+    sa.Column('navigation_patterns', sa.JSON(), server_default='{}', nullable=True),
+    sa.Column('feature_usage_frequency', sa.JSON(), server_default='{}', nullable=True),
+    sa.Column('session_duration_avg', sa.Float(), server_default='0', nullable=True),
+    sa.Column('terminology_usage', sa.JSON(), server_default='{}', nullable=True),
+    sa.Column('manual_adjustments_count', sa.Integer(), server_default='0', nullable=True),
+    sa.Column('help_requests', sa.JSON(), server_default='{}', nullable=True),
+    sa.Column('workout_frequency_7d', sa.Float(), server_default='0', nullable=True),
+    sa.Column('workout_frequency_30d', sa.Float(), server_default='0', nullable=True),
+    sa.Column('data_quality_score', sa.Float(), server_default='0', nullable=True),
+    sa.Column('preferred_dashboard_layout', sa.String(length=50), server_default='auto', nullable=True),
+    sa.Column('feature_discovery_enabled', sa.Boolean(), server_default=sa.true(), nullable=True),
+    sa.Column('auto_adaptation_enabled', sa.Boolean(), server_default=sa.true(), nullable=True),
+    sa.Column('last_level_calculation', sa.DateTime(), nullable=True),
+]
+
+
+def _existing_columns():
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns('user_profiles')}
+
+
+def upgrade():
+    existing = _existing_columns()
+    for column in ADAPTIVE_COLUMNS:
+        if column.name not in existing:
+            op.add_column('user_profiles', column.copy())
+    op.execute(f"UPDATE schema_version SET version = '{revision}' WHERE id = 1")
+
+
+def downgrade():
+    # The columns may predate this revision (models/create_all) and the models need them
+    op.execute(f"UPDATE schema_version SET version = '{down_revision}' WHERE id = 1")
@@ -0,0 +1,31 @@
+"""
+Migration to add planned workout completion counters to training_blocks
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_completion_counters'
+down_revision = 'add_strategy_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Counters stay NULL for existing blocks and are backfilled on first completion
+    op.add_column('training_blocks', sa.Column('total_workouts_count', sa.Integer(), nullable=True))
+    op.add_column('training_blocks', sa.Column('completed_workouts_count', sa.Integer(), nullable=True))
+    op.add_column('training_blocks', sa.Column('weekly_completion', sa.JSON(), nullable=True))
+    op.create_index(
+        'ix_planned_workouts_block_pending',
+        'planned_workouts',
+        ['block_id', 'is_completed', 'week_number', 'day_number']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_planned_workouts_block_pending', table_name='planned_workouts')
+    op.drop_column('training_blocks', 'weekly_completion')
+    op.drop_column('training_blocks', 'completed_workouts_count')
+    op.drop_column('training_blocks', 'total_workouts_count')
@@ -0,0 +1,31 @@
+"""
+Migration to add composite indexes for hot per-user lookups
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_composite_indexes'
+down_revision = 'add_completion_counters'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_one_rep_maxes_user_exercise_date', 'one_rep_maxes', ['user_id', 'exercise', 'date_achieved']),
+    ('ix_workouts_user_date', 'workouts', ['user_id', 'date']),
+    ('ix_workouts_user_in_progress', 'workouts', ['user_id', 'in_progress']),
+    ('ix_exercises_workout_id', 'exercises', ['workout_id']),
+    ('ix_user_interactions_user_type_created', 'user_interactions', ['user_id', 'interaction_type', 'created_at']),
+    ('ix_training_blocks_user_active', 'training_blocks', ['user_id', 'is_active']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,54 @@
+"""
+Migration to add the estimated 1RM index (per exercise bests and daily bests)
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_estimated_max_index'
+down_revision = 'add_workout_sync'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'estimated_maxes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise', sa.String(length=100), nullable=False),
+        sa.Column('best_e1rm', sa.Float(), nullable=False),
+        sa.Column('best_date', sa.Date(), nullable=False),
+        sa.Column('best_exercise_id', sa.Integer(), nullable=True),
+        sa.Column('last_date', sa.Date(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'exercise', name='uq_estimated_maxes_user_exercise')
+    )
+    op.create_index('ix_estimated_maxes_id', 'estimated_maxes', ['id'])
+    op.create_table(
+        'estimated_max_daily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise', sa.String(length=100), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('best_e1rm', sa.Float(), nullable=False),
+        sa.Column('best_exercise_id', sa.Integer(), nullable=True),
+        sa.Column('sets', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'exercise', 'date', name='uq_estimated_max_daily_user_exercise_date')
+    )
+    op.create_index('ix_estimated_max_daily_id', 'estimated_max_daily', ['id'])
+    op.execute(f"UPDATE schema_version SET version = '{revision}' WHERE id = 1")
+    # Existing history is indexed by add_estimated_max_index_migration.py (backfill_e1rm_index)
+
+
+def downgrade():
+    op.drop_index('ix_estimated_max_daily_id', table_name='estimated_max_daily')
+    op.drop_table('estimated_max_daily')
+    op.drop_index('ix_estimated_maxes_id', table_name='estimated_maxes')
+    op.drop_table('estimated_maxes')
+    op.execute(f"UPDATE schema_version SET version = '{down_revision}' WHERE id = 1")
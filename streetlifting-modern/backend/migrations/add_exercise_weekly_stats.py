@@ -0,0 +1,43 @@
+"""
+Migration to add the materialized weekly exercise statistics
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_exercise_weekly_stats'
+down_revision = 'add_estimated_max_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'exercise_weekly_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise', sa.String(length=100), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('sets', sa.Integer(), nullable=False),
+        sa.Column('total_reps', sa.Integer(), nullable=False),
+        sa.Column('total_weight', sa.Float(), nullable=False),
+        sa.Column('volume', sa.Float(), nullable=False),
+        sa.Column('max_weight', sa.Float(), nullable=False),
+        sa.Column('rpe_total', sa.Float(), nullable=False),
+        sa.Column('rpe_sets', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'exercise', 'week_start', name='uq_exercise_weekly_stats_user_exercise_week')
+    )
+    op.create_index('ix_exercise_weekly_stats_id', 'exercise_weekly_stats', ['id'])
+    op.create_index('ix_exercise_weekly_stats_user_week', 'exercise_weekly_stats', ['user_id', 'week_start'])
+    op.execute(f"UPDATE schema_version SET version = '{revision}' WHERE id = 1")
+    # Existing history is aggregated by add_exercise_weekly_stats_migration.py (backfill_exercise_stats)
+
+
+def downgrade():
+    op.drop_index('ix_exercise_weekly_stats_user_week', table_name='exercise_weekly_stats')
+    op.drop_index('ix_exercise_weekly_stats_id', table_name='exercise_weekly_stats')
+    op.drop_table('exercise_weekly_stats')
+    op.execute(f"UPDATE schema_version SET version = '{down_revision}' WHERE id = 1")
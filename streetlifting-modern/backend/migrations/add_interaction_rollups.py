@@ -0,0 +1,38 @@
+"""
+Migration to add hourly/daily interaction rollups
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_interaction_rollups'
+down_revision = 'add_level_recalculation_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user_interaction_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('interaction_type', sa.String(length=100), nullable=False),
+        sa.Column('key', sa.String(length=100), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('duration_total', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'user_id', 'granularity', 'bucket_start', 'interaction_type', 'key',
+            name='uq_user_interaction_rollups_bucket'
+        )
+    )
+    op.create_index('ix_user_interaction_rollups_id', 'user_interaction_rollups', ['id'])
+
+
+def downgrade():
+    op.drop_index('ix_user_interaction_rollups_id', table_name='user_interaction_rollups')
+    op.drop_table('user_interaction_rollups')
@@ -0,0 +1,19 @@
+"""
+Migration to index user_profiles for the background level recalculation
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_level_recalculation_index'
+down_revision = 'add_composite_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_user_profiles_level_due', 'user_profiles', ['last_level_calculation'])
+
+
+def downgrade():
+    op.drop_index('ix_user_profiles_level_due', table_name='user_profiles')
@@ -0,0 +1,28 @@
+"""
+Migration to add the scheduler_leases table (one worker runs each background pass)
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_scheduler_leases'
+down_revision = 'add_adaptive_profile_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'scheduler_leases',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('holder', sa.String(length=100), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.execute(f"UPDATE schema_version SET version = '{revision}' WHERE id = 1")
+
+
+def downgrade():
+    op.drop_table('scheduler_leases')
+    op.execute(f"UPDATE schema_version SET version = '{down_revision}' WHERE id = 1")
@@ -0,0 +1,27 @@
+"""
+Migration to add the schema_version marker checked on application startup
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_schema_version'
+down_revision = 'add_interaction_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    schema_version = op.create_table(
+        'schema_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.String(length=100), nullable=False),
+        sa.Column('applied_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(schema_version, [{'id': 1, 'version': revision}])
+
+
+def downgrade():
+    op.drop_table('schema_version')
@@ -0,0 +1,41 @@
+"""
+Migration to add workout client ids and the offline sync idempotency keys
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_workout_sync'
+down_revision = 'add_workout_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('workouts', sa.Column('client_id', sa.String(length=64), nullable=True))
+    op.create_index('ix_workouts_user_client_id', 'workouts', ['user_id', 'client_id'], unique=True)
+    op.create_table(
+        'workout_sync_mutations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=64), nullable=False),
+        sa.Column('op', sa.String(length=20), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'idempotency_key', name='uq_workout_sync_mutations_key')
+    )
+    op.create_index('ix_workout_sync_mutations_id', 'workout_sync_mutations', ['id'])
+    op.create_index('ix_workout_sync_mutations_created_at', 'workout_sync_mutations', ['created_at'])
+    op.execute(f"UPDATE schema_version SET version = '{revision}' WHERE id = 1")
+
+
+def downgrade():
+    op.drop_index('ix_workout_sync_mutations_created_at', table_name='workout_sync_mutations')
+    op.drop_index('ix_workout_sync_mutations_id', table_name='workout_sync_mutations')
+    op.drop_table('workout_sync_mutations')
+    op.drop_index('ix_workouts_user_client_id', table_name='workouts')
+    op.drop_column('workouts', 'client_id')
+    op.execute(f"UPDATE schema_version SET version = '{down_revision}' WHERE id = 1")
@@ -0,0 +1,24 @@
+"""
+Migration to add the workout version and client set ids used by diff-based progress saves
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_workout_version'
+down_revision = 'add_schema_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('workouts', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('exercises', sa.Column('client_set_id', sa.String(length=64), nullable=True))
+    op.execute(f"UPDATE schema_version SET version = '{revision}' WHERE id = 1")
+
+
+def downgrade():
+    op.drop_column('exercises', 'client_set_id')
+    op.drop_column('workouts', 'version')
+    op.execute(f"UPDATE schema_version SET version = '{down_revision}' WHERE id = 1")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script to prepare the database and seed the admin user and example routines.
+
+The API no longer seeds on every boot (see app/core/startup.py): run this
+once per database, e.g. as a deploy step before starting the workers.
+Creates missing tables first when the schema_version marker is stale.
+
+Usage:
+    python seed_database.py
+"""
+
+import sys
+
+from app.core.database import engine
+from app.core.startup import SCHEMA_VERSION, prepare_schema, seed_database
+
+
+def main():
+    """Bring the schema up to SCHEMA_VERSION and seed the default data"""
+    print("🏋️  StreetLifting - Preparing database")
+    print("=" * 40)
+
+    try:
+        status = prepare_schema(engine, mode="auto")
+        print(f"✅ Schema {SCHEMA_VERSION}: {status}")
+
+        seed_database()
+    except Exception as e:
+        print(f"❌ Error preparing database: {e}")
+        return 1
+
+    print("\n✅ Database ready")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Shared fixtures: the app runs against a throwaway SQLite database
+
+database_url has to be set before app.core is imported, so it is set at
+module import time, before any test module pulls in the app.
+"""
+
+import itertools
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_db_dir = tempfile.mkdtemp(prefix="streetlifting-tests-")
+os.environ["database_url"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.database import SessionLocal  # noqa: E402
+from main import app  # noqa: E402
+
+_usernames = (f"user{n}" for n in itertools.count(1))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient with startup/shutdown events run once for the session"""
+    with TestClient(app) as test_client:
+        yield test_client
+    shutil.rmtree(_db_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a fresh user and return its Authorization header"""
+    username = next(_usernames)
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"username": username, "email": f"{username}@example.com", "password": "password"}
+    )
+    assert response.status_code == 200, response.text
+    response = client.post("/api/v1/auth/login", data={"username": username, "password": "password"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def user_id(client, auth_headers):
+    return client.get("/api/v1/auth/me", headers=auth_headers).json()["id"]
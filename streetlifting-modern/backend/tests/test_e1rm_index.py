@@ -0,0 +1,121 @@
+"""The estimated 1RM index stays equal to calculate_estimated_one_rm over the stored sets"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.training import EstimatedMax, EstimatedMaxDaily
+from app.models.workout import Exercise, Workout
+from app.services.rm_calculator import RMCalculatorService, calculate_estimated_one_rm
+
+
+def _expected(db, user_id):
+    """Daily and all-time bests recomputed from scratch with the scalar formula"""
+    daily = {}
+    sets = db.query(Exercise.name, Workout.date, Exercise.weight, Exercise.reps, Exercise.rpe).join(
+        Workout, Exercise.workout_id == Workout.id
+    ).filter(Workout.user_id == user_id, Workout.completed == True).all()
+    for name, day, weight, reps, rpe in sets:
+        e1rm = calculate_estimated_one_rm(weight, reps, rpe)
+        if e1rm > 0:
+            daily[(name, day)] = max(daily.get((name, day), 0.0), e1rm)
+
+    bests = {}
+    for (name, day), e1rm in daily.items():
+        best_e1rm, best_date, last_date = bests.get(name, (0.0, None, day))
+        if e1rm > best_e1rm:
+            best_e1rm, best_date = e1rm, day
+        bests[name] = (best_e1rm, best_date, max(last_date, day))
+    return daily, bests
+
+
+def _indexed(db, user_id):
+    db.expire_all()
+    daily = {
+        (row.exercise, row.date): row.best_e1rm
+        for row in db.query(EstimatedMaxDaily).filter(EstimatedMaxDaily.user_id == user_id)
+    }
+    bests = {
+        row.exercise: (row.best_e1rm, row.best_date, row.last_date)
+        for row in db.query(EstimatedMax).filter(EstimatedMax.user_id == user_id)
+    }
+    return daily, bests
+
+
+def _assert_index_matches(db, user_id):
+    expected_daily, expected_bests = _expected(db, user_id)
+    daily, bests = _indexed(db, user_id)
+    assert daily == pytest.approx(expected_daily)
+    assert bests.keys() == expected_bests.keys()
+    for name, (best_e1rm, best_date, last_date) in expected_bests.items():
+        assert bests[name][0] == pytest.approx(best_e1rm)
+        assert bests[name][1:] == (best_date, last_date)
+
+
+def _create_completed(client, headers, day, sets):
+    response = client.post("/api/v1/workouts/progress/save", headers=headers, json={
+        "date": day.isoformat(), "day_type": "pull", "exercises": sets
+    })
+    assert response.status_code == 200, response.text
+    workout = response.json()
+    assert client.post(f"/api/v1/workouts/{workout['id']}/complete", headers=headers).status_code == 200
+    return workout["id"]
+
+
+def _save_sets(client, headers, workout_id, day, sets):
+    response = client.post("/api/v1/workouts/progress/save", headers=headers, json={
+        "workout_id": workout_id, "date": day.isoformat(), "day_type": "pull", "sets": sets
+    })
+    assert response.status_code == 200, response.text
+
+
+def test_index_follows_set_edits_and_deletes(client, auth_headers, user_id, db):
+    recent, older = date.today() - timedelta(days=3), date.today() - timedelta(days=40)
+    recent_id = _create_completed(client, auth_headers, recent, [
+        {"name": "Pull-Up", "weight": 20, "reps": 5},
+        {"name": "Pull-Up", "weight": 30, "reps": 3, "rpe": 9},
+        {"name": "Dips", "weight": 40, "reps": 5},
+    ])
+    older_id = _create_completed(client, auth_headers, older, [
+        {"name": "Pull-Up", "weight": 50, "reps": 2},
+        {"name": "Dips", "weight": 35, "reps": 4},
+    ])
+    _assert_index_matches(db, user_id)
+    assert _indexed(db, user_id)[1]["Pull-Up"][1] == older
+
+    # Lowering the set that holds the all-time best moves it to the other day
+    _save_sets(client, auth_headers, older_id, older, [{"set_number": 1, "weight": 10}])
+    _assert_index_matches(db, user_id)
+    assert _indexed(db, user_id)[1]["Pull-Up"][1] == recent
+
+    # Raising a set and changing its RPE
+    _save_sets(client, auth_headers, recent_id, recent, [{"set_number": 1, "weight": 27.5, "rpe": 8}])
+    _assert_index_matches(db, user_id)
+
+    # Deleting the best set of a day
+    _save_sets(client, auth_headers, recent_id, recent, [{"set_number": 2, "deleted": True}])
+    _assert_index_matches(db, user_id)
+
+    # Deleting the only Dips set of the latest day moves last_date back
+    _save_sets(client, auth_headers, recent_id, recent, [{"set_number": 3, "deleted": True}])
+    _assert_index_matches(db, user_id)
+    assert _indexed(db, user_id)[1]["Dips"][2] == older
+
+    # Deleting a whole workout drops its days
+    assert client.delete(f"/api/v1/workouts/{older_id}", headers=auth_headers).status_code == 200
+    _assert_index_matches(db, user_id)
+    assert "Dips" not in _indexed(db, user_id)[1]
+
+
+def test_current_and_best_e1rm_read_the_index(client, auth_headers, user_id, db):
+    day = date.today() - timedelta(days=2)
+    workout_id = _create_completed(client, auth_headers, day, [
+        {"name": "Pull-Up", "weight": 25, "reps": 4, "rpe": 8.5},
+        {"name": "Pull-Up", "weight": 20, "reps": 8},
+    ])
+    _save_sets(client, auth_headers, workout_id, day, [{"set_number": 2, "reps": 10}])
+
+    expected = max(calculate_estimated_one_rm(25, 4, 8.5), calculate_estimated_one_rm(20, 10))
+    service = RMCalculatorService(db)
+    assert service.calculate_from_recent_workouts(user_id, "Pull-Up") == pytest.approx(expected)
+    assert service.get_best_estimated_one_rm(user_id, "Pull-Up") == pytest.approx(expected)
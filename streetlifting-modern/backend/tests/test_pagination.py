@@ -0,0 +1,55 @@
+"""Keyset (cursor) pagination of workout listings"""
+
+from datetime import date
+
+import pytest
+
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.models.workout import Workout
+
+
+def _walk(client, headers, url, limit):
+    """Follow X-Next-Cursor from the first page to the last and collect the ids"""
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, headers=headers, params=params)
+        assert response.status_code == 200, response.text
+        ids += [row["id"] for row in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return ids
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(date(2026, 1, 2), 42)
+    assert decode_cursor(cursor, Workout.date) == (date(2026, 1, 2), 42)
+
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", Workout.date)
+
+
+@pytest.mark.parametrize("url", ["/api/v1/workouts/", "/api/v1/workouts/full/list"])
+def test_cursor_walk_across_equal_dates(client, auth_headers, url):
+    # 11 workouts on 3 dates, so most page boundaries fall between rows of the same date
+    for i in range(11):
+        response = client.post("/api/v1/workouts/", headers=auth_headers, json={
+            "date": f"2026-01-0{i % 3 + 1}", "day_type": "pull", "exercises": []
+        })
+        assert response.status_code == 200, response.text
+
+    everything = client.get(url, headers=auth_headers, params={"limit": 1000}).json()
+    assert len(everything) == 11
+    assert [(w["date"], w["id"]) for w in everything] == sorted(
+        ((w["date"], w["id"]) for w in everything), reverse=True
+    )
+
+    for limit in (1, 2, 4):
+        assert _walk(client, auth_headers, url, limit) == [w["id"] for w in everything]
+
+
+def test_invalid_cursor_is_rejected(client, auth_headers):
+    response = client.get("/api/v1/workouts/", headers=auth_headers, params={"cursor": "zzz"})
+    assert response.status_code == 400
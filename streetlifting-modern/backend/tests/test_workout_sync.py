@@ -0,0 +1,106 @@
+"""Offline sync (POST /workouts/sync) and optimistic concurrency on workouts"""
+
+
+def _set(weight=20.0, reps=5, name="Pull-Up"):
+    return {"name": name, "weight": weight, "reps": reps}
+
+
+def _sync(client, headers, operations):
+    response = client.post("/api/v1/workouts/sync", headers=headers, json={"operations": operations})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_replayed_batch_is_reported_as_duplicates(client, auth_headers):
+    operations = [
+        {"idempotency_key": "create", "op": "create_workout", "client_workout_id": "w-1",
+         "date": "2026-02-01", "day_type": "pull", "exercises": [_set(), _set()]},
+        {"idempotency_key": "add-set", "op": "upsert_sets", "client_workout_id": "w-1",
+         "sets": [{"set_number": 3, "client_set_id": "s-3", "name": "Dips", "weight": 30, "reps": 6}]},
+        {"idempotency_key": "complete", "op": "complete", "client_workout_id": "w-1"},
+    ]
+    first = _sync(client, auth_headers, operations)
+    assert [result["status"] for result in first["results"]] == ["applied"] * 3
+    assert first["applied"] == 3
+
+    replay = _sync(client, auth_headers, operations)
+    assert [result["status"] for result in replay["results"]] == ["duplicate"] * 3
+    assert (replay["applied"], replay["duplicates"], replay["failed"]) == (0, 3, 0)
+
+    # The replay answers with the original results and writes nothing
+    workout_id = first["results"][0]["workout_id"]
+    assert {result["workout_id"] for result in replay["results"]} == {workout_id}
+    workout = client.get(f"/api/v1/workouts/{workout_id}", headers=auth_headers).json()
+    assert workout["version"] == first["results"][-1]["version"]
+    assert workout["completed"] is True
+    assert [(e["set_number"], e["name"]) for e in workout["exercises"]] == [
+        (1, "Pull-Up"), (2, "Pull-Up"), (3, "Dips")
+    ]
+
+
+def test_duplicate_key_within_a_batch(client, auth_headers):
+    create = {"idempotency_key": "k", "op": "create_workout", "client_workout_id": "w-2",
+              "date": "2026-02-02", "day_type": "push", "exercises": [_set()]}
+    result = _sync(client, auth_headers, [create, {**create, "day_type": "legs"}])
+
+    first, second = result["results"]
+    assert first["status"] == "applied"
+    assert second["status"] == "duplicate"
+    assert second["workout_id"] == first["workout_id"]
+    assert (result["applied"], result["duplicates"]) == (1, 1)
+
+    workouts = client.get("/api/v1/workouts/", headers=auth_headers).json()
+    assert [(w["id"], w["day_type"]) for w in workouts] == [(first["workout_id"], "push")]
+
+
+def test_stale_expected_version_is_a_sync_conflict(client, auth_headers):
+    created = _sync(client, auth_headers, [
+        {"idempotency_key": "c", "op": "create_workout", "client_workout_id": "w-3",
+         "date": "2026-02-03", "day_type": "pull", "exercises": [_set()]},
+        {"idempotency_key": "u", "op": "upsert_sets", "client_workout_id": "w-3", "expected_version": 1,
+         "sets": [{"set_number": 1, "reps": 8}]},
+    ])["results"]
+    assert created[1]["version"] == 2
+
+    stale = _sync(client, auth_headers, [
+        {"idempotency_key": "u-stale", "op": "upsert_sets", "client_workout_id": "w-3", "expected_version": 1,
+         "sets": [{"set_number": 1, "reps": 3}]},
+    ])
+    conflict = stale["results"][0]
+    assert conflict["status"] == "conflict"
+    assert conflict["workout_id"] == created[0]["workout_id"]
+    assert conflict["version"] == 2
+    assert stale["failed"] == 1
+
+    workout = client.get(f"/api/v1/workouts/{created[0]['workout_id']}", headers=auth_headers).json()
+    assert [e["reps"] for e in workout["exercises"]] == [8]
+
+
+def test_stale_expected_version_returns_409(client, auth_headers):
+    response = client.post("/api/v1/workouts/progress/save", headers=auth_headers, json={
+        "date": "2026-02-04", "day_type": "pull", "exercises": [_set()]
+    })
+    workout = response.json()
+    assert workout["version"] == 1
+
+    saved = client.post("/api/v1/workouts/progress/save", headers=auth_headers, json={
+        "workout_id": workout["id"], "expected_version": 1, "date": "2026-02-04", "day_type": "pull",
+        "sets": [{"set_number": 1, "weight": 25}]
+    })
+    assert saved.status_code == 200, saved.text
+    assert saved.json()["version"] == 2
+
+    stale = client.post("/api/v1/workouts/progress/save", headers=auth_headers, json={
+        "workout_id": workout["id"], "expected_version": 1, "date": "2026-02-04", "day_type": "pull",
+        "sets": [{"set_number": 1, "weight": 30}]
+    })
+    assert stale.status_code == 409
+    assert stale.json()["detail"]["current_version"] == 2
+
+    completed = client.post(f"/api/v1/workouts/{workout['id']}/complete?expected_version=1", headers=auth_headers)
+    assert completed.status_code == 409
+
+    current = client.get(f"/api/v1/workouts/{workout['id']}", headers=auth_headers).json()
+    assert current["version"] == 2
+    assert current["completed"] is False
+    assert current["exercises"][0]["weight"] == 25
@@ -90,9 +90,9 @@ source .venv/bin/activate
 echo "📥 Installing backend dependencies..."
 pip install -r requirements.txt
 
-# Create admin user
-echo "👤 Creating admin user..."
-python create_admin.py
+# Prepare database
+echo "👤 Preparing database (admin user and example routines)..."
+python seed_database.py
 
 # Start backend server
 echo "🚀 Starting backend server..."